@@ -0,0 +1,42 @@
+"""add exchange rate staging table
+
+Revision ID: 4b8e2f1a9c3d
+Revises: c6fa53d631f8
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8e2f1a9c3d'
+down_revision: Union[str, None] = 'c6fa53d631f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # UNLOGGED: rows only live between a COPY and its merge into exchange_rates, so they
+    # skip the WAL. Column types match the binary COPY stream written by app.db.ingest.
+    op.execute("""
+        CREATE UNLOGGED TABLE staging_exchange_rates (
+            batch_id UUID NOT NULL,
+            base_currency_id INTEGER NOT NULL,
+            target_currency_id INTEGER NOT NULL,
+            rate FLOAT NOT NULL,
+            source VARCHAR(50) NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL
+        );
+    """)
+
+    op.execute("""
+        CREATE INDEX staging_exchange_rates_batch_index
+        ON staging_exchange_rates (batch_id);
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS staging_exchange_rates;")
@@ -0,0 +1,18 @@
+import hmac
+from typing import Optional
+from fastapi import Header
+from app.core.config import config
+from app.exceptions import ForbiddenException, UnauthorizedException
+
+
+def require_admin(x_admin_key: Optional[str] = Header(None)):
+    """
+    Allow a request only if its X-Admin-Key header matches ADMIN_API_KEY. Without an
+    ADMIN_API_KEY every request is refused, so the admin routes are never left open.
+    """
+    if not config.ADMIN_API_KEY:
+        raise ForbiddenException("Admin API is disabled.")
+    if not x_admin_key:
+        raise UnauthorizedException("Missing X-Admin-Key header.")
+    if not hmac.compare_digest(x_admin_key.encode(), config.ADMIN_API_KEY.encode()):
+        raise ForbiddenException("Invalid admin key.")
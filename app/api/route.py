@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from datetime import datetime
 from typing import List, Optional
 from decimal import Decimal
@@ -6,17 +7,23 @@ from app.schemas.schema import (
     CurrencySchema,
     ExchangeRateWithCurrencySchema,
     ExchangeRateHistorySchema,
+    JobSummarySchema,
+    RefreshScheduleSchema,
+    SourceHealthSchema,
 )
 from app.db.database import get_db
+from app.api.dependencies import require_admin
 from sqlalchemy.orm import Session
 from app.schemas.api_response import success_response, ApiResponse
 from app.controllers.currency_controller import CurrencyController
 from app.controllers.exchange_rate_controller import ExchangeRateController
+from app.controllers.admin_controller import AdminController
 
 router = APIRouter()
 
 
-@router.get("/currencies", response_model=ApiResponse[List[CurrencySchema]])
+@router.get("/currencies",
+    response_model=ApiResponse[List[CurrencySchema]])
 async def list_currencies(db: Session = Depends(get_db)):
     """List all available currencies."""
     currencies = CurrencyController.list_currencies(db)
@@ -25,21 +32,24 @@ async def list_currencies(db: Session = Depends(get_db)):
     )
 
 
-@router.get("/rates", response_model=ApiResponse[ExchangeRateWithCurrencySchema])
+@router.get("/rates",
+    response_model=ApiResponse[ExchangeRateWithCurrencySchema])
 async def get_exchange_rate(
     base: str,
     target: str,
+    response: Response,
     amount: Optional[Decimal] = None,
     db: Session = Depends(get_db),
 ):
     """Get the current exchange rate between two currencies with optional amount conversion."""
-    result = ExchangeRateController.get_current_rate(db, base, target, amount)
+    result = ExchangeRateController.get_current_rate(db, base, target, amount, response)
     return success_response(
         data=result, message="Exchange rate retrieved successfully."
     )
 
 
-@router.get("/rates/history", response_model=ApiResponse[ExchangeRateHistorySchema])
+@router.get("/rates/history",
+    response_model=ApiResponse[ExchangeRateHistorySchema])
 async def get_exchange_rate_history(
     base: str,
     target: str,
@@ -53,4 +63,51 @@ async def get_exchange_rate_history(
     )
     return success_response(
         data=result, message="Exchange rate history retrieved successfully."
-    )
\ No newline at end of file
+    )
+
+
+@router.get(
+    "/admin/sources",
+    response_model=ApiResponse[List[SourceHealthSchema]],
+    dependencies=[Depends(require_admin)],
+)
+async def list_sources():
+    """Live health statistics and current ranking of the scrape sources."""
+    result = AdminController.list_sources()
+    return success_response(
+        data=result, message="Source statistics retrieved successfully."
+    )
+
+
+@router.get(
+    "/admin/schedule",
+    response_model=ApiResponse[List[RefreshScheduleSchema]],
+    dependencies=[Depends(require_admin)],
+)
+async def get_schedule():
+    """Refresh intervals and priorities of the bases under the adaptive scrape schedule."""
+    result = AdminController.get_schedule()
+    return success_response(
+        data=result, message="Refresh schedule retrieved successfully."
+    )
+
+
+@router.get(
+    "/admin/jobs/{job_id}",
+    response_model=ApiResponse[JobSummarySchema],
+    dependencies=[Depends(require_admin)],
+)
+def get_job(job_id: str):
+    """Live progress of a scrape job, with per-source statistics and the bases in flight."""
+    result = AdminController.get_job(job_id)
+    return success_response(data=result, message="Job retrieved successfully.")
+
+
+@router.get(
+    "/admin/jobs/{job_id}/events",
+    dependencies=[Depends(require_admin)],
+)
+def stream_job_events(job_id: str, last_event_id: Optional[str] = Header(None)):
+    """Tail the events of a scrape job as server-sent events, until the job finishes or the stream times out."""
+    events = AdminController.stream_job_events(job_id, last_event_id or "0-0")
+    return StreamingResponse(events, media_type="text/event-stream")
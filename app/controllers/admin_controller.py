@@ -0,0 +1,107 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator, List
+from fastapi import HTTPException
+from app.core.config import config
+from app.schemas.schema import JobSummarySchema, RefreshScheduleSchema, SourceHealthSchema
+from app.scraping.factory import ScraperCapability
+from app.scraping.manager import ScraperManager
+from app.scraping.refresh_schedule import RefreshSchedule
+from app.scraping.source_health import SourceHealth
+from app.tasks.progress_tracker import ProgressTracker
+from app.utils.job_events import JobEvents
+
+
+class AdminController:
+    @staticmethod
+    def list_sources() -> List[SourceHealthSchema]:
+        """
+        Live health statistics for every scrape source, in the order scrapes currently try them.
+        """
+        scraper_manager = ScraperManager()
+
+        result = []
+        for capability in (ScraperCapability.MULTI_PAIR, ScraperCapability.SINGLE_PAIR):
+            sources = [
+                name for name in scraper_manager.source_priority
+                if name in scraper_manager.sources and scraper_manager.sources[name].capability == capability
+            ]
+            stats = SourceHealth.get_stats(sources)
+            costs = SourceHealth.costs(stats)
+
+            # Sources with an open circuit are skipped by scrapes; list them last.
+            ranked = sorted(sources, key=lambda name: (stats[name]["circuit_open"], costs[name]))
+            for priority, name in enumerate(ranked, start=1):
+                result.append(
+                    SourceHealthSchema(
+                        name=name.value,
+                        capability=capability.value,
+                        priority=priority,
+                        expected_cost_ms_per_rate=costs[name],
+                        **stats[name],
+                    )
+                )
+        return result
+
+    @staticmethod
+    def get_schedule() -> List[RefreshScheduleSchema]:
+        """
+        Refresh interval and priority of every base at the last run of the adaptive
+        SCRAPE_SCHEDULE, highest priority first.
+        """
+        return [RefreshScheduleSchema(**entry) for entry in RefreshSchedule.last_plan()]
+
+    @staticmethod
+    def get_job(job_id: str) -> JobSummarySchema:
+        """
+        Progress of a scrape job with a summary of its events: request statistics per
+        source (slowest first), bases still running (longest first), the slowest finished
+        bases and the rows written.
+        """
+        progress = ProgressTracker.get_job_status(job_id)
+        events = JobEvents.summary(job_id)
+        if progress is None and events is None:
+            raise HTTPException(status_code=404, detail="Job not found.")
+
+        return JobSummarySchema(job_id=job_id, **(progress or {}), **(events or {}))
+
+    @staticmethod
+    def stream_job_events(job_id: str, last_event_id: str = "0-0") -> AsyncIterator[str]:
+        """
+        Server-sent events of a scrape job: its recorded events from after `last_event_id`,
+        then new ones as they are emitted, until the job finishes or the stream has been
+        open JOB_EVENTS_SSE_MAX_SECONDS (clients reconnect with Last-Event-ID to go on).
+        A comment is sent every JOB_EVENTS_SSE_KEEPALIVE seconds without events.
+
+        Blocking Redis reads run in worker threads, for at most the keep-alive interval
+        each, so a stream never holds the event loop and a closed connection is noticed.
+        """
+        if ProgressTracker.get_job_status(job_id) is None and not JobEvents.exists(job_id):
+            raise HTTPException(status_code=404, detail="Job not found.")
+
+        async def events():
+            after = last_event_id
+            deadline = time.monotonic() + config.JOB_EVENTS_SSE_MAX_SECONDS
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+
+                block = min(config.JOB_EVENTS_SSE_KEEPALIVE, remaining)
+                entries = await asyncio.to_thread(JobEvents.read, job_id, after, block_ms=max(1, int(block * 1000)))
+                if not entries:
+                    # Replayed past the end of a job that has already finished
+                    status = await asyncio.to_thread(ProgressTracker.get_job_status, job_id)
+                    if status is None or status["status"] != "running":
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+
+                for entry_id, fields in entries:
+                    after = entry_id
+                    yield f"id: {entry_id}\nevent: {fields['event']}\ndata: {json.dumps(fields)}\n\n"
+                    if fields["event"] == "job_finished":
+                        return
+
+        return events()
@@ -1,9 +1,13 @@
+import time
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from fastapi import HTTPException
+from sqlalchemy import desc, text
+from sqlalchemy.exc import OperationalError
+from fastapi import HTTPException, Response
+from app.core.config import config
+from app.exceptions import ServiceUnavailableException
 from app.models.models import ExchangeRate
 from app.schemas.schema import (
     ExchangeRateSchema,
@@ -11,6 +15,9 @@ from app.schemas.schema import (
     ExchangeRateHistorySchema,
 )
 from app.controllers.currency_controller import CurrencyController
+from app.scraping.refresh_schedule import RateDemand, RefreshSchedule
+from app.tasks.celery_app import celery_app
+from app.tasks.job_lease import PendingScrapes
 from app.utils.cache_manager import CacheManager
 from app.utils.custom_logger import get_logger
 
@@ -19,30 +26,68 @@ logger = get_logger(__name__)
 class ExchangeRateController:
     @staticmethod
     def get_current_rate(
-        db: Session, base_code: str, target_code: str, amount: Optional[Decimal] = None
+        db: Session,
+        base_code: str,
+        target_code: str,
+        amount: Optional[Decimal] = None,
+        response: Optional[Response] = None,
     ) -> ExchangeRateWithCurrencySchema:
         """
         Get the most recent exchange rate between two currencies with optional amount conversion.
+
+        A rate older than RATE_FRESHNESS_TARGET is still served, while a refresh of its base
+        is queued (see `_revalidate`). If PostgreSQL doesn't answer within RATE_DB_TIMEOUT_MS,
+        the last rate served for the pair is returned instead. The rate's age in seconds is
+        set as the Age header of `response`.
         """
         if base_code.upper() == target_code.upper():
             raise HTTPException(
                 status_code=400, detail="Base and target currencies cannot be the same."
             )
 
-        cache_key = f"exchange_rate:{base_code.upper()}-{target_code.upper()}"
+        pair = f"{base_code.upper()}-{target_code.upper()}"
+        cache_key = f"exchange_rate:{pair}"
         cached_data = CacheManager.get(cache_key)
         if cached_data:
             result = ExchangeRateWithCurrencySchema.model_validate(cached_data)
-            if amount is not None:
-                converted_amount = amount * Decimal(str(result.rate))
-                rounded_amount = round(converted_amount, result.target_currency.decimal_digits)
-                result.amount = amount
-                result.converted_amount = rounded_amount
-            return result
-
-        logger.info(
-            f"Fetching exchange rate for {base_code.upper()} to {target_code.upper()}"
-        )
+        else:
+            logger.info(
+                f"Fetching exchange rate for {base_code.upper()} to {target_code.upper()}"
+            )
+            try:
+                result = ExchangeRateController._query_current_rate(db, base_code, target_code)
+            except OperationalError as e:
+                db.rollback()
+                fallback = CacheManager.get(f"exchange_rate_last:{pair}")
+                if not fallback:
+                    logger.error(f"Exchange rate lookup for {pair} failed: {e}")
+                    raise ServiceUnavailableException("Exchange rates are temporarily unavailable.")
+                logger.warning(f"Exchange rate lookup for {pair} failed, serving the last cached rate: {e}")
+                result = ExchangeRateWithCurrencySchema.model_validate(fallback)
+            else:
+                CacheManager.set(cache_key, result.dict(), expire=3600)
+                CacheManager.set(f"exchange_rate_last:{pair}", result.dict(), expire=config.RATE_FALLBACK_TTL)
+
+        RateDemand.hit(base_code.upper(), target_code.upper())
+        ExchangeRateController._revalidate(result, response)
+
+        # Add conversion information if an amount is provided.
+        if amount is not None:
+            converted_amount = amount * Decimal(str(result.rate))
+            rounded_amount = round(converted_amount, result.target_currency.decimal_digits)
+            result.amount = amount
+            result.converted_amount = rounded_amount
+        return result
+
+    @staticmethod
+    def _query_current_rate(
+        db: Session, base_code: str, target_code: str
+    ) -> ExchangeRateWithCurrencySchema:
+        """
+        Look up the most recent exchange rate in PostgreSQL, cancelling the lookup after
+        RATE_DB_TIMEOUT_MS (raised as OperationalError).
+        """
+        db.execute(text(f"SET LOCAL statement_timeout = {int(config.RATE_DB_TIMEOUT_MS)}"))
 
         # Get currency records
         base_currency = CurrencyController.get_currency_by_code(db, base_code)
@@ -65,17 +110,35 @@ class ExchangeRateController:
         exchange.base_currency = base_currency
         exchange.target_currency = target_currency
 
-        result = ExchangeRateWithCurrencySchema.model_validate(exchange)
-
-        # Add conversion information if an amount is provided.
-        if amount is not None:
-            converted_amount = amount * Decimal(str(result.rate))
-            rounded_amount = round(converted_amount, target_currency.decimal_digits)
-            result.amount = amount
-            result.converted_amount = rounded_amount
+        return ExchangeRateWithCurrencySchema.model_validate(exchange)
 
-        CacheManager.set(cache_key, result.dict(), expire=3600)
-        return result
+    @staticmethod
+    def _revalidate(result: ExchangeRateWithCurrencySchema, response: Optional[Response]):
+        """
+        Set the Age header of a served rate, the seconds since it was stored or its base was
+        last scraped. Once it is RATE_FRESHNESS_TARGET seconds old, also set a stale Warning
+        header and queue a `scrape_single_currency` of its base, unless one is pending
+        (see `PendingScrapes`).
+        """
+        base_code = result.base_currency.code
+        # Unchanged rates aren't stored again, so a scrape of the base also renews the rate
+        checked_at = max(result.created_at.timestamp(), RefreshSchedule.last_refreshed(base_code) or 0.0)
+        age = max(0, int(time.time() - checked_at))
+        if response is not None:
+            response.headers["Age"] = str(age)
+        if age < config.RATE_FRESHNESS_TARGET:
+            return
+
+        if response is not None:
+            response.headers["Warning"] = '110 - "Response is Stale"'
+        try:
+            if PendingScrapes.claim(base_code, config.RATE_REFRESH_DEDUP_TTL):
+                celery_app.send_task(
+                    "app.tasks.exchange_rates.scrape_single_currency", args=[result.base_currency.id]
+                )
+                logger.info(f"Queued a refresh of {base_code} rates, served {age}s old")
+        except Exception as e:
+            logger.warning(f"Failed to queue a refresh of {base_code} rates: {e}")
 
     @staticmethod
     def get_rate_history(
@@ -114,6 +177,24 @@ class ExchangeRateController:
             .order_by(ExchangeRate.created_at)
             .all()
         )
+
+        # With RATE_CHANGE_FILTER unchanged rates aren't stored again (see LatestRates), so
+        # the rate in effect at from_date may have been stored before it; unless a row was
+        # stored at from_date itself, start the history with that earlier row.
+        if config.RATE_CHANGE_FILTER and not (rates and rates[0].created_at == from_date):
+            previous = (
+                db.query(ExchangeRate)
+                .filter(
+                    ExchangeRate.base_currency_id == base_currency.id,
+                    ExchangeRate.target_currency_id == target_currency.id,
+                    ExchangeRate.created_at < from_date,
+                )
+                .order_by(desc(ExchangeRate.created_at))
+                .first()
+            )
+            if previous:
+                rates.insert(0, previous)
+
         if not rates:
             raise HTTPException(
                 status_code=404, detail="Exchange rate history not found."
@@ -1,3 +1,4 @@
+from typing import Dict, List, Optional
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 from urllib.parse import quote_plus
@@ -26,6 +27,153 @@ class Config(BaseSettings):
     REDIS_DB: int = Field(default=0, env="REDIS_DB")
     REDIS_PASSWORD: str = Field(default="", env="REDIS_PASSWORD")
 
+    # BeautifulSoup tree builder used by scrapers: "lxml" (fast, C-based) or "html.parser"
+    SCRAPER_HTML_PARSER: str = Field(default="lxml", env="SCRAPER_HTML_PARSER")
+    # Stream HTML pages and stop reading once the part transform() reads is complete. Off
+    # until the STREAM_UNTIL cut-offs are checked against captured pages (benchmarks/fixtures)
+    SCRAPER_STREAMING: bool = Field(default=False, env="SCRAPER_STREAMING")
+    # Processes HTML transform() runs on (0 parses in the scraping thread). Needs a worker
+    # pool that may start processes, e.g. `celery worker --pool threads`, not prefork.
+    SCRAPER_PARSE_PROCESSES: int = Field(default=0, env="SCRAPER_PARSE_PROCESSES")
+    # Parse jobs queued or running before scrapes wait to hand off more pages
+    SCRAPER_PARSE_QUEUE_SIZE: int = Field(default=16, env="SCRAPER_PARSE_QUEUE_SIZE")
+
+    # Serve every scrape source from this host instead (e.g. the local replay server in benchmarks/)
+    SCRAPER_BASE_URL_OVERRIDE: str = Field(default="", env="SCRAPER_BASE_URL_OVERRIDE")
+
+    # Seconds a scrape result is reused for the same source and base (0 disables)
+    SCRAPER_RESULT_CACHE_TTL: int = Field(default=300, env="SCRAPER_RESULT_CACHE_TTL")
+    # Seconds ETag/Last-Modified validators (and the rates parsed with them) are kept per URL
+    SCRAPER_VALIDATOR_CACHE_TTL: int = Field(default=86400, env="SCRAPER_VALIDATOR_CACHE_TTL")
+
+    # "redis" shares scraper rate limits across all workers, "local" keeps them per process
+    SCRAPER_RATE_LIMIT_BACKEND: str = Field(
+        default="redis", env="SCRAPER_RATE_LIMIT_BACKEND"
+    )
+    # Per-source overrides for scraper rate limits, keyed by source name.
+    # e.g. {"x-rates": {"rate": 2, "burst": 3, "max_concurrency": 2}}
+    SCRAPER_RATE_LIMITS: Dict[str, Dict[str, float]] = Field(
+        default={}, env="SCRAPER_RATE_LIMITS"
+    )
+
+    # Re-rank sources on every scrape by live success rate and latency (kept in Redis)
+    SCRAPER_ADAPTIVE_ORDERING: bool = Field(default=True, env="SCRAPER_ADAPTIVE_ORDERING")
+    # Number of recent requests per source the health statistics are computed over
+    SOURCE_HEALTH_WINDOW: int = Field(default=100, env="SOURCE_HEALTH_WINDOW")
+    # Consecutive failures that open a source's circuit, and seconds it stays open
+    SOURCE_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5, env="SOURCE_CIRCUIT_FAILURE_THRESHOLD")
+    SOURCE_CIRCUIT_COOLDOWN: int = Field(default=300, env="SOURCE_CIRCUIT_COOLDOWN")
+
+    # Hedge slow single-pair scrapes: after the primary source's p90 latency, also query
+    # the next source and keep whichever answers first
+    SCRAPER_HEDGING: bool = Field(default=True, env="SCRAPER_HEDGING")
+    # Outstanding hedge requests allowed per worker process
+    SCRAPER_MAX_HEDGES: int = Field(default=4, env="SCRAPER_MAX_HEDGES")
+    # Hedge delay for sources without latency samples, and lower bound for the p90 delay
+    SCRAPER_HEDGE_DEFAULT_DELAY: float = Field(default=2.0, env="SCRAPER_HEDGE_DEFAULT_DELAY")
+    SCRAPER_HEDGE_MIN_DELAY: float = Field(default=0.1, env="SCRAPER_HEDGE_MIN_DELAY")
+
+    # Learn which pairs each source serves and plan requests from it
+    SCRAPER_COVERAGE_PLANNING: bool = Field(default=True, env="SCRAPER_COVERAGE_PLANNING")
+    # Seconds a source's known pairs are kept without being seen again
+    COVERAGE_TTL: int = Field(default=2592000, env="COVERAGE_TTL")
+    # Seconds a pair a source answered "not found" (404) for is not requested from it again
+    COVERAGE_NEGATIVE_TTL: int = Field(default=259200, env="COVERAGE_NEGATIVE_TTL")
+    # Seconds a pair merely missing from a source's response is not requested from it again
+    # (kept short: the response may have been a partial page)
+    COVERAGE_INFERRED_NEGATIVE_TTL: int = Field(default=3600, env="COVERAGE_INFERRED_NEGATIVE_TTL")
+
+    # Seconds a scrape job may run before the bases it hasn't reached are deferred to a
+    # follow-up job (0 for no limit); keeps runs from overlapping the next beat firing
+    SCRAPE_JOB_BUDGET: int = Field(default=3600, env="SCRAPE_JOB_BUDGET")
+    # Request timeout: SCRAPER_TIMEOUT_P95_FACTOR x the source's p95 latency, within these bounds
+    SCRAPER_REQUEST_TIMEOUT: float = Field(default=10.0, env="SCRAPER_REQUEST_TIMEOUT")
+    SCRAPER_MIN_REQUEST_TIMEOUT: float = Field(default=2.0, env="SCRAPER_MIN_REQUEST_TIMEOUT")
+    SCRAPER_TIMEOUT_P95_FACTOR: float = Field(default=3.0, env="SCRAPER_TIMEOUT_P95_FACTOR")
+
+    # Scraped rates are committed in batches of up to INGEST_BATCH_SIZE rows, or after
+    # INGEST_FLUSH_INTERVAL seconds; scraping waits once INGEST_QUEUE_SIZE bases' rates
+    # are waiting to be written
+    INGEST_BATCH_SIZE: int = Field(default=1000, env="INGEST_BATCH_SIZE")
+    INGEST_FLUSH_INTERVAL: float = Field(default=5.0, env="INGEST_FLUSH_INTERVAL")
+    INGEST_QUEUE_SIZE: int = Field(default=8, env="INGEST_QUEUE_SIZE")
+    # How rates are written: "insert" (multi-row INSERT ... ON CONFLICT) or "copy" (binary
+    # COPY into the UNLOGGED staging table, merged with one INSERT ... SELECT)
+    INGEST_METHOD: str = Field(default="insert", env="INGEST_METHOD")
+
+    # Only store a rate when it moved by more than a relative epsilon since the pair's last
+    # stored rate, or when that row is RATE_HEARTBEAT_MAX_AGE seconds old. Off by default:
+    # every scraped rate is stored, and rate history only holds rows inside its range
+    RATE_CHANGE_FILTER: bool = Field(default=False, env="RATE_CHANGE_FILTER")
+    RATE_CHANGE_EPSILON: float = Field(default=0.0, env="RATE_CHANGE_EPSILON")
+    # Per-currency epsilons (a pair uses the larger of its two), e.g. {"HKD": 0.0005}
+    RATE_CHANGE_EPSILONS: Dict[str, float] = Field(default={}, env="RATE_CHANGE_EPSILONS")
+    RATE_HEARTBEAT_MAX_AGE: int = Field(default=86400, env="RATE_HEARTBEAT_MAX_AGE")
+
+    # Seconds a job's progress and retry counters are kept after its last update
+    JOB_PROGRESS_TTL: int = Field(default=604800, env="JOB_PROGRESS_TTL")
+
+    # Record structured events of every scrape job in a Redis Stream (job_events:<job_id>),
+    # capped at about JOB_EVENTS_MAXLEN entries per job
+    JOB_EVENTS: bool = Field(default=True, env="JOB_EVENTS")
+    JOB_EVENTS_MAXLEN: int = Field(default=10000, env="JOB_EVENTS_MAXLEN")
+    # Seconds without events after which the SSE tail sends a keep-alive comment
+    JOB_EVENTS_SSE_KEEPALIVE: float = Field(default=15.0, env="JOB_EVENTS_SSE_KEEPALIVE")
+    # Seconds an SSE tail stays open; clients reconnect with Last-Event-ID to go on
+    JOB_EVENTS_SSE_MAX_SECONDS: float = Field(default=600.0, env="JOB_EVENTS_SSE_MAX_SECONDS")
+
+    # Key the /api/admin routes require in the X-Admin-Key header; unset disables them
+    ADMIN_API_KEY: Optional[str] = Field(default=None, env="ADMIN_API_KEY")
+
+    # Failed bases are retried together by retry_failed_currencies, RETRY_BASE_DELAY seconds
+    # after they fail, doubling per failed retry up to RETRY_MAX_DELAY, at most
+    # RETRY_MAX_ATTEMPTS times. The task looks for due bases every RETRY_BATCH_INTERVAL seconds.
+    RETRY_BASE_DELAY: int = Field(default=300, env="RETRY_BASE_DELAY")
+    RETRY_MAX_DELAY: int = Field(default=3600, env="RETRY_MAX_DELAY")
+    RETRY_MAX_ATTEMPTS: int = Field(default=3, env="RETRY_MAX_ATTEMPTS")
+    RETRY_BATCH_INTERVAL: int = Field(default=60, env="RETRY_BATCH_INTERVAL")
+
+    # Seconds a group or base scrape lease lasts without a heartbeat from its worker
+    JOB_LEASE_TTL: int = Field(default=60, env="JOB_LEASE_TTL")
+
+    # Run scrape_currency_group as one subtask per base, merged and stored by a chord
+    # callback, so a group's bases are scraped by every worker in parallel
+    SCRAPE_FAN_OUT: bool = Field(default=True, env="SCRAPE_FAN_OUT")
+
+    # How scrape_currency_group collects rates: "direct" scrapes every base,
+    # "triangulated" scrapes the anchors below and derives every other base as cross rates
+    SCRAPE_GROUP_MODE: str = Field(default="direct", env="SCRAPE_GROUP_MODE")
+    TRIANGULATION_ANCHORS: List[str] = Field(default=["USD", "EUR"], env="TRIANGULATION_ANCHORS")
+    # Relative difference between anchors above which a cross rate is reported as drift
+    TRIANGULATION_DRIFT_TOLERANCE: float = Field(default=0.005, env="TRIANGULATION_DRIFT_TOLERANCE")
+
+    # Seconds after which a served rate is stale: the API still serves it, with a Warning
+    # header, and queues a refresh of its base unless one is pending. A pending refresh or
+    # retry stops others from being queued for RATE_REFRESH_DEDUP_TTL seconds beyond its
+    # countdown, or until it has run
+    RATE_FRESHNESS_TARGET: int = Field(default=21600, env="RATE_FRESHNESS_TARGET")
+    RATE_REFRESH_DEDUP_TTL: int = Field(default=300, env="RATE_REFRESH_DEDUP_TTL")
+    # Milliseconds a rate lookup may run in PostgreSQL before the pair's last served rate,
+    # kept for RATE_FALLBACK_TTL seconds, is returned instead
+    RATE_DB_TIMEOUT_MS: int = Field(default=500, env="RATE_DB_TIMEOUT_MS")
+    RATE_FALLBACK_TTL: int = Field(default=604800, env="RATE_FALLBACK_TTL")
+
+    # How scrapes are scheduled: "fixed" scrapes the currency groups on fixed crontabs,
+    # "adaptive" refreshes each base at an interval set by its API demand and volatility
+    SCRAPE_SCHEDULE: str = Field(default="fixed", env="SCRAPE_SCHEDULE")
+    # Base scrapes per day the adaptive schedule shares out (the fixed crontabs make 104)
+    SCRAPE_ADAPTIVE_DAILY_BUDGET: int = Field(default=104, env="SCRAPE_ADAPTIVE_DAILY_BUDGET")
+    # Bounds of a base's adaptive refresh interval, in seconds
+    SCRAPE_ADAPTIVE_MIN_INTERVAL: int = Field(default=1800, env="SCRAPE_ADAPTIVE_MIN_INTERVAL")
+    SCRAPE_ADAPTIVE_MAX_INTERVAL: int = Field(default=86400, env="SCRAPE_ADAPTIVE_MAX_INTERVAL")
+    # Seconds between adaptive schedule runs, which dispatch the bases that are due
+    SCRAPE_ADAPTIVE_TICK: int = Field(default=300, env="SCRAPE_ADAPTIVE_TICK")
+    # Fraction of rate requests counted towards demand, and hours of demand considered
+    DEMAND_SAMPLE_RATE: float = Field(default=0.1, env="DEMAND_SAMPLE_RATE")
+    DEMAND_WINDOW_HOURS: int = Field(default=24, env="DEMAND_WINDOW_HOURS")
+    # Weight of the newest batch in each base's moving average of rate volatility
+    VOLATILITY_EWMA_ALPHA: float = Field(default=0.1, env="VOLATILITY_EWMA_ALPHA")
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -39,6 +187,51 @@ class Config(BaseSettings):
             )
         return v
 
+    @field_validator("SCRAPER_HTML_PARSER")
+    def validate_html_parser(cls, v):
+        supported = ["lxml", "html.parser"]
+        if v not in supported:
+            raise ValueError(
+                f"Unsupported SCRAPER_HTML_PARSER: {v}. Supported parsers are {supported}."
+            )
+        return v
+
+    @field_validator("SCRAPER_RATE_LIMIT_BACKEND")
+    def validate_rate_limit_backend(cls, v):
+        supported = ["redis", "local"]
+        if v not in supported:
+            raise ValueError(
+                f"Unsupported SCRAPER_RATE_LIMIT_BACKEND: {v}. Supported backends are {supported}."
+            )
+        return v
+
+    @field_validator("INGEST_METHOD")
+    def validate_ingest_method(cls, v):
+        supported = ["insert", "copy"]
+        if v not in supported:
+            raise ValueError(
+                f"Unsupported INGEST_METHOD: {v}. Supported methods are {supported}."
+            )
+        return v
+
+    @field_validator("SCRAPE_GROUP_MODE")
+    def validate_scrape_group_mode(cls, v):
+        supported = ["direct", "triangulated"]
+        if v not in supported:
+            raise ValueError(
+                f"Unsupported SCRAPE_GROUP_MODE: {v}. Supported modes are {supported}."
+            )
+        return v
+
+    @field_validator("SCRAPE_SCHEDULE")
+    def validate_scrape_schedule(cls, v):
+        supported = ["fixed", "adaptive"]
+        if v not in supported:
+            raise ValueError(
+                f"Unsupported SCRAPE_SCHEDULE: {v}. Supported schedules are {supported}."
+            )
+        return v
+
     @property
     def db_url(self) -> str:
         encoded_password = quote_plus(self.DB_PASSWORD)
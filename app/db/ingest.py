@@ -0,0 +1,278 @@
+import io
+import queue
+import struct
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import config
+from app.db.database import SessionLocal
+from app.db.latest_rates import LatestRates, RateVolatility
+from app.models.models import Currency, ExchangeRate
+from app.utils.job_events import JobEvents
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+# Put on the queue by close() to make the writer thread flush and stop
+_CLOSE = object()
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Return `value` as an aware UTC datetime. Rate records are created with aware UTC
+    created_at values; a naive one is taken to be UTC on every ingest path, never the
+    worker's or the database session's local time.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def upsert_rates(db, rates: List[Dict]):
+    """
+    Insert rate records, updating rate and source of records that already exist.
+    Does not commit.
+    """
+    stmt = insert(ExchangeRate).values([dict(rate, created_at=as_utc(rate["created_at"])) for rate in rates])
+    stmt = stmt.on_conflict_do_update(
+        constraint=f"unique_{ExchangeRate.__tablename__}",
+        set_=dict(rate=stmt.excluded.rate, source=stmt.excluded.source),
+    )
+    db.execute(stmt)
+
+
+# UNLOGGED table rates are copied into before being merged (see copy_rates)
+STAGING_TABLE = "staging_exchange_rates"
+
+_COPY_SQL = (
+    f"COPY {STAGING_TABLE} (batch_id, base_currency_id, target_currency_id, rate, source, created_at) "
+    "FROM STDIN WITH (FORMAT binary)"
+)
+
+# One statement merges a staged batch; rows are routed to the partition of their created_at.
+# DISTINCT ON keeps a batch with a repeated key from hitting the same row twice.
+_MERGE_SQL = text(f"""
+    INSERT INTO {ExchangeRate.__tablename__} (base_currency_id, target_currency_id, rate, source, created_at)
+    SELECT DISTINCT ON (base_currency_id, target_currency_id, created_at)
+        base_currency_id, target_currency_id, rate, source, created_at
+    FROM {STAGING_TABLE}
+    WHERE batch_id = :batch_id
+    ORDER BY base_currency_id, target_currency_id, created_at
+    ON CONFLICT ON CONSTRAINT unique_{ExchangeRate.__tablename__}
+    DO UPDATE SET rate = EXCLUDED.rate, source = EXCLUDED.source
+""")
+
+_CLEAR_SQL = text(f"DELETE FROM {STAGING_TABLE} WHERE batch_id = :batch_id")
+
+# Binary COPY framing: signature, flags and header extension length; -1 field count ends the data
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_COPY_TRAILER = struct.pack("!h", -1)
+_COPY_ROW = struct.Struct("!hi16siiiiidi")
+_PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+def _pg_timestamp(value: datetime) -> int:
+    # timestamptz is sent as microseconds since 2000-01-01 UTC
+    return (as_utc(value) - _PG_EPOCH) // timedelta(microseconds=1)
+
+
+def encode_copy_rows(batch_id: uuid.UUID, rates: List[Dict]) -> bytes:
+    """Encode rate records as a binary COPY stream of STAGING_TABLE rows."""
+    buffer = io.BytesIO()
+    buffer.write(_COPY_HEADER)
+    for rate in rates:
+        source = rate["source"].encode("utf-8")
+        buffer.write(
+            _COPY_ROW.pack(
+                6,
+                16, batch_id.bytes,
+                4, rate["base_currency_id"],
+                4, rate["target_currency_id"],
+                8, rate["rate"],
+                len(source),
+            )
+        )
+        buffer.write(source)
+        buffer.write(struct.pack("!iq", 8, _pg_timestamp(rate["created_at"])))
+    buffer.write(_COPY_TRAILER)
+    return buffer.getvalue()
+
+
+def copy_rates(db, rates: List[Dict]):
+    """
+    Insert rate records like `upsert_rates`, but stream them with a binary COPY into
+    STAGING_TABLE and merge them with one INSERT ... SELECT, instead of binding every
+    value as a statement parameter. Does not commit.
+
+    Works with both PostgreSQL drivers SQLAlchemy may pick for the connection URL:
+    psycopg2 (`copy_expert`) and psycopg 3 (`cursor.copy()`).
+    """
+    batch_id = uuid.uuid4()
+    data = encode_copy_rows(batch_id, rates)
+    with db.connection().connection.cursor() as cursor:
+        if hasattr(cursor, "copy_expert"):
+            cursor.copy_expert(_COPY_SQL, io.BytesIO(data))
+        else:
+            with cursor.copy(_COPY_SQL) as copy:
+                copy.write(data)
+    db.execute(_MERGE_SQL, {"batch_id": str(batch_id)})
+    db.execute(_CLEAR_SQL, {"batch_id": str(batch_id)})
+
+
+def write_rates(db, rates: List[Dict]):
+    """Insert or update rate records with the INGEST_METHOD path. Does not commit."""
+    if config.INGEST_METHOD == "copy":
+        copy_rates(db, rates)
+    else:
+        upsert_rates(db, rates)
+
+
+class RateIngestWriter:
+    """
+    Stores exchange rate records while a scrape is still running.
+
+    Producers hand over each base's records with `add()`; a writer thread commits them in
+    batches of at most INGEST_BATCH_SIZE rows, or whatever is buffered once the oldest
+    record has waited INGEST_FLUSH_INTERVAL seconds. At most INGEST_QUEUE_SIZE handovers
+    wait for the writer; beyond that `add()` blocks until it catches up, so memory stays
+    bounded however many bases a job scrapes.
+
+    With RATE_CHANGE_FILTER, rates that haven't moved since the last stored one (see
+    `LatestRates`) are counted in `skipped` instead of being written. With the adaptive
+    SCRAPE_SCHEDULE, every batch also updates its bases' `RateVolatility`.
+
+    A failed batch is rolled back and counted in `failed`; the other batches are still
+    written. Every batch is recorded as a flush event of `job_id`, if given. Use as a
+    context manager, or call `close()` to flush what is left.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        job_id: Optional[str] = None,
+    ):
+        self.batch_size = batch_size or config.INGEST_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else config.INGEST_FLUSH_INTERVAL
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+        self._epsilons = None
+        self._job_id = job_id
+        # Last stored rates are needed by the change filter and the volatility estimate
+        self._track_latest = config.RATE_CHANGE_FILTER or config.SCRAPE_SCHEDULE == "adaptive"
+        self._queue = queue.Queue(maxsize=queue_size or config.INGEST_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="rate-ingest", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "RateIngestWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, records: List[Dict]):
+        """Queue `records` for writing; blocks while the writer is INGEST_QUEUE_SIZE handovers behind."""
+        if records:
+            self._queue.put(list(records))
+
+    def close(self):
+        """Write everything still queued and stop the writer thread."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        logger.info(
+            f"Rate ingest finished: {self.written} records written, {self.skipped} unchanged, {self.failed} failed"
+        )
+
+    def _run(self):
+        buffer = []
+        flush_at = None
+
+        while True:
+            timeout = None if flush_at is None else max(0.0, flush_at - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _CLOSE:
+                self._flush(buffer)
+                return
+
+            if item:
+                if not buffer:
+                    flush_at = time.monotonic() + self.flush_interval
+                buffer.extend(item)
+
+            while len(buffer) >= self.batch_size:
+                self._flush(buffer[: self.batch_size])
+                buffer = buffer[self.batch_size :]
+
+            if buffer and time.monotonic() >= flush_at:
+                self._flush(buffer)
+                buffer = []
+
+            if not buffer:
+                flush_at = None
+
+    def _flush(self, batch: List[Dict]):
+        if not batch:
+            return
+
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            rows = batch
+            if self._track_latest:
+                latest = LatestRates.fetch(batch)
+                if latest is not None and config.SCRAPE_SCHEDULE == "adaptive":
+                    RateVolatility.observe(batch, latest)
+                if config.RATE_CHANGE_FILTER:
+                    rows = LatestRates.changed(batch, latest, self._currency_epsilons(db))
+            if rows:
+                write_rates(db, rows)
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            self.failed += len(batch)
+            logger.error(f"Failed to write a batch of {len(batch)} exchange rates: {e}")
+            JobEvents.emit(self._job_id, "flush", failed=len(batch), error=e)
+            return
+        finally:
+            db.close()
+
+        if self._track_latest:
+            LatestRates.record(rows)
+        self.written += len(rows)
+        self.skipped += len(batch) - len(rows)
+        JobEvents.emit(
+            self._job_id,
+            "flush",
+            written=len(rows),
+            skipped=len(batch) - len(rows),
+            ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        logger.info(
+            f"Wrote a batch of {len(rows)} exchange rates into {ExchangeRate.__tablename__}, "
+            f"skipped {len(batch) - len(rows)} unchanged"
+        )
+
+    def _currency_epsilons(self, db) -> Dict[int, float]:
+        # RATE_CHANGE_EPSILONS is keyed by currency code, records carry IDs
+        if self._epsilons is None:
+            self._epsilons = {}
+            if config.RATE_CHANGE_EPSILONS:
+                currencies = db.query(Currency.id, Currency.code).filter(
+                    Currency.code.in_(config.RATE_CHANGE_EPSILONS)
+                )
+                self._epsilons = {
+                    currency_id: config.RATE_CHANGE_EPSILONS[code] for currency_id, code in currencies
+                }
+        return self._epsilons
@@ -0,0 +1,169 @@
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.core.config import config
+from app.utils.cache_manager import redis_client
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LatestRates:
+    """
+    Last stored rate of every pair, kept in Redis so rates that haven't moved aren't
+    stored again.
+
+    - latest_rate:<base_currency_id> is a hash of target_currency_id -> "<rate>|<stored_at>",
+      stored_at being the Unix time of the stored row's created_at.
+
+    A rate is stored when it differs from the last stored one by more than the pair's
+    relative epsilon (RATE_CHANGE_EPSILON, or the largest RATE_CHANGE_EPSILONS entry of
+    its two currencies), or when the last stored row is RATE_HEARTBEAT_MAX_AGE seconds
+    old. The latest row of a pair is thus never older than the heartbeat, and its value
+    is within epsilon of every rate scraped since.
+
+    Redis errors are logged and treated as "nothing known", so every rate is stored.
+    """
+
+    PREFIX = "latest_rate"
+
+    @staticmethod
+    def fetch(records: List[Dict]) -> Optional[List[Optional[Tuple[float, float]]]]:
+        """
+        Last stored (rate, stored_at) of the pair of each record, None for pairs without
+        one. Returns None if Redis is unavailable.
+        """
+        try:
+            pipe = redis_client.pipeline()
+            for record in records:
+                pipe.hget(f"{LatestRates.PREFIX}:{record['base_currency_id']}", record["target_currency_id"])
+            values = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Latest rates unavailable for {len(records)} rates: {e}")
+            return None
+
+        return [
+            None if value is None else tuple(float(part) for part in value.split("|"))
+            for value in values
+        ]
+
+    @staticmethod
+    def changed(
+        records: List[Dict],
+        latest: Optional[List[Optional[Tuple[float, float]]]],
+        epsilons: Dict[int, float],
+    ) -> List[Dict]:
+        """
+        Return the records that need storing.
+
+        Args:
+            records: Rate records (base_currency_id, target_currency_id, rate, created_at)
+            latest: The records' last stored rates, from `fetch`
+            epsilons: Relative epsilon per currency ID, for currencies with an override
+        """
+        if latest is None:
+            return records
+
+        changed = []
+        for record, previous in zip(records, latest):
+            if previous is None:
+                changed.append(record)
+                continue
+
+            rate, stored_at = previous
+            epsilon = max(
+                epsilons.get(record["base_currency_id"], config.RATE_CHANGE_EPSILON),
+                epsilons.get(record["target_currency_id"], config.RATE_CHANGE_EPSILON),
+            )
+            if (
+                abs(record["rate"] - rate) > epsilon * abs(rate)
+                or record["created_at"].timestamp() - stored_at >= config.RATE_HEARTBEAT_MAX_AGE
+            ):
+                changed.append(record)
+        return changed
+
+    @staticmethod
+    def record(records: Iterable[Dict]):
+        """Remember `records` as the last stored rates of their pairs; call once they are committed."""
+        by_base: Dict[int, Dict[int, str]] = {}
+        for record in records:
+            by_base.setdefault(record["base_currency_id"], {})[record["target_currency_id"]] = (
+                f"{record['rate']!r}|{record['created_at'].timestamp()}"
+            )
+        if not by_base:
+            return
+
+        try:
+            pipe = redis_client.pipeline()
+            for base_currency_id, latest in by_base.items():
+                key = f"{LatestRates.PREFIX}:{base_currency_id}"
+                pipe.hset(key, mapping=latest)
+                # Entries older than the heartbeat are rewritten anyway
+                pipe.expire(key, config.RATE_HEARTBEAT_MAX_AGE)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record latest rates: {e}")
+
+
+class RateVolatility:
+    """
+    Volatility of every base currency's rates, as an exponentially weighted moving
+    average of the squared log return per second of its pairs.
+
+    - rate_volatility is a hash of base_currency_id -> variance per second
+
+    Every scraped batch is compared with the pairs' last stored rates (see `LatestRates`):
+    each pair contributes ln(rate / previous)^2 / seconds since previous, and the mean over
+    a base's pairs is blended into its average with weight VOLATILITY_EWMA_ALPHA. A rate
+    expected to move by sigma * sqrt(t) over t seconds has a variance of sigma^2 per second.
+
+    Volatility is advisory: Redis errors are logged and never fail a write.
+    """
+
+    KEY = "rate_volatility"
+
+    # Intervals shorter than this are measured as this long, so near-simultaneous scrapes
+    # of a pair don't inflate its variance
+    MIN_INTERVAL = 60.0
+
+    @staticmethod
+    def observe(records: List[Dict], latest: List[Optional[Tuple[float, float]]]):
+        """
+        Update the volatility of the bases of `records`.
+
+        Args:
+            records: Scraped rate records (base_currency_id, rate, created_at)
+            latest: The records' last stored rates, from `LatestRates.fetch`
+        """
+        samples: Dict[int, List[float]] = {}
+        for record, previous in zip(records, latest):
+            if previous is None or previous[0] <= 0 or record["rate"] <= 0:
+                continue
+            seconds = max(record["created_at"].timestamp() - previous[1], RateVolatility.MIN_INTERVAL)
+            samples.setdefault(record["base_currency_id"], []).append(
+                math.log(record["rate"] / previous[0]) ** 2 / seconds
+            )
+        if not samples:
+            return
+
+        try:
+            bases = list(samples)
+            averages = redis_client.hmget(RateVolatility.KEY, bases)
+            updated = {}
+            for base_currency_id, average in zip(bases, averages):
+                sample = sum(samples[base_currency_id]) / len(samples[base_currency_id])
+                if average is not None:
+                    alpha = config.VOLATILITY_EWMA_ALPHA
+                    sample = alpha * sample + (1 - alpha) * float(average)
+                updated[base_currency_id] = repr(sample)
+            redis_client.hset(RateVolatility.KEY, mapping=updated)
+        except Exception as e:
+            logger.warning(f"Failed to update rate volatility: {e}")
+
+    @staticmethod
+    def get_all() -> Dict[int, float]:
+        """Variance per second of every base currency with observations, by currency ID."""
+        try:
+            return {int(base): float(value) for base, value in redis_client.hgetall(RateVolatility.KEY).items()}
+        except Exception as e:
+            logger.warning(f"Rate volatility unavailable: {e}")
+            return {}
@@ -4,6 +4,14 @@ class NotFoundException(HTTPException):
     def __init__(self, detail: str):
         super().__init__(status_code=404, detail=detail)
 
+class UnauthorizedException(HTTPException):
+    def __init__(self, detail: str):
+        super().__init__(status_code=401, detail=detail)
+
+class ForbiddenException(HTTPException):
+    def __init__(self, detail: str):
+        super().__init__(status_code=403, detail=detail)
+
 class ValidationException(HTTPException):
     def __init__(self, detail: str):
         super().__init__(status_code=400, detail=detail)
@@ -18,4 +26,8 @@ class RateLimitException(HTTPException):
 
 class InternalServerErrorException(HTTPException):
     def __init__(self, detail: str):
-        super().__init__(status_code=500, detail=detail)
\ No newline at end of file
+        super().__init__(status_code=500, detail=detail)
+
+class ServiceUnavailableException(HTTPException):
+    def __init__(self, detail: str):
+        super().__init__(status_code=503, detail=detail)
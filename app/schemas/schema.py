@@ -43,4 +43,75 @@ class ExchangeRateHistorySchema(BaseModel):
     rates: List[ExchangeRateSchema]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SourceFailureSchema(BaseModel):
+    at: str
+    error: str
+
+class SourceHealthSchema(BaseModel):
+    name: str
+    capability: str
+    priority: int
+    requests: int
+    success_ratio: float
+    mean_latency_ms: Optional[float] = None
+    p50_latency_ms: Optional[float] = None
+    p90_latency_ms: Optional[float] = None
+    p95_latency_ms: Optional[float] = None
+    rates_per_success: Optional[float] = None
+    expected_cost_ms_per_rate: float
+    consecutive_failures: int
+    circuit_open: bool
+    circuit_retry_in: Optional[int] = None
+    recent_failures: List[SourceFailureSchema]
+
+class JobSourceStatsSchema(BaseModel):
+    source: str
+    requests: int
+    errors: int
+    cached: int
+    rates: int
+    mean_latency_ms: Optional[float] = None
+    max_latency_ms: Optional[float] = None
+
+class JobBaseRunSchema(BaseModel):
+    base: str
+    running_seconds: float
+
+class JobBaseResultSchema(BaseModel):
+    base: str
+    status: Optional[str] = None
+    stored: int
+    failed: int
+    seconds: float
+
+class JobRowsSchema(BaseModel):
+    written: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+class JobSummarySchema(BaseModel):
+    job_id: str
+    status: Optional[str] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    duration: Optional[float] = None
+    retry_count: int = 0
+    completed_currencies: List[str] = []
+    failed_currencies: List[str] = []
+    events: int = 0
+    last_event_at: Optional[float] = None
+    sources: List[JobSourceStatsSchema] = []
+    in_flight: List[JobBaseRunSchema] = []
+    slowest_bases: List[JobBaseResultSchema] = []
+    rows: JobRowsSchema = JobRowsSchema()
+
+class RefreshScheduleSchema(BaseModel):
+    base: str
+    demand: float
+    volatility: Optional[float] = None
+    priority: float
+    interval: int
+    last_refreshed: Optional[float] = None
+    due: bool
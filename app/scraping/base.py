@@ -1,5 +1,160 @@
+import requests
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from contextlib import nullcontext
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, ContextManager, Dict, Any, List, Optional, Tuple
+from urllib.parse import urlencode
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from app.core.config import config
+from app.scraping.http_cache import NotModified, ScrapeCache
+from app.scraping.parse_pool import PendingParse, parse_now, submit_transform
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_html_parser() -> str:
+    """
+    Return the BeautifulSoup tree builder configured by SCRAPER_HTML_PARSER.
+    Falls back to the pure-Python "html.parser" if lxml is not installed.
+    """
+    parser = config.SCRAPER_HTML_PARSER
+    if parser == "lxml":
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            logger.warning("lxml is not installed, falling back to html.parser")
+            return "html.parser"
+    return parser
+
+
+@lru_cache(maxsize=1)
+def get_http_session() -> requests.Session:
+    """
+    Return the process-wide HTTP session shared by every scraper, so connections
+    (and TLS handshakes) to a source are reused across requests.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def strain(name: str, css_class: Optional[str] = None, **attrs) -> SoupStrainer:
+    """
+    Build a SoupStrainer for `name` elements, optionally carrying the CSS class `css_class`.
+
+    While parsing, BeautifulSoup compares the raw class attribute (e.g. "table table-heatmap"),
+    so class tokens are matched explicitly here rather than with `class_=`.
+    """
+    if css_class:
+        def has_class(value) -> bool:
+            if not value:
+                return False
+            classes = value if isinstance(value, list) else value.split()
+            return css_class in classes
+
+        attrs["class"] = has_class
+    return SoupStrainer(name, attrs=attrs)
+
+
+StreamMarker = Tuple[bytes, bytes, int]
+
+# Bytes read from a streamed response at a time
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def stream_until(start: str, end: str, blocks: int = 1) -> StreamMarker:
+    """
+    Describe where a streamed page can be cut: after the `blocks`-th block, a block
+    starting at `start` and running to the `end` that closes it (each block's end found
+    before the next start is searched). With `end` a closing tag such as "</div>", tags
+    of the same name opened inside the block are counted, so the block ends with the tag
+    closing the element `start` is in, not with the first nested one.
+    """
+    return start.encode("utf-8"), end.encode("utf-8"), blocks
+
+
+# Bytes that may follow a tag name in an opening tag
+_TAG_NAME_END = b" \t\r\n/>"
+
+
+def _find_opening(buffer: bytearray, opener: bytes, position: int) -> Tuple[int, bool]:
+    # Next `opener` tag (e.g. b"<div") from `position`, skipping longer tag names such as
+    # "<divider". Returns (index or -1, complete); complete is False while the tag name
+    # may still go on in the next chunk.
+    while True:
+        index = buffer.find(opener, position)
+        if index < 0:
+            return -1, True
+        after = index + len(opener)
+        if after >= len(buffer):
+            return index, False
+        if buffer[after] in _TAG_NAME_END:
+            return index, True
+        position = index + 1
+
+
+def read_until(response: requests.Response, marker: StreamMarker) -> Tuple[bytes, bool]:
+    """
+    Read `response` chunk by chunk until the `marker` blocks are complete.
+
+    Returns:
+        (body, cut): the bytes read, and whether reading stopped before the end of the page
+    """
+    start, end, blocks = marker
+    opener = b"<" + end[2:-1] if end.startswith(b"</") and end.endswith(b">") else None
+    buffer = bytearray()
+    position = 0
+    found = 0
+    # None while looking for `start`, then the open tags of `end`'s name in the block
+    depth = None
+
+    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        buffer += chunk
+        while True:
+            if depth is None:
+                index = buffer.find(start, position)
+                if index < 0:
+                    # Resume where a marker split across chunks could still begin
+                    position = max(position, len(buffer) - len(start) + 1)
+                    break
+                position = index + len(start)
+                # Inside the opening tag of an `end` element, that element is the block
+                tag = buffer.rfind(b"<", 0, index + 1)
+                depth = 0
+                if opener is not None and tag >= 0 and buffer.find(b">", tag, index) < 0:
+                    opening, _ = _find_opening(buffer, opener, tag)
+                    depth = 1 if opening == tag else 0
+                continue
+
+            closing = buffer.find(end, position)
+            opening, complete = _find_opening(buffer, opener, position) if opener else (-1, True)
+            if opening >= 0 and (closing < 0 or opening < closing):
+                if not complete:
+                    position = opening
+                    break
+                depth += 1
+                position = opening + len(opener)
+                continue
+            if closing < 0:
+                position = max(position, len(buffer) - max(len(end), len(opener or b"")) + 1)
+                break
+
+            position = closing + len(end)
+            if depth > 1:
+                depth -= 1
+                continue
+            found += 1
+            if found == blocks:
+                return bytes(buffer[:position]), True
+            depth = None
+
+    return bytes(buffer), False
 
 
 class BaseScraper(ABC):
@@ -7,6 +162,21 @@ class BaseScraper(ABC):
     Abstract base class defining the ETL pattern.
     """
 
+    # Restricts HTML parsing to the elements transform() reads, e.g. strain("table", "rates").
+    # None builds the tree for the whole document.
+    PARSE_ONLY: Optional[SoupStrainer] = None
+
+    # Scheme and host of the source site, e.g. "https://www.x-rates.com"
+    BASE_URL: str = ""
+
+    # Where the page can be cut once transform() has everything it reads, e.g.
+    # stream_until('class="currencies"', "</table>", 2). None downloads the whole page.
+    STREAM_UNTIL: Optional[StreamMarker] = None
+
+    # Whether transform() is CPU-heavy enough (HTML parsing) to run in the parse pool
+    # when SCRAPER_PARSE_PROCESSES is set; JSON sources parse faster than the hand-off.
+    OFFLOAD_TRANSFORM: bool = True
+
     def __init__(self, base_currency: str, target_currency: str = None):
         """
         Initialize the scraper with a base currency code and optional base currency name.
@@ -17,6 +187,23 @@ class BaseScraper(ABC):
         """
         self.base_currency = base_currency
         self.target_currency = target_currency
+        # Upper bound for every request timeout, set per scrape from the job's deadline
+        self.timeout: Optional[float] = None
+        self._validators = None
+        # Whether the last page read was cut at STREAM_UNTIL
+        self._cut = False
+
+    def get_base_url(self) -> str:
+        """
+        Return the base URL requests are built from.
+
+        When SCRAPER_BASE_URL_OVERRIDE is set (e.g. to a local replay server), every
+        source is served from "<override>/<source name>" instead of its real host.
+        """
+        override = config.SCRAPER_BASE_URL_OVERRIDE
+        if override:
+            return f"{override.rstrip('/')}/{self.get_source_name()}"
+        return self.BASE_URL
 
     @abstractmethod
     def extract(self) -> str:
@@ -40,9 +227,192 @@ class BaseScraper(ABC):
         """
         pass
 
-    def scrape(self) -> Dict[str, float]:
+    def get_cache_key(self) -> str:
+        """
+        Return the key scrape results are cached under: "<source>:<base>" or "<source>:<base>-<target>".
+        """
+        pair = f"{self.base_currency}-{self.target_currency}" if self.target_currency else self.base_currency
+        return f"{self.get_source_name()}:{pair}"
+
+    def fetch(
+        self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10, stream: bool = False,
+    ) -> requests.Response:
+        """
+        GET `url` through the shared session as a conditional request.
+
+        If a previous response for the same URL carried an ETag or Last-Modified header,
+        If-None-Match / If-Modified-Since are sent with it. A 304 raises `NotModified`
+        carrying the rates parsed from that previous response.
+
+        Raises:
+            NotModified: If the source reports the page unchanged
+            requests.RequestException: If the request fails or returns an error status
+        """
+        cache_url = f"{url}?{urlencode(sorted(params.items()), doseq=True)}" if params else url
+        if self.timeout is not None:
+            timeout = min(timeout, self.timeout)
+        headers = dict(headers or {})
+
+        cached = ScrapeCache.get_validators(cache_url)
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            logger.info(f"[{datetime.now()}] Extracting from {url}")
+            response = get_http_session().get(url, params=params, headers=headers, timeout=timeout, stream=stream)
+            if response.status_code == 304 and cached:
+                response.close()
+                raise NotModified(cache_url, cached["rates"])
+            if not response.ok:
+                response.close()
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.error(f"Failed to extract from {url}: {e}")
+            raise
+
+        self._validators = {
+            "url": cache_url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        return response
+
+    def fetch_text(
+        self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10,
+    ) -> str:
+        """
+        GET `url` (see `fetch`) and return the page text.
+
+        With SCRAPER_STREAMING and a `STREAM_UNTIL` marker, the body is streamed and the
+        connection closed as soon as the part transform() reads is complete, so the rest
+        of the page is never downloaded.
+        """
+        if self.STREAM_UNTIL is None or not config.SCRAPER_STREAMING:
+            return self.fetch(url, params=params, headers=headers, timeout=timeout).text
+
+        response = self.fetch(url, params=params, headers=headers, timeout=timeout, stream=True)
+        try:
+            body, cut = read_until(response, self.STREAM_UNTIL)
+        except requests.RequestException as e:
+            logger.error(f"Failed to extract from {url}: {e}")
+            raise
+        finally:
+            response.close()
+
+        self._cut = cut
+        if cut:
+            logger.info(f"Stopped reading {url} after {len(body)} bytes")
+        return body.decode(response.encoding or "utf-8", errors="replace")
+
+    def run_transform(self, raw_data: Any) -> Dict[str, float]:
+        """
+        Call `transform` and wait for its rates (see `run_transform_async`).
+        """
+        return self.run_transform_async(raw_data).result()
+
+    def run_transform_async(self, raw_data: Any) -> PendingParse:
+        """
+        Start `transform`: in the parse pool if SCRAPER_PARSE_PROCESSES is set and the
+        source opts in with `OFFLOAD_TRANSFORM`, otherwise right away in this thread.
+        Only the raw page and the rates cross the process boundary.
+        """
+        if config.SCRAPER_PARSE_PROCESSES > 0 and self.OFFLOAD_TRANSFORM and isinstance(raw_data, (str, bytes)):
+            return submit_transform(self, raw_data)
+        return parse_now(self.transform, raw_data)
+
+    def parse_html(self, raw_data: str) -> BeautifulSoup:
+        """
+        Parse raw HTML with the configured parser, building only the `PARSE_ONLY` elements.
+        """
+        return BeautifulSoup(raw_data, get_html_parser(), parse_only=self.PARSE_ONLY)
+
+    def scrape(self, throttle: Optional[ContextManager] = None) -> Dict[str, float]:
         """
         The full ETL process.
+
+        Returns rates cached for this source and base within SCRAPER_RESULT_CACHE_TTL
+        without any request. Otherwise extracts (conditionally, see `fetch`) and
+        transforms, and caches the rates for later calls.
+
+        Args:
+            throttle: Context manager held around the network request only, e.g. a rate limit
+        """
+        return self.scrape_async(throttle).result()
+
+    def scrape_async(self, throttle: Optional[ContextManager] = None) -> PendingParse:
+        """
+        Like `scrape`, but returns once the response is read: the page is parsed (in the
+        parse pool, see `run_transform_async`) while the caller sends its next request,
+        and the rates are cached when collected with `result()`.
+
+        A page cut at `STREAM_UNTIL` that fails to parse or gives no rates is fetched
+        again whole when collected, under `throttle` again, so a marker that no longer
+        fits the page doesn't get its targets recorded as missing.
+        """
+        cache_key = self.get_cache_key()
+        rates = ScrapeCache.get_result(cache_key)
+        if rates:
+            logger.info(f"Using cached scrape result for {cache_key}")
+            return parse_now(dict, rates)
+
+        try:
+            with throttle or nullcontext():
+                raw = self.extract()
+        except NotModified as e:
+            logger.info(f"{e.url} not modified, reusing {len(e.rates)} previously parsed rates")
+            return parse_now(self._keep, cache_key, e.rates, None)
+
+        return self.run_transform_async(raw).then(
+            lambda get: self._keep(cache_key, self._whole_page_if_cut(get, throttle), self._validators)
+        )
+
+    def _whole_page_if_cut(self, get: Callable[[], Dict[str, float]], throttle: Optional[ContextManager]) -> Dict[str, float]:
+        try:
+            rates = get()
+        except Exception as e:
+            if not self._cut:
+                raise
+            problem = f"failed to parse ({e})"
+        else:
+            if rates or not self._cut:
+                return rates
+            problem = "gave no rates"
+
+        logger.warning(f"Cut page of {self.get_cache_key()} {problem}, fetching the whole page")
+        # For this scraper only; the marker is kept for the other pages of the source
+        self.STREAM_UNTIL = None
+        self._cut = False
+        try:
+            with throttle or nullcontext():
+                raw = self.extract()
+        except NotModified as e:
+            return e.rates
+        return self.run_transform(raw)
+
+    def _keep(self, cache_key: str, rates: Dict[str, float], validators: Optional[Dict[str, Any]]) -> Dict[str, float]:
+        # Cache freshly parsed rates with the validators of their response, and any rates
+        # for later calls within SCRAPER_RESULT_CACHE_TTL
+        if rates and validators:
+            ScrapeCache.set_validators(validators["url"], validators["etag"], validators["last_modified"], rates)
+        if rates:
+            ScrapeCache.set_result(cache_key, rates)
+        return rates
+
+    def extract_many(self, target_currencies: List[str]) -> Any:
+        """
+        Extract raw data for several targets of the base currency in one request.
+        No source implements it yet: every single-pair source is scraped pair by pair.
+        """
+        raise NotImplementedError(f"{self.get_source_name()} does not support batch requests")
+
+    def transform_many(self, raw_data: Any, target_currencies: List[str]) -> Dict[str, float]:
+        """
+        Parse the raw data of `extract_many` into { target_currency_code: rate } for the
+        requested targets it contains.
         """
-        raw = self.extract()
-        return self.transform(raw)
+        raise NotImplementedError(f"{self.get_source_name()} does not support batch requests")
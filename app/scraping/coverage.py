@@ -0,0 +1,163 @@
+import time
+from typing import Dict, Iterable, List, Optional, Set
+from app.core.config import config
+from app.utils.cache_manager import redis_client
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _source_key(source_name: str) -> str:
+    return getattr(source_name, "value", source_name)
+
+
+class BaseCoverage:
+    """
+    What each source is known to serve for one base currency.
+
+    `served[source]` holds the targets the source has returned for the base and
+    `missing[source]` the targets it answered without, until their negative entry expires.
+    """
+
+    def __init__(self, base_currency: str, served: Dict[str, Set[str]], missing: Dict[str, Set[str]]):
+        self.base_currency = base_currency
+        self.served = served
+        self.missing = missing
+
+    def can_serve(self, source_name: str, target_currency: str) -> Optional[bool]:
+        """True if known to serve the pair, False if negative-cached, None if unknown."""
+        source = _source_key(source_name)
+        if target_currency in self.missing.get(source, ()):
+            return False
+        if target_currency in self.served.get(source, ()):
+            return True
+        return None
+
+    def impossible(self, target_currency: str, source_names: Iterable[str]) -> bool:
+        """True if every one of `source_names` is negative-cached for the pair."""
+        return all(self.can_serve(source_name, target_currency) is False for source_name in source_names)
+
+    def plan_multi_pair(self, source_names: List[str], target_currencies: List[str]) -> List[str]:
+        """
+        Order multi-pair sources so the wanted targets are covered with as few requests
+        as possible.
+
+        Greedy set cover over the known coverage first (the source serving the most
+        still-uncovered targets, ties broken by the given order). The remaining sources
+        follow in the given order, so a failed request can still be covered by others.
+        Sources known to serve none of the targets are dropped.
+        """
+        targets = set(target_currencies)
+        uncovered = set(targets)
+        candidates = list(source_names)
+        plan = []
+
+        while uncovered and candidates:
+            gains = [
+                len(self.served.get(_source_key(source_name), set()) & uncovered)
+                for source_name in candidates
+            ]
+            best = max(range(len(candidates)), key=lambda index: (gains[index], -index))
+            if gains[best] == 0:
+                break
+            uncovered -= self.served[_source_key(candidates[best])]
+            plan.append(candidates.pop(best))
+
+        for source_name in candidates:
+            if any(self.can_serve(source_name, target) is not False for target in targets):
+                plan.append(source_name)
+        return plan
+
+    def plan_single_pair(self, source_names: List[str], target_currency: str) -> List[str]:
+        """
+        Single-pair sources worth trying for one target: known servers first, then
+        unknown ones, each in the given order; negative-cached sources are dropped.
+        """
+        known = [s for s in source_names if self.can_serve(s, target_currency) is True]
+        unknown = [s for s in source_names if self.can_serve(s, target_currency) is None]
+        return known + unknown
+
+
+class CoverageIndex:
+    """
+    Which (base, target) pairs each source serves, learned from transform() outputs and
+    kept in Redis.
+
+    - coverage:<source>:<base> is a set of targets the source returned for the base
+      (expires after COVERAGE_TTL without updates).
+    - coverage_miss:<source>:<base> is a sorted set of targets the source answered
+      without, scored by when the negative entry expires: COVERAGE_NEGATIVE_TTL for an
+      explicit "not found", COVERAGE_INFERRED_NEGATIVE_TTL for targets merely missing
+      from a response, which may have been a partial page.
+
+    Redis errors are logged and treated as "nothing known", so scrapes fall back to
+    trying every source.
+    """
+
+    SERVED_PREFIX = "coverage"
+    MISSING_PREFIX = "coverage_miss"
+
+    @staticmethod
+    def record(
+        source_name: str,
+        base_currency: str,
+        returned: Iterable[str],
+        wanted: Optional[Iterable[str]] = None,
+        negative_ttl: Optional[int] = None,
+    ):
+        """
+        Record a response of `source_name` for `base_currency`.
+
+        Args:
+            source_name: Source that answered
+            base_currency: Base currency requested
+            returned: Target codes the response contained
+            wanted: Target codes that were asked for; those not returned are negative-cached
+            negative_ttl: Seconds the targets not returned are negative-cached
+                (default: COVERAGE_NEGATIVE_TTL)
+        """
+        source = _source_key(source_name)
+        served_key = f"{CoverageIndex.SERVED_PREFIX}:{source}:{base_currency}"
+        missing_key = f"{CoverageIndex.MISSING_PREFIX}:{source}:{base_currency}"
+        returned = set(returned)
+        missed = set(wanted) - returned if wanted else set()
+        negative_ttl = config.COVERAGE_NEGATIVE_TTL if negative_ttl is None else negative_ttl
+
+        try:
+            pipe = redis_client.pipeline()
+            if returned:
+                pipe.sadd(served_key, *returned)
+                pipe.expire(served_key, config.COVERAGE_TTL)
+                pipe.zrem(missing_key, *returned)
+            if missed and negative_ttl > 0:
+                expires_at = time.time() + negative_ttl
+                pipe.srem(served_key, *missed)
+                pipe.zadd(missing_key, dict.fromkeys(missed, expires_at))
+                pipe.zremrangebyscore(missing_key, "-inf", time.time())
+                # Entries expire by score; the key outlives the longest of them
+                pipe.expire(missing_key, max(negative_ttl, config.COVERAGE_NEGATIVE_TTL))
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record coverage for {source} {base_currency}: {e}")
+
+    @staticmethod
+    def load(base_currency: str, source_names: Iterable[str]) -> BaseCoverage:
+        """Load what every one of `source_names` is known to serve for `base_currency`."""
+        sources = [_source_key(source_name) for source_name in source_names]
+        served = {}
+        missing = {}
+
+        try:
+            pipe = redis_client.pipeline()
+            for source in sources:
+                pipe.smembers(f"{CoverageIndex.SERVED_PREFIX}:{source}:{base_currency}")
+                pipe.zrangebyscore(f"{CoverageIndex.MISSING_PREFIX}:{source}:{base_currency}", time.time(), "+inf")
+            results = pipe.execute()
+
+            for index, source in enumerate(sources):
+                served[source] = set(results[index * 2])
+                missing[source] = set(results[index * 2 + 1])
+        except Exception as e:
+            logger.warning(f"Coverage index unavailable for {base_currency}: {e}")
+
+        return BaseCoverage(base_currency, served, missing)
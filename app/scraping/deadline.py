@@ -0,0 +1,65 @@
+import time
+from typing import Dict, Optional, Tuple
+from app.core.config import config
+from app.scraping.source_health import SourceHealth
+
+
+class Deadline:
+    """
+    Time budget of one scrape job.
+
+    Requests are given a timeout derived from the source's observed p95 latency
+    (SCRAPER_TIMEOUT_P95_FACTOR times it, between SCRAPER_MIN_REQUEST_TIMEOUT and
+    SCRAPER_REQUEST_TIMEOUT) and never longer than the budget left, so a slow source
+    can't hold a job past its deadline.
+    """
+
+    # Seconds a source's p95 latency is reused before it is read from Redis again
+    STATS_TTL = 30.0
+
+    def __init__(self, seconds: Optional[float]):
+        """
+        Args:
+            seconds: Budget from now; None or 0 for no deadline
+        """
+        # Wall-clock time, so the deadline can be handed to subtasks on other workers
+        self.expires_at = time.time() + seconds if seconds else None
+        self._p95: Dict[str, Tuple[float, Optional[float]]] = {}
+
+    @classmethod
+    def at(cls, expires_at: Optional[float]) -> "Deadline":
+        """Deadline at the Unix timestamp `expires_at` (None for no deadline)."""
+        deadline = cls(None)
+        deadline.expires_at = expires_at
+        return deadline
+
+    def remaining(self) -> float:
+        """Seconds left, or infinity without a deadline."""
+        if self.expires_at is None:
+            return float("inf")
+        return max(0.0, self.expires_at - time.time())
+
+    def expired(self) -> bool:
+        """True once there is no time left for even the shortest request."""
+        return self.remaining() < config.SCRAPER_MIN_REQUEST_TIMEOUT
+
+    def request_timeout(self, source_name: str) -> float:
+        """Timeout in seconds for the next request to `source_name`."""
+        timeout = config.SCRAPER_REQUEST_TIMEOUT
+        p95 = self._source_p95(source_name)
+        if p95 is not None:
+            timeout = min(timeout, max(config.SCRAPER_MIN_REQUEST_TIMEOUT, p95 * config.SCRAPER_TIMEOUT_P95_FACTOR))
+        return min(timeout, self.remaining())
+
+    def _source_p95(self, source_name: str) -> Optional[float]:
+        # Latency samples are only recorded with adaptive ordering on
+        if not config.SCRAPER_ADAPTIVE_ORDERING:
+            return None
+
+        now = time.monotonic()
+        cached = self._p95.get(source_name)
+        if cached is None or now - cached[0] > self.STATS_TTL:
+            p95_ms = SourceHealth.get_stats([source_name])[source_name]["p95_latency_ms"]
+            cached = (now, p95_ms / 1000 if p95_ms is not None else None)
+            self._p95[source_name] = cached
+        return cached[1]
@@ -36,12 +36,19 @@ class ScraperSource:
         capability: ScraperCapability,
         needs_base_name: bool = False,
         needs_base_plural: bool = False,
+        requests_per_second: float = 1 / 1.2,
+        burst: int = 1,
+        max_concurrency: int = 1,
     ):
         self.name = name
         self.scraper_cls = scraper_cls
         self.capability = capability
         self.needs_base_name = needs_base_name
         self.needs_base_plural = needs_base_plural
+        # Courtesy limits applied per source by the rate limiter
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_concurrency = max_concurrency
 
 
 SCRAPER_SOURCES = {
@@ -74,6 +81,9 @@ SCRAPER_SOURCES = {
             ScraperSourceName.HEXA_RATE,
             HexaRateScraper,
             ScraperCapability.SINGLE_PAIR,
+            requests_per_second=2,
+            burst=4,
+            max_concurrency=2,
         ),
         ScraperSource(
             ScraperSourceName.FX_EMPIRE,
@@ -84,6 +94,9 @@ SCRAPER_SOURCES = {
             ScraperSourceName.OANDA,
             OandaScraper,
             ScraperCapability.SINGLE_PAIR,
+            requests_per_second=2,
+            burst=4,
+            max_concurrency=2,
         ),
         ScraperSource(
             ScraperSourceName.WISE,
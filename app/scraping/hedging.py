@@ -0,0 +1,157 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+from app.core.config import config
+from app.exceptions import ScrapingException
+from app.scraping.base import BaseScraper
+from app.scraping.source_health import SourceHealth
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """Return the process-wide pool hedged scrapes run their attempts on."""
+    return ThreadPoolExecutor(max_workers=config.SCRAPER_MAX_HEDGES + 8, thread_name_prefix="scrape-hedge")
+
+
+@lru_cache(maxsize=1)
+def get_hedge_slots() -> threading.BoundedSemaphore:
+    """
+    Return the process-wide cap on outstanding hedges (extra requests sent while an
+    earlier attempt is still running), so hedging can't multiply the request budget.
+    """
+    return threading.BoundedSemaphore(config.SCRAPER_MAX_HEDGES)
+
+
+def hedge_delay(source_name: str) -> float:
+    """
+    Seconds to wait on `source_name` before hedging: its p90 latency, or
+    SCRAPER_HEDGE_DEFAULT_DELAY until it has samples. Like the latency samples, the delay
+    counts from when the request is sent, not from when it waits for a rate-limit token.
+    """
+    p90 = SourceHealth.get_stats([source_name])[source_name]["p90_latency_ms"]
+    if p90 is None:
+        return config.SCRAPER_HEDGE_DEFAULT_DELAY
+    return max(p90 / 1000, config.SCRAPER_HEDGE_MIN_DELAY)
+
+
+def scrape_hedged(
+    scraper_manager,
+    attempts: List[Tuple[str, BaseScraper]],
+    is_valid: Callable[[Dict[str, float]], bool],
+    description: str,
+) -> Tuple[str, Dict[str, float]]:
+    """
+    Scrape with the first of `attempts` and hedge with the next ones if it is slow.
+
+    The first attempt starts immediately. If it hasn't finished its source's p90 latency
+    after sending its request, the next attempt starts in parallel if a hedge slot is free;
+    otherwise no hedge is sent and it waits for an attempt to finish. Time an attempt spends
+    waiting for its rate-limit token doesn't count, so our own rate limiting never hedges. An attempt that fails is
+    replaced by the next one straight away. The first valid result wins;
+    attempts still waiting for a rate-limit token are cancelled before they send a
+    request, and in-flight ones are left to finish with their results discarded.
+
+    Args:
+        scraper_manager: Manager providing rate limits and health recording
+        attempts: (source_name, scraper) in the order they should be tried
+        is_valid: Returns True if the scraped rates answer the request
+        description: What is being scraped, for logs and errors (e.g. "USD-EUR")
+
+    Returns:
+        (source_name, rates) of the winning attempt
+
+    Raises:
+        ScrapingException: If every attempt fails
+    """
+    executor = get_hedge_executor()
+    slots = get_hedge_slots()
+    cancelled = threading.Event()
+    remaining = list(attempts)
+    pending = {}
+    errors = []
+
+    # Latest attempt, its hedge delay, when it sent its request and when to hedge it
+    latest, delay, sent, hedge_at = None, None, None, None
+
+    def launch(hedge: bool):
+        nonlocal latest, delay, sent, hedge_at
+        source_name, scraper = remaining.pop(0)
+        attempt_sent = Future()
+
+        def on_request():
+            if not attempt_sent.done():
+                attempt_sent.set_result(time.monotonic())
+
+        future = executor.submit(
+            scraper_manager.scrape_source, source_name, scraper, cancelled, on_request=on_request
+        )
+        if hedge:
+            future.add_done_callback(lambda _: slots.release())
+        pending[future] = source_name
+
+        # The hedge delay is looked up once per attempt, and only if there is a next one;
+        # its clock starts once the attempt has its rate-limit token and sends the request
+        latest = source_name
+        delay = hedge_delay(source_name) if remaining else None
+        sent = attempt_sent if delay is not None else None
+        hedge_at = None
+
+    if not remaining:
+        raise ScrapingException(f"No sources available for {description}")
+
+    launch(hedge=False)
+    try:
+        while pending:
+            if sent is not None and sent.done():
+                hedge_at = sent.result() + delay
+                sent = None
+
+            waiting = set(pending) | ({sent} if sent is not None else set())
+            timeout = max(0.0, hedge_at - time.monotonic()) if hedge_at is not None else None
+            done, _ = wait(waiting, timeout=timeout, return_when=FIRST_COMPLETED)
+            done = {future for future in done if future in pending}
+
+            if not done:
+                if hedge_at is None or time.monotonic() < hedge_at:
+                    # The latest attempt just sent its request; start its hedge clock
+                    continue
+                hedge_at = None
+                if slots.acquire(blocking=False):
+                    logger.info(
+                        f"Hedging {description}: {latest} slower than {delay:.2f}s, also trying {remaining[0][0]}"
+                    )
+                    launch(hedge=True)
+                # Without a free slot, wait for an attempt to finish rather than polling for one
+                continue
+
+            for future in done:
+                source_name = pending.pop(future)
+                try:
+                    rates = future.result()
+                except Exception as e:
+                    error_msg = f"Failed to scrape from {source_name}: {str(e)}"
+                    logger.warning(error_msg)
+                    errors.append(error_msg)
+                    continue
+
+                if is_valid(rates):
+                    return source_name, rates
+
+                error_msg = f"Source {source_name} returned no usable rates for {description}"
+                logger.warning(error_msg)
+                errors.append(error_msg)
+
+            if not pending and remaining:
+                launch(hedge=False)
+    finally:
+        cancelled.set()
+        for future in pending:
+            future.cancel()
+
+    error_details = "\n".join(errors)
+    raise ScrapingException(f"All sources failed for {description}. Details:\n{error_details}")
@@ -0,0 +1,84 @@
+import json
+from typing import Dict, Optional
+from app.core.config import config
+from app.utils.cache_manager import redis_client
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class NotModified(Exception):
+    """
+    Raised by `BaseScraper.fetch` when a source answers a conditional request with 304.
+    Carries the rates parsed from the last full response for the same URL.
+    """
+
+    def __init__(self, url: str, rates: Dict[str, float]):
+        super().__init__(f"{url} not modified")
+        self.url = url
+        self.rates = rates
+
+
+class ScrapeCache:
+    """
+    Redis-backed caches for the scraping layer.
+
+    - Validators: the ETag / Last-Modified of the last full response per URL, stored
+      together with the rates parsed from it, so a 304 can reuse those rates.
+    - Results: the rates scraped per source and base (or pair) for a short window, so
+      overlapping tasks reuse a recent result instead of fetching the page again.
+
+    Redis errors are logged and treated as cache misses; they never fail a scrape.
+    """
+
+    VALIDATORS_PREFIX = "http_validators"
+    RESULT_PREFIX = "scrape_result"
+
+    @staticmethod
+    def _get(key: str) -> Optional[Dict]:
+        try:
+            value = redis_client.get(key)
+            return json.loads(value) if value else None
+        except Exception as e:
+            logger.warning(f"Scrape cache unavailable, reading {key}: {e}")
+            return None
+
+    @staticmethod
+    def _set(key: str, value: Dict, expire: int):
+        if expire <= 0:
+            return
+        try:
+            redis_client.setex(key, expire, json.dumps(value))
+        except Exception as e:
+            logger.warning(f"Scrape cache unavailable, writing {key}: {e}")
+
+    @staticmethod
+    def get_validators(url: str) -> Optional[Dict]:
+        """Return {"etag", "last_modified", "rates"} stored for `url`, if any."""
+        if config.SCRAPER_VALIDATOR_CACHE_TTL <= 0:
+            return None
+        return ScrapeCache._get(f"{ScrapeCache.VALIDATORS_PREFIX}:{url}")
+
+    @staticmethod
+    def set_validators(url: str, etag: Optional[str], last_modified: Optional[str], rates: Dict[str, float]):
+        """Store the validators of a full response together with the rates parsed from it."""
+        if not (etag or last_modified):
+            return
+        ScrapeCache._set(
+            f"{ScrapeCache.VALIDATORS_PREFIX}:{url}",
+            {"etag": etag, "last_modified": last_modified, "rates": rates},
+            config.SCRAPER_VALIDATOR_CACHE_TTL,
+        )
+
+    @staticmethod
+    def get_result(cache_key: str) -> Optional[Dict[str, float]]:
+        """Return recently scraped rates for `cache_key` ("<source>:<base>[-<target>]")."""
+        if config.SCRAPER_RESULT_CACHE_TTL <= 0:
+            return None
+        return ScrapeCache._get(f"{ScrapeCache.RESULT_PREFIX}:{cache_key}")
+
+    @staticmethod
+    def set_result(cache_key: str, rates: Dict[str, float]):
+        ScrapeCache._set(
+            f"{ScrapeCache.RESULT_PREFIX}:{cache_key}", rates, config.SCRAPER_RESULT_CACHE_TTL
+        )
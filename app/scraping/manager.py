@@ -1,28 +1,78 @@
+import threading
 import time
-from typing import Dict, List, Optional, Any
+from contextlib import contextmanager
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional
 from datetime import datetime
+import requests
+from app.core.config import config
+from app.scraping.base import BaseScraper
+from app.scraping.coverage import CoverageIndex
+from app.scraping.deadline import Deadline
 from app.scraping.factory import SCRAPER_SOURCES, ScraperSourceName, ScraperCapability
+from app.scraping.parse_pool import PendingParse
+from app.scraping.rate_limiter import RateLimiter, get_rate_limiter
+from app.scraping.source_health import SourceHealth
 from app.exceptions import ScrapingException
+from app.utils.job_events import JobEvents
 from app.utils.custom_logger import get_logger
 
 logger = get_logger(__name__)
 
+
+class RequestThrottle:
+    """
+    Context manager entering a fresh `factory()` context every time it is used, so a
+    scraper can hold it around each of its requests (e.g. refetching a page whose cut
+    didn't parse, see `BaseScraper.scrape_async`).
+    """
+
+    def __init__(self, factory: Callable[[], ContextManager]):
+        self.factory = factory
+        self._active = []
+
+    def __enter__(self):
+        context = self.factory()
+        result = context.__enter__()
+        self._active.append(context)
+        return result
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._active.pop().__exit__(exc_type, exc_value, traceback)
+
+
 class ScraperManager:
     """
     A manager class for handling scraper instances and implementing failsafe scraping.
     """
 
-    def __init__(self, source_priority: List[str] = None, rate_limit_delay: float = 1.2):
+    def __init__(
+        self,
+        source_priority: List[str] = None,
+        rate_limit_delay: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        deadline: Optional[Deadline] = None,
+        job_id: Optional[str] = None,
+    ):
         """
         Initialize the scraper manager.
         
         Args:
             source_priority: Ordered list of source names to try, in priority order
-            rate_limit_delay: Delay in seconds between requests to respect rate limits (default: 1.2 seconds)
+            rate_limit_delay: Force every source to one request per this many seconds instead of its own limit
+            rate_limiter: Limiter to use (default: the process-wide per-source limiter)
+            deadline: Job time budget; bounds request timeouts and stops requests once spent
+            job_id: Job the scrapes belong to; every request is recorded in its events
         """
         self.sources = SCRAPER_SOURCES
-        self.rate_limit_delay = rate_limit_delay
-        self.last_request_time = 0  # Track when the last request was made
+        self.deadline = deadline
+        self.job_id = job_id
+
+        if rate_limiter is None:
+            if rate_limit_delay:
+                rate_limiter = RateLimiter.for_sources(self.sources, rate_limit_delay)
+            else:
+                rate_limiter = get_rate_limiter()
+        self.rate_limiter = rate_limiter
 
         self.source_priority = source_priority or [
             ScraperSourceName.TRADING_ECONOMICS,
@@ -37,19 +87,171 @@ class ScraperManager:
             ScraperSourceName.XE,
         ]
         
-    def _apply_rate_limit(self):
+    def rate_limited(self, source_name: str):
         """
-        Apply rate limiting by waiting if necessary to maintain the desired request rate.
+        Context manager that applies the rate limit of `source_name` to the request made inside it.
+        Requests to different sources do not wait for each other.
         """
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        
-        if elapsed < self.rate_limit_delay and self.last_request_time > 0:
-            wait_time = self.rate_limit_delay - elapsed
-            logger.debug(f"Rate limiting: Waiting {wait_time:.2f} seconds")
-            time.sleep(wait_time)
-            
-        self.last_request_time = time.time()
+        return self.rate_limiter.limit(source_name)
+
+    def ranked_sources(self, capability: ScraperCapability) -> List[str]:
+        """
+        Return the configured sources with `capability`, cheapest first.
+
+        With SCRAPER_ADAPTIVE_ORDERING the order is re-ranked on every call by expected
+        cost per useful rate (see `SourceHealth.rank`) and sources with an open circuit
+        are skipped; otherwise `source_priority` is used as is.
+        """
+        candidates = [
+            source_name
+            for source_name in self.source_priority
+            if source_name in self.sources and self.sources[source_name].capability == capability
+        ]
+        if not config.SCRAPER_ADAPTIVE_ORDERING:
+            return candidates
+        return SourceHealth.rank(candidates)
+
+    @contextmanager
+    def _timed_request(
+        self,
+        source_name: str,
+        timings: List[float],
+        cancelled: Optional[threading.Event] = None,
+        on_request: Optional[Callable[[], None]] = None,
+    ):
+        # Starts the clock after the rate limit is acquired, so waiting for a token
+        # doesn't count against the source's latency.
+        with self.rate_limited(source_name):
+            if cancelled is not None and cancelled.is_set():
+                raise ScrapingException(f"Request to {source_name} cancelled")
+            if self.deadline is not None and self.deadline.expired():
+                raise ScrapingException(f"Job deadline reached, not requesting {source_name}")
+            if on_request is not None:
+                on_request()
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                timings.append(time.perf_counter() - start)
+
+    def scrape_source(
+        self,
+        source_name: str,
+        scraper: BaseScraper,
+        cancelled: Optional[threading.Event] = None,
+        wanted: Optional[Iterable[str]] = None,
+        on_request: Optional[Callable[[], None]] = None,
+    ) -> Dict[str, float]:
+        """
+        Run `scraper` under the rate limit of `source_name` and record the outcome in the
+        source's health statistics, the coverage index and the job's events. Results served
+        from the scrape cache are only recorded in the job's events. With a `deadline`, the
+        request timeout is bounded by it and nothing is sent once it has passed.
+
+        Args:
+            source_name: Source the scraper belongs to
+            scraper: Scraper to run
+            cancelled: If set by the time the rate limit is acquired, no request is sent
+            wanted: Targets asked for, so those missing from the response are negative-cached
+                in the coverage index, for COVERAGE_INFERRED_NEGATIVE_TTL (or COVERAGE_NEGATIVE_TTL
+                on a 404); default: the scraper's target currency, if any
+            on_request: Called once the rate limit is acquired, right before each request is sent
+        """
+        timings, wanted, throttle = self._prepare(source_name, scraper, cancelled, wanted, on_request)
+        try:
+            rates = scraper.scrape(throttle=throttle)
+        except Exception as e:
+            self._record_outcome(source_name, scraper, wanted, timings, error=e)
+            raise
+        self._record_outcome(source_name, scraper, wanted, timings, rates)
+        return rates
+
+    def submit_source(
+        self,
+        source_name: str,
+        scraper: BaseScraper,
+        cancelled: Optional[threading.Event] = None,
+        wanted: Optional[Iterable[str]] = None,
+        on_request: Optional[Callable[[], None]] = None,
+    ) -> PendingParse:
+        """
+        Like `scrape_source`, but returns once the response is read: the page is parsed
+        while the caller sends its next request (see `BaseScraper.scrape_async`), and the
+        outcome is recorded when the rates are collected with `result()`.
+
+        Raises:
+            Exception: If the request itself fails; parse errors are raised by `result()`
+        """
+        timings, wanted, throttle = self._prepare(source_name, scraper, cancelled, wanted, on_request)
+        try:
+            pending = scraper.scrape_async(throttle=throttle)
+        except Exception as e:
+            self._record_outcome(source_name, scraper, wanted, timings, error=e)
+            raise
+
+        def finish(get):
+            try:
+                rates = get()
+            except Exception as e:
+                self._record_outcome(source_name, scraper, wanted, timings, error=e)
+                raise
+            self._record_outcome(source_name, scraper, wanted, timings, rates)
+            return rates
+
+        return pending.then(finish)
+
+    def _prepare(self, source_name, scraper, cancelled, wanted, on_request):
+        # Bound the request by the deadline and return (timings, wanted, throttle) for one scrape
+        if self.deadline is not None:
+            if self.deadline.expired():
+                raise ScrapingException(f"Job deadline reached, not requesting {source_name}")
+            scraper.timeout = self.deadline.request_timeout(source_name)
+
+        timings = []
+        if wanted is None and scraper.target_currency:
+            wanted = [scraper.target_currency]
+        throttle = RequestThrottle(lambda: self._timed_request(source_name, timings, cancelled, on_request))
+        return timings, wanted, throttle
+
+    def _record_outcome(self, source_name, scraper, wanted, timings, rates=None, error=None):
+        self._emit_request(source_name, scraper, wanted, timings, len(rates or {}), error=error)
+        if error is not None:
+            if timings and config.SCRAPER_ADAPTIVE_ORDERING:
+                SourceHealth.record(source_name, timings[0], 0, error=str(error))
+            # A source that answers "not found" for a pair won't serve it on a retry either
+            if (
+                timings and config.SCRAPER_COVERAGE_PLANNING and wanted
+                and isinstance(error, requests.HTTPError) and error.response is not None
+                and error.response.status_code == 404
+            ):
+                CoverageIndex.record(source_name, scraper.base_currency, [], wanted)
+            return
+
+        if timings and config.SCRAPER_ADAPTIVE_ORDERING:
+            SourceHealth.record(source_name, timings[0], len(rates or {}))
+        if timings and config.SCRAPER_COVERAGE_PLANNING and rates:
+            # A response can be a partial page, so the targets it lacks are only
+            # negative-cached briefly; a 404 above is the explicit "not served"
+            CoverageIndex.record(
+                source_name, scraper.base_currency, rates.keys(), wanted,
+                negative_ttl=config.COVERAGE_INFERRED_NEGATIVE_TTL,
+            )
+
+    def _emit_request(self, source_name, scraper, wanted, timings, rates, error=None):
+        # No timing means nothing was sent: served from the scrape cache, or cancelled
+        if not timings and error is not None:
+            return
+        JobEvents.emit(
+            self.job_id,
+            "source",
+            source=source_name,
+            base=scraper.base_currency,
+            targets=len(wanted) if wanted else None,
+            latency_ms=round(timings[0] * 1000, 1) if timings else None,
+            rates=rates,
+            cached=not timings,
+            error=error,
+        )
 
     def scrape_with_failsafe(
         self, 
@@ -79,16 +281,8 @@ class ScraperManager:
         errors = []
 
         # First try MULTI_PAIR scrapers
-        for source_name in self.source_priority:
-            if source_name not in self.sources:
-                logger.warning(f"Source {source_name} not found in configured sources")
-                continue
-
+        for source_name in self.ranked_sources(ScraperCapability.MULTI_PAIR):
             source = self.sources[source_name]
-            
-            # Skip SINGLE_PAIR scrapers for the first pass
-            if source.capability == ScraperCapability.SINGLE_PAIR:
-                continue
 
             # Skip sources that need special parameters if we don't have them
             if (source.needs_base_name and not base_name) or (source.needs_base_plural and not base_name_plural):
@@ -96,9 +290,6 @@ class ScraperManager:
                 continue
 
             try:
-                # Apply rate limiting before each request
-                self._apply_rate_limit()
-                
                 # Initialize the scraper with appropriate parameters
                 scraper_params = {
                     "base_currency": base_currency,
@@ -110,8 +301,7 @@ class ScraperManager:
                     scraper_params["base_name_plural"] = base_name_plural
 
                 scraper_cls = source.scraper_cls(**scraper_params)
-                raw_data = scraper_cls.extract()
-                rates = scraper_cls.transform(raw_data)
+                rates = self.scrape_source(source_name, scraper_cls)
                 
                 # Check if rates dictionary is empty, which indicates failure
                 if not rates:
@@ -132,16 +322,9 @@ class ScraperManager:
                 
         # If all MULTI_PAIR scrapers failed, try SINGLE_PAIR scrapers if target_currencies is provided
         if target_currencies:
-            for source_name in self.source_priority:
-                if source_name not in self.sources:
-                    continue
-                    
+            for source_name in self.ranked_sources(ScraperCapability.SINGLE_PAIR):
                 source = self.sources[source_name]
-                
-                # Skip non-SINGLE_PAIR scrapers
-                if source.capability != ScraperCapability.SINGLE_PAIR:
-                    continue
-                    
+
                 # Skip sources that need special parameters if we don't have them
                 if (source.needs_base_name and not base_name) or (source.needs_base_plural and not base_name_plural):
                     logger.warning(f"Skipping source {source_name} due to missing required parameters")
@@ -150,11 +333,8 @@ class ScraperManager:
                 try:
                     rates = {}
                     scrape_failed = False
-                    
+
                     for target_currency in target_currencies:
-                        # Apply rate limiting before each request
-                        self._apply_rate_limit()
-                        
                         # Initialize the scraper with appropriate parameters
                         scraper_params = {
                             "base_currency": base_currency,
@@ -167,8 +347,7 @@ class ScraperManager:
                             scraper_params["base_name_plural"] = base_name_plural
                             
                         scraper_cls = source.scraper_cls(**scraper_params)
-                        raw_data = scraper_cls.extract()
-                        result = scraper_cls.transform(raw_data)
+                        result = self.scrape_source(source_name, scraper_cls)
                         
                         # SINGLE_PAIR scraper result should contain the target currency rate
                         if target_currency in result:
@@ -0,0 +1,127 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+from app.core.config import config
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+# Scraper attributes sent to the parse process; anything else (sessions, rotators)
+# stays in the I/O process.
+_PLAIN_TYPES = (str, int, float, bool, type(None), list, tuple, dict)
+
+
+@lru_cache(maxsize=1)
+def get_parse_pool() -> ProcessPoolExecutor:
+    """
+    Return the process-wide pool `transform()` runs on, with SCRAPER_PARSE_PROCESSES workers.
+
+    Workers are spawned rather than forked, so they don't inherit the locks of the
+    threads the I/O stage is running.
+    """
+    return ProcessPoolExecutor(
+        max_workers=config.SCRAPER_PARSE_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+@lru_cache(maxsize=1)
+def get_parse_slots() -> threading.BoundedSemaphore:
+    """
+    Return the bound on parse jobs queued or running. A scrape waits for a slot before
+    submitting, so a slow parse stage holds back the I/O stage instead of piling up
+    raw pages in memory.
+    """
+    return threading.BoundedSemaphore(config.SCRAPER_PARSE_QUEUE_SIZE)
+
+
+def _transform(scraper_cls: type, state: Dict[str, Any], raw_data: str) -> Dict[str, float]:
+    # Runs in the parse process: rebuild the scraper without __init__ (no headers or
+    # rotators needed) and parse there, so only the raw page and the rates are pickled.
+    scraper = scraper_cls.__new__(scraper_cls)
+    scraper.__dict__.update(state)
+    return scraper.transform(raw_data)
+
+
+class PendingParse:
+    """
+    Rates of a page handed to the parse pool, collected with `result()`.
+
+    Steps chained with `then()` run in the thread collecting the result rather than in
+    the pool's callback thread, so caching and bookkeeping stay with the caller. The
+    result, or its error, is computed once.
+    """
+
+    def __init__(self, future: Future, get: Optional[Callable[[], Any]] = None):
+        self.future = future
+        self._get = get or future.result
+        self._lock = threading.Lock()
+        self._done = False
+        self._value = None
+        self._error = None
+
+    def done(self) -> bool:
+        """True once the page is parsed, so `result()` won't wait."""
+        return self.future.done()
+
+    def then(self, finish: Callable[[Callable[[], Any]], Any]) -> "PendingParse":
+        """
+        Return a PendingParse of `finish(get)`, where `get()` returns this result or raises its error.
+        """
+        return PendingParse(self.future, lambda: finish(self.result))
+
+    def result(self) -> Any:
+        with self._lock:
+            if not self._done:
+                try:
+                    self._value = self._get()
+                except Exception as e:
+                    self._error = e
+                self._done = True
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+def parse_now(fn: Callable[..., Any], *args) -> PendingParse:
+    """Run `fn(*args)` in this thread and return its outcome as a done PendingParse."""
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return PendingParse(future)
+
+
+def submit_transform(scraper, raw_data: str) -> PendingParse:
+    """
+    Hand `scraper.transform(raw_data)` to the parse pool and return without waiting for
+    it, so the caller can send its next request while the page is parsed.
+
+    Waits for a parse slot first: at most SCRAPER_PARSE_QUEUE_SIZE pages are queued or
+    parsing, and a slot is freed once its page is parsed. Falls back to transforming in
+    this thread if the pool can't be used (e.g. inside a daemonic Celery prefork child,
+    which may not start processes of its own).
+    """
+    state = {key: value for key, value in vars(scraper).items() if isinstance(value, _PLAIN_TYPES)}
+
+    slots = get_parse_slots()
+    slots.acquire()
+    try:
+        future = get_parse_pool().submit(_transform, type(scraper), state, raw_data)
+    except Exception as e:
+        slots.release()
+        # A broken pool stays broken; start a fresh one on the next call
+        get_parse_pool.cache_clear()
+        logger.warning(f"Parse pool unavailable, parsing {scraper.get_source_name()} in process: {e}")
+        return parse_now(scraper.transform, raw_data)
+    future.add_done_callback(lambda _: slots.release())
+    return PendingParse(future)
+
+
+def transform_in_pool(scraper, raw_data: str) -> Dict[str, float]:
+    """
+    Run `scraper.transform(raw_data)` in the parse pool and return its rates (see `submit_transform`).
+    """
+    return submit_transform(scraper, raw_data).result()
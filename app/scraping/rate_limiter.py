@@ -0,0 +1,240 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Dict, Optional
+from app.core.config import config
+from app.scraping.factory import SCRAPER_SOURCES
+from app.utils.cache_manager import redis_client as default_redis_client
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `burst`. Callers reserve a
+    token up front, so concurrent callers are queued fairly instead of racing.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Tokens added per second (e.g. 0.8 for one request every 1.25 seconds)
+            burst: Maximum number of tokens that can accumulate while idle
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how long the caller must wait before using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """Block the current thread until a token is available."""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    async def acquire_async(self):
+        """Wait for a token without blocking the event loop."""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+
+class SourceLimit:
+    """
+    Rate, burst and concurrency limits for a single scrape source.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int = 1, max_concurrency: int = 1):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._async_semaphore = None
+
+    @property
+    def async_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so the limiter can be built outside of a running event loop.
+        if self._async_semaphore is None:
+            self._async_semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._async_semaphore
+
+
+class RateLimiter:
+    """
+    Per-source rate limiter.
+
+    Each source gets its own token bucket and concurrency cap, so a request to one
+    site never waits behind a request to another.
+    """
+
+    def __init__(self, limits: Dict[str, SourceLimit]):
+        self.limits = limits
+
+    @classmethod
+    def for_sources(cls, sources: Dict, rate_limit_delay: Optional[float] = None) -> "RateLimiter":
+        """
+        Build a limiter from the `SCRAPER_SOURCES` registry.
+
+        Limits declared on each `ScraperSource` can be overridden per source through the
+        SCRAPER_RATE_LIMITS setting, e.g. {"x-rates": {"rate": 2, "burst": 3}}.
+
+        Args:
+            sources: Mapping of source name to `ScraperSource`
+            rate_limit_delay: If given, force every source to one request per this many seconds
+        """
+        limits = {}
+        for name, source in sources.items():
+            overrides = config.SCRAPER_RATE_LIMITS.get(str(getattr(name, "value", name)), {})
+            rate = overrides.get("rate", source.requests_per_second)
+            if rate_limit_delay:
+                rate = 1 / rate_limit_delay
+
+            limits[name] = SourceLimit(
+                name=name,
+                rate=rate,
+                burst=int(overrides.get("burst", source.burst)),
+                max_concurrency=int(overrides.get("max_concurrency", source.max_concurrency)),
+            )
+        return cls(limits)
+
+    def _get_limit(self, source_name: str) -> SourceLimit:
+        if source_name not in self.limits:
+            raise KeyError(f"No rate limit configured for source {source_name}")
+        return self.limits[source_name]
+
+    def _reserve(self, source_limit: SourceLimit) -> float:
+        """Reserve a request slot and return the number of seconds to wait before using it."""
+        return source_limit.bucket.reserve()
+
+    async def _reserve_async(self, source_limit: SourceLimit) -> float:
+        return self._reserve(source_limit)
+
+    @contextmanager
+    def limit(self, source_name: str):
+        """
+        Hold a concurrency slot and a rate token for `source_name` while the block runs.
+        """
+        source_limit = self._get_limit(source_name)
+        with source_limit._semaphore:
+            wait_time = self._reserve(source_limit)
+            if wait_time > 0:
+                logger.debug(f"Rate limiting {source_name}: Waiting {wait_time:.2f} seconds")
+                time.sleep(wait_time)
+            yield
+
+    @asynccontextmanager
+    async def limit_async(self, source_name: str):
+        """
+        Async counterpart of `limit` for scrapers running on an event loop.
+        """
+        source_limit = self._get_limit(source_name)
+        async with source_limit.async_semaphore:
+            wait_time = await self._reserve_async(source_limit)
+            if wait_time > 0:
+                logger.debug(f"Rate limiting {source_name}: Waiting {wait_time:.2f} seconds")
+                await asyncio.sleep(wait_time)
+            yield
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Per-source rate limiter shared by every worker process through Redis.
+
+    Uses GCRA (generic cell rate algorithm): Redis keeps a single "theoretical arrival
+    time" per source and every reservation pushes it forward by one emission interval,
+    so the combined request rate of all Celery workers stays within the source's limit.
+    Concurrency caps remain per process.
+
+    If Redis is unreachable the limiter falls back to the local token bucket, so a
+    Redis outage degrades to per-process limits instead of failing scrapes.
+    """
+
+    KEY_PREFIX = "rate_limit"
+
+    # KEYS[1]: theoretical arrival time (TAT) key
+    # ARGV[1]: emission interval in ms, ARGV[2]: burst tolerance in ms
+    # Returns the number of ms the caller must wait before sending its request.
+    GCRA_SCRIPT = """
+    local now = redis.call('TIME')
+    local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+    local interval = tonumber(ARGV[1])
+    local tolerance = tonumber(ARGV[2])
+
+    local tat = tonumber(redis.call('GET', KEYS[1]))
+    if not tat or tat < now_ms then
+        tat = now_ms
+    end
+
+    local new_tat = tat + interval
+    local wait = new_tat - interval - tolerance - now_ms
+    if wait < 0 then
+        wait = 0
+    end
+
+    redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now_ms + tolerance + interval))
+    return wait
+    """
+
+    def __init__(self, limits: Dict[str, SourceLimit], redis_client=None):
+        super().__init__(limits)
+        self.redis = redis_client or default_redis_client
+        self._script = self.redis.register_script(self.GCRA_SCRIPT)
+
+    @classmethod
+    def for_sources(cls, sources: Dict, rate_limit_delay: Optional[float] = None) -> "RedisRateLimiter":
+        local = RateLimiter.for_sources(sources, rate_limit_delay)
+        return cls(local.limits)
+
+    def _reserve(self, source_limit: SourceLimit) -> float:
+        interval_ms = 1000 / source_limit.bucket.rate
+        tolerance_ms = interval_ms * (source_limit.bucket.burst - 1)
+        key = f"{self.KEY_PREFIX}:{getattr(source_limit.name, 'value', source_limit.name)}"
+
+        try:
+            wait_ms = self._script(keys=[key], args=[interval_ms, tolerance_ms])
+            return float(wait_ms) / 1000
+        except Exception as e:
+            logger.warning(
+                f"Distributed rate limit unavailable for {source_limit.name}, using local limit: {e}"
+            )
+            return source_limit.bucket.reserve()
+
+    async def _reserve_async(self, source_limit: SourceLimit) -> float:
+        # The Redis round-trip is short but blocking, so keep it off the event loop.
+        return await asyncio.to_thread(self._reserve, source_limit)
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> RateLimiter:
+    """
+    Return the process-wide limiter shared by every `ScraperManager`.
+    Uses the Redis-backed limiter unless SCRAPER_RATE_LIMIT_BACKEND is set to "local".
+    """
+    if config.SCRAPER_RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimiter.for_sources(SCRAPER_SOURCES)
+    return RateLimiter.for_sources(SCRAPER_SOURCES)
@@ -0,0 +1,234 @@
+import json
+import math
+import random
+import statistics
+import time
+from typing import Dict, Iterable, List, Optional
+from app.core.config import config
+from app.db.latest_rates import RateVolatility
+from app.utils.cache_manager import redis_client
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RateDemand:
+    """
+    Sampled counts of the rate requests served by the API, per pair and hour.
+
+    - rate_demand:<hour> is a sorted set of "<BASE>-<TARGET>" -> estimated requests in that
+      hour (Unix time // 3600), kept for DEMAND_WINDOW_HOURS
+
+    Only a DEMAND_SAMPLE_RATE fraction of requests reaches Redis, each adding 1 / rate,
+    so counting costs about one command per 1 / rate requests.
+
+    Counting is advisory: Redis errors are logged and never fail a request.
+    """
+
+    PREFIX = "rate_demand"
+
+    @staticmethod
+    def hit(base_code: str, target_code: str):
+        """Count a request for the rate of `base_code` in `target_code` (sampled)."""
+        rate = config.DEMAND_SAMPLE_RATE
+        if rate <= 0 or random.random() >= rate:
+            return
+
+        key = f"{RateDemand.PREFIX}:{int(time.time() // 3600)}"
+        try:
+            pipe = redis_client.pipeline()
+            pipe.zincrby(key, 1 / min(rate, 1.0), f"{base_code}-{target_code}")
+            pipe.expire(key, (config.DEMAND_WINDOW_HOURS + 1) * 3600)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to count demand for {base_code}-{target_code}: {e}")
+
+    @staticmethod
+    def by_base() -> Dict[str, float]:
+        """Estimated requests per base currency code over the last DEMAND_WINDOW_HOURS."""
+        hour = int(time.time() // 3600)
+        try:
+            pipe = redis_client.pipeline()
+            for bucket in range(hour - config.DEMAND_WINDOW_HOURS + 1, hour + 1):
+                pipe.zrange(f"{RateDemand.PREFIX}:{bucket}", 0, -1, withscores=True)
+            buckets = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Rate demand unavailable: {e}")
+            return {}
+
+        demand: Dict[str, float] = {}
+        for pairs in buckets:
+            for pair, requests in pairs:
+                base_code = pair.split("-", 1)[0]
+                demand[base_code] = demand.get(base_code, 0.0) + requests
+        return demand
+
+
+class RefreshSchedule:
+    """
+    Refresh intervals of the base currencies for the adaptive SCRAPE_SCHEDULE.
+
+    A base's priority is sqrt((demand + 1) * volatility): its requests over the demand
+    window (see `RateDemand`) times its variance per second (see `RateVolatility`), the
+    expected squared error of the rates served growing with both and with the time since
+    the last scrape. Refreshing each base at an interval inversely proportional to its
+    priority minimises the total expected error for a given number of scrapes, so the
+    SCRAPE_ADAPTIVE_DAILY_BUDGET scrapes per day are shared out that way, within
+    SCRAPE_ADAPTIVE_MIN_INTERVAL and SCRAPE_ADAPTIVE_MAX_INTERVAL. Budget left by bases
+    held at the maximum interval goes to the others.
+
+    - refresh_schedule:refreshed is a hash of base code -> Unix time its rates were last stored
+    - refresh_schedule:dispatched is a hash of base code -> Unix time a scrape of it was last queued
+    - refresh_schedule:plan is the JSON schedule of the last schedule run (see `plan`)
+    """
+
+    PREFIX = "refresh_schedule"
+
+    @staticmethod
+    def _mark(name: str, base_codes: Iterable[str]):
+        now = time.time()
+        mapping = {code: now for code in base_codes}
+        if not mapping:
+            return
+        try:
+            redis_client.hset(f"{RefreshSchedule.PREFIX}:{name}", mapping=mapping)
+        except Exception as e:
+            logger.warning(f"Failed to mark bases {name}: {e}")
+
+    @staticmethod
+    def mark_refreshed(base_codes: Iterable[str]):
+        """Note that fresh rates of `base_codes` were just stored."""
+        RefreshSchedule._mark("refreshed", base_codes)
+
+    @staticmethod
+    def mark_dispatched(base_codes: Iterable[str]):
+        """Note that scrapes of `base_codes` were just queued, so they aren't queued again meanwhile."""
+        RefreshSchedule._mark("dispatched", base_codes)
+
+    @staticmethod
+    def last_refreshed(base_code: str) -> Optional[float]:
+        """Unix time fresh rates of `base_code` were last stored, None if unknown."""
+        try:
+            refreshed = redis_client.hget(f"{RefreshSchedule.PREFIX}:refreshed", base_code)
+        except Exception as e:
+            logger.warning(f"Refresh time of {base_code} unavailable: {e}")
+            return None
+        return float(refreshed) if refreshed else None
+
+    @staticmethod
+    def save_plan(plan: List[Dict]):
+        """Store a `plan` as the current schedule, for `last_plan()` and `priorities()`."""
+        try:
+            redis_client.set(f"{RefreshSchedule.PREFIX}:plan", json.dumps(plan))
+        except Exception as e:
+            logger.warning(f"Failed to store the refresh schedule: {e}")
+
+    @staticmethod
+    def last_plan() -> List[Dict]:
+        """The plan stored by the last schedule run; empty if there was none."""
+        try:
+            plan = redis_client.get(f"{RefreshSchedule.PREFIX}:plan")
+        except Exception as e:
+            logger.warning(f"Refresh schedule unavailable: {e}")
+            return []
+        return json.loads(plan) if plan else []
+
+    @staticmethod
+    def priorities() -> Dict[str, float]:
+        """Priority of every base at the last schedule run."""
+        return {entry["base"]: entry["priority"] for entry in RefreshSchedule.last_plan()}
+
+    @staticmethod
+    def intervals(priorities: Dict[str, float], daily_budget: float) -> Dict[str, float]:
+        """
+        Refresh interval in seconds per base, inversely proportional to its priority, such
+        that all bases together are scraped `daily_budget` times a day.
+
+        Args:
+            priorities: Priority per base code
+            daily_budget: Base scrapes per day to share out
+        """
+        minimum, maximum = config.SCRAPE_ADAPTIVE_MIN_INTERVAL, config.SCRAPE_ADAPTIVE_MAX_INTERVAL
+        budget = daily_budget / 86400
+        intervals: Dict[str, float] = {}
+        free = dict(priorities)
+
+        # Bases whose share falls outside the bounds are fixed at the bound one side at a
+        # time, and the budget left is shared out again among the others
+        while free:
+            remaining = budget - sum(1 / interval for interval in intervals.values())
+            total = sum(free.values())
+            shares = {
+                code: total / (remaining * priority) if remaining > 0 and priority > 0 else math.inf
+                for code, priority in free.items()
+            }
+            bound = maximum if any(share > maximum for share in shares.values()) else minimum
+            fixed = [
+                code for code, share in shares.items()
+                if (share > maximum if bound == maximum else share < minimum)
+            ]
+            if not fixed:
+                intervals.update(shares)
+                break
+            for code in fixed:
+                intervals[code] = bound
+                del free[code]
+        return intervals
+
+    @staticmethod
+    def plan(currencies: List, scheduled_codes: Iterable[str], now: Optional[float] = None) -> List[Dict]:
+        """
+        Current schedule of the bases, highest priority first.
+
+        Args:
+            currencies: All currencies (code and id)
+            scheduled_codes: Bases always scheduled; other currencies are scheduled once
+                they are requested
+            now: Unix time to compute due bases at (default: now)
+
+        Returns:
+            Per base: base, demand, volatility, priority, interval, last_refreshed and due
+        """
+        now = now or time.time()
+        demand = RateDemand.by_base()
+        volatility = RateVolatility.get_all()
+        scheduled_codes = set(scheduled_codes)
+        bases = [c for c in currencies if c.code in scheduled_codes or demand.get(c.code)]
+
+        # Bases without observations are assumed as volatile as the typical base, and bases
+        # that haven't moved at all yet as a tenth of that, so they still rank by demand
+        observed = [volatility[c.id] for c in bases if c.id in volatility]
+        prior = statistics.median(observed) if observed else 1.0
+        floor = prior / 10 if prior > 0 else 1.0
+
+        try:
+            pipe = redis_client.pipeline()
+            pipe.hgetall(f"{RefreshSchedule.PREFIX}:refreshed")
+            pipe.hgetall(f"{RefreshSchedule.PREFIX}:dispatched")
+            refreshed, dispatched = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Refresh times unavailable: {e}")
+            refreshed, dispatched = {}, {}
+
+        priorities = {
+            c.code: math.sqrt((demand.get(c.code, 0.0) + 1) * max(volatility.get(c.id, prior), floor)) for c in bases
+        }
+        intervals = RefreshSchedule.intervals(priorities, config.SCRAPE_ADAPTIVE_DAILY_BUDGET)
+
+        plan = []
+        for c in bases:
+            last_refreshed = float(refreshed[c.code]) if c.code in refreshed else None
+            last_queued = max(last_refreshed or 0.0, float(dispatched.get(c.code, 0.0)))
+            plan.append(
+                {
+                    "base": c.code,
+                    "demand": round(demand.get(c.code, 0.0), 1),
+                    "volatility": volatility.get(c.id),
+                    "priority": priorities[c.code],
+                    "interval": round(intervals[c.code]),
+                    "last_refreshed": last_refreshed,
+                    "due": now - last_queued >= intervals[c.code],
+                }
+            )
+        plan.sort(key=lambda entry: -entry["priority"])
+        return plan
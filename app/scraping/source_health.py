@@ -0,0 +1,177 @@
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from app.core.config import config
+from app.utils.cache_manager import redis_client
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SourceHealth:
+    """
+    Live health statistics per scrape source, shared by every worker through Redis.
+
+    Each request to a source is recorded as a sample "<latency_ms>:<rates>" in a
+    capped list (rates is 0 for a failed or empty response). Success ratio,
+    p50/p95 latency and rates per successful request are computed over that window.
+    After SOURCE_CIRCUIT_FAILURE_THRESHOLD consecutive failures the circuit opens
+    and the source is skipped until SOURCE_CIRCUIT_COOLDOWN seconds pass, after
+    which the next scrape probes it again.
+
+    Statistics are advisory: Redis errors are logged and never fail a scrape.
+    """
+
+    KEY_PREFIX = "source_health"
+
+    # Assumed for sources without samples, so they rank by configured priority
+    PRIOR_LATENCY_MS = 1000.0
+
+    @staticmethod
+    def _key(source_name: str, suffix: str) -> str:
+        return f"{SourceHealth.KEY_PREFIX}:{getattr(source_name, 'value', source_name)}:{suffix}"
+
+    @staticmethod
+    def record(source_name: str, latency: float, rates: int, error: Optional[str] = None):
+        """
+        Record one request to `source_name`.
+
+        Args:
+            source_name: Source the request was sent to
+            latency: Seconds the request took
+            rates: Number of rates returned; 0 or an `error` counts as a failure
+            error: Error message if the scrape raised
+        """
+        failed = error is not None or rates <= 0
+        try:
+            pipe = redis_client.pipeline()
+            pipe.lpush(SourceHealth._key(source_name, "samples"), f"{latency * 1000:.1f}:{0 if failed else rates}")
+            pipe.ltrim(SourceHealth._key(source_name, "samples"), 0, config.SOURCE_HEALTH_WINDOW - 1)
+
+            if failed:
+                pipe.lpush(
+                    SourceHealth._key(source_name, "failures"),
+                    f"{datetime.now().isoformat()}|{error or 'empty rates'}"[:500],
+                )
+                pipe.ltrim(SourceHealth._key(source_name, "failures"), 0, 9)
+                pipe.incr(SourceHealth._key(source_name, "consecutive_failures"))
+            else:
+                pipe.set(SourceHealth._key(source_name, "consecutive_failures"), 0)
+            results = pipe.execute()
+
+            if failed and int(results[-1]) >= config.SOURCE_CIRCUIT_FAILURE_THRESHOLD:
+                opened = redis_client.set(
+                    SourceHealth._key(source_name, "circuit"), int(time.time()),
+                    ex=config.SOURCE_CIRCUIT_COOLDOWN, nx=True,
+                )
+                if opened:
+                    logger.warning(
+                        f"Circuit opened for {source_name} after {results[-1]} consecutive failures, "
+                        f"skipping it for {config.SOURCE_CIRCUIT_COOLDOWN} seconds"
+                    )
+        except Exception as e:
+            logger.warning(f"Failed to record health for {source_name}: {e}")
+
+    @staticmethod
+    def get_stats(source_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the current statistics for each source in `source_names`.
+        Sources without samples (or when Redis is unavailable) report requests=0.
+        """
+        raw = []
+        try:
+            pipe = redis_client.pipeline()
+            for source_name in source_names:
+                pipe.lrange(SourceHealth._key(source_name, "samples"), 0, -1)
+                pipe.lrange(SourceHealth._key(source_name, "failures"), 0, -1)
+                pipe.get(SourceHealth._key(source_name, "consecutive_failures"))
+                pipe.ttl(SourceHealth._key(source_name, "circuit"))
+            raw = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Source health unavailable: {e}")
+
+        stats = {}
+        for index, source_name in enumerate(source_names):
+            if raw:
+                samples, failures, consecutive, circuit_ttl = raw[index * 4:index * 4 + 4]
+            else:
+                samples, failures, consecutive, circuit_ttl = [], [], None, -2
+            stats[source_name] = SourceHealth._summarize(samples, failures, consecutive, circuit_ttl)
+        return stats
+
+    @staticmethod
+    def _summarize(samples: List[str], failures: List[str], consecutive: Optional[str], circuit_ttl: int) -> Dict[str, Any]:
+        latencies = []
+        rates = []
+        for sample in samples:
+            latency_ms, _, count = sample.partition(":")
+            latencies.append(float(latency_ms))
+            rates.append(int(count))
+
+        successes = [count for count in rates if count > 0]
+        requests = len(samples)
+
+        stats = {
+            "requests": requests,
+            # Smoothed so a single early failure doesn't rank a source last
+            "success_ratio": (len(successes) + 1) / (requests + 2),
+            "mean_latency_ms": statistics.fmean(latencies) if latencies else None,
+            "p50_latency_ms": SourceHealth._percentile(latencies, 0.5),
+            "p90_latency_ms": SourceHealth._percentile(latencies, 0.9),
+            "p95_latency_ms": SourceHealth._percentile(latencies, 0.95),
+            "rates_per_success": statistics.fmean(successes) if successes else None,
+            "consecutive_failures": int(consecutive or 0),
+            "circuit_open": circuit_ttl is not None and circuit_ttl > 0,
+            "circuit_retry_in": circuit_ttl if circuit_ttl and circuit_ttl > 0 else None,
+            "recent_failures": [
+                {"at": at, "error": error}
+                for at, _, error in (failure.partition("|") for failure in failures)
+            ],
+        }
+        return stats
+
+    @staticmethod
+    def _percentile(values: List[float], quantile: float) -> Optional[float]:
+        if not values:
+            return None
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(round(quantile * (len(ordered) - 1))))]
+
+    @staticmethod
+    def expected_cost(stats: Dict[str, Any], default_rates: float = 1.0) -> float:
+        """
+        Expected milliseconds spent per useful rate: the mean request time divided by
+        the probability of success and the rates a successful request returns.
+        """
+        latency = stats["mean_latency_ms"] or SourceHealth.PRIOR_LATENCY_MS
+        rates = stats["rates_per_success"] or default_rates
+        return latency / (stats["success_ratio"] * rates)
+
+    @staticmethod
+    def costs(stats: Dict[str, Dict[str, Any]]) -> Dict[str, float]:
+        """
+        Expected cost per useful rate for each source in `stats`. Sources that have not
+        returned rates yet are assumed to return as many as the others on average.
+        """
+        observed = [s["rates_per_success"] for s in stats.values() if s["rates_per_success"]]
+        default_rates = statistics.fmean(observed) if observed else 1.0
+        return {name: SourceHealth.expected_cost(s, default_rates) for name, s in stats.items()}
+
+    @staticmethod
+    def rank(source_names: List[str]) -> List[str]:
+        """
+        Order `source_names` by expected cost per useful rate, cheapest first, and drop
+        sources whose circuit is open. Ties (e.g. no samples yet) keep the given order.
+        """
+        stats = SourceHealth.get_stats(source_names)
+        costs = SourceHealth.costs(stats)
+
+        ranked = []
+        for source_name in source_names:
+            if stats[source_name]["circuit_open"]:
+                logger.info(f"Skipping {source_name}: circuit open")
+                continue
+            ranked.append(source_name)
+
+        return sorted(ranked, key=lambda name: costs[name])
@@ -1,8 +1,6 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Dict
-from app.scraping.base import BaseScraper
+from app.scraping.base import BaseScraper, strain, stream_until
 from app.utils.user_agent_rotator import UserAgentRotator
 import re
 
@@ -12,6 +10,10 @@ logger = get_logger(__name__)
 
 
 class CurrencyConverterOrgUkScraper(BaseScraper):
+    PARSE_ONLY = strain("table", "currencies")
+    STREAM_UNTIL = stream_until('class="currencies"', "</table>", 2)
+    BASE_URL = "https://www.currencyconverter.org.uk"
+
     def __init__(self, base_currency: str, target_currency: str = None, base_name_plural: str = ""):
         super().__init__(base_currency, target_currency)
         self.base_name_plural = base_name_plural
@@ -22,7 +24,7 @@ class CurrencyConverterOrgUkScraper(BaseScraper):
             )
 
         plural_name = base_name_plural.split()[-1].lower()
-        self.url = f"https://www.currencyconverter.org.uk/convert-{base_currency}/convert-{plural_name}.html"
+        self.url = f"{self.get_base_url()}/convert-{base_currency}/convert-{plural_name}.html"
         self.user_agent_rotator = UserAgentRotator()
         self.headers = {
             "User-Agent": self.user_agent_rotator.get_random_user_agent(),
@@ -35,21 +37,11 @@ class CurrencyConverterOrgUkScraper(BaseScraper):
         return "currency-converter-org-uk"
 
     def extract(self) -> str:
-        try:
-            logger.info(f"[{datetime.now()}] Extracting from {self.url}")
-            response = requests.get(self.url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"An unexpected error occurred: {e}")
-            raise
+        return self.fetch_text(self.url, headers=self.headers, timeout=10)
 
     def transform(self, raw_data: str) -> Dict[str, float]:
         try:
-            soup = BeautifulSoup(raw_data, "html.parser")
+            soup = self.parse_html(raw_data)
 
             # Find all tables with class "currencies"
             tables = soup.find_all("table", class_="currencies")
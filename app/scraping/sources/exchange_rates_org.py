@@ -1,8 +1,6 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Dict
-from app.scraping.base import BaseScraper
+from app.scraping.base import BaseScraper, strain, stream_until
 from app.utils.user_agent_rotator import UserAgentRotator
 from app.utils.helpers import extract_target_code
 from app.utils.custom_logger import get_logger
@@ -11,6 +9,10 @@ logger = get_logger(__name__)
 
 
 class ExchangeRatesOrgUkScraper(BaseScraper):
+    PARSE_ONLY = strain("div", "mobilescrollbars")
+    STREAM_UNTIL = stream_until('class="mobilescrollbars"', "</table>", 2)
+    BASE_URL = "https://www.exchangerates.org.uk"
+
     def __init__(
        self, base_currency: str, target_currency: str = None, base_name: str = ""):
         super().__init__(base_currency, target_currency)
@@ -20,7 +22,7 @@ class ExchangeRatesOrgUkScraper(BaseScraper):
             raise ValueError("base_name cannot be empty for ExchangeRatesOrgUkScraper")
 
         formatted_base_name = "-".join(word.capitalize() for word in base_name.split())
-        self.url = f"https://www.exchangerates.org.uk/{formatted_base_name}-{base_currency}-currency-table.html"
+        self.url = f"{self.get_base_url()}/{formatted_base_name}-{base_currency}-currency-table.html"
         self.user_agent_rotator = UserAgentRotator()
         self.headers = {
             "User-Agent": self.user_agent_rotator.get_random_user_agent(),
@@ -33,21 +35,11 @@ class ExchangeRatesOrgUkScraper(BaseScraper):
         return "exchange-rates-org-uk"
 
     def extract(self) -> str:
-        try:
-            logger.info(f"[{datetime.now()}] Extracting from {self.url}")
-            response = requests.get(self.url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"An unexpected error occurred: {e}")
-            raise
+        return self.fetch_text(self.url, headers=self.headers, timeout=10)
 
     def transform(self, raw_data) -> Dict[str, float]:
         try:
-            soup = BeautifulSoup(raw_data, "html.parser")
+            soup = self.parse_html(raw_data)
 
             # Find all divs with class "mobilescrollbars"
             mobilescroll_divs = soup.find_all("div", class_="mobilescrollbars")
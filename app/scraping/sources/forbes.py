@@ -1,8 +1,6 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Dict
-from app.scraping.base import BaseScraper
+from app.scraping.base import BaseScraper, strain, stream_until
 from app.utils.user_agent_rotator import UserAgentRotator
 from app.utils.custom_logger import get_logger
 import re
@@ -11,13 +9,17 @@ logger = get_logger(__name__)
 
 
 class ForbesScraper(BaseScraper):
+    PARSE_ONLY = strain("div", "result-box")
+    STREAM_UNTIL = stream_until('class="result-box-c1-c2"', "</div>")
+    BASE_URL = "https://www.forbes.com"
+
     def __init__(self, base_currency: str, target_currency: str):
         super().__init__(base_currency, target_currency)
 
         if not target_currency:
             raise ValueError("target_currency cannot be empty for ForbesScraper")
 
-        self.url = f"https://www.forbes.com/advisor/money-transfer/currency-converter/{base_currency.lower()}-{target_currency.lower()}/?amount=1"
+        self.url = f"{self.get_base_url()}/advisor/money-transfer/currency-converter/{base_currency.lower()}-{target_currency.lower()}/?amount=1"
         self.user_agent_rotator = UserAgentRotator()
         self.headers = {
             "User-Agent": self.user_agent_rotator.get_random_user_agent(),
@@ -30,21 +32,11 @@ class ForbesScraper(BaseScraper):
         return "forbes"
 
     def extract(self) -> str:
-        try:
-            logger.info(f"[{datetime.now()}] Extracting from {self.url}")
-            response = requests.get(self.url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
+        return self.fetch_text(self.url, headers=self.headers, timeout=10)
 
     def transform(self, raw_data) -> Dict[str, float]:
         try:
-            soup = BeautifulSoup(raw_data, "html.parser")
+            soup = self.parse_html(raw_data)
 
             result_box = soup.find("div", class_="result-box")
             if not result_box:
@@ -1,23 +1,29 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Dict
-from app.scraping.base import BaseScraper
+from app.scraping.base import BaseScraper, strain, stream_until
 from app.utils.user_agent_rotator import UserAgentRotator
 from app.utils.custom_logger import get_logger
 import json
+import re
 
 logger = get_logger(__name__)
 
+# The page state is one JSON script block; scanning for it avoids building a DOM
+NEXT_DATA = re.compile(r'<script[^>]*\bid="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+
 
 class FxEmpireScraper(BaseScraper):
+    PARSE_ONLY = strain("script", id="__NEXT_DATA__")
+    STREAM_UNTIL = stream_until('id="__NEXT_DATA__"', "</script>")
+    BASE_URL = "https://www.fxempire.com"
+
     def __init__(self, base_currency: str, target_currency: str):
         super().__init__(base_currency, target_currency)
 
         if not target_currency:
             raise ValueError("target_currency cannot be empty for FxEmpireScraper")
 
-        self.url = f"https://www.fxempire.com/currencies/{base_currency.lower()}-{target_currency.lower()}"
+        self.url = f"{self.get_base_url()}/currencies/{base_currency.lower()}-{target_currency.lower()}"
         self.user_agent_rotator = UserAgentRotator()
         self.headers = {
             "User-Agent": self.user_agent_rotator.get_random_user_agent(),
@@ -30,29 +36,23 @@ class FxEmpireScraper(BaseScraper):
         return "fx_empire"
 
     def extract(self) -> str:
-        try:
-            logger.info(f"[{datetime.now()}] Extracting from {self.url}")
-            response = requests.get(self.url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
+        return self.fetch_text(self.url, headers=self.headers, timeout=10)
 
     def transform(self, raw_data) -> Dict[str, float]:
         try:
             instrument_key = f"{self.base_currency.lower()}-{self.target_currency.lower()}"
-            soup = BeautifulSoup(raw_data, "html.parser")
+            match = NEXT_DATA.search(raw_data)
+            if match:
+                next_data = match.group(1)
+            else:
+                # Attribute order or quoting the scanner doesn't expect
+                next_data_script = self.parse_html(raw_data).find("script", id="__NEXT_DATA__")
+                if next_data_script is None:
+                    logger.error("Could not find the __NEXT_DATA__ script in the HTML.")
+                    raise ValueError("Missing __NEXT_DATA__ script.")
+                next_data = next_data_script.string
 
-            next_data_script = soup.find("script", id="__NEXT_DATA__")
-            if next_data_script is None:
-                logger.error("Could not find the __NEXT_DATA__ script in the HTML.")
-                raise ValueError("Missing __NEXT_DATA__ script.")
-            
-            json_data = json.loads(next_data_script.string)
+            json_data = json.loads(next_data)
             conversion_rate = None
             queries = json_data["props"]["pageProps"]["dehydratedState"]["queries"]
             for query in queries:
@@ -1,4 +1,3 @@
-import requests
 from datetime import datetime
 from typing import Dict
 from app.scraping.base import BaseScraper
@@ -8,10 +7,13 @@ from app.utils.custom_logger import get_logger
 logger = get_logger(__name__)
 
 class HexaRateScraper(BaseScraper):
+    BASE_URL = "https://hexarate.paikama.co"
+    OFFLOAD_TRANSFORM = False
+
     def __init__(self, base_currency: str, target_currency: str):
         super().__init__(base_currency, target_currency)
 
-        self.url = f"https://hexarate.paikama.co/api/rates/latest/{base_currency}?target={target_currency}"
+        self.url = f"{self.get_base_url()}/api/rates/latest/{base_currency}?target={target_currency}"
         self.user_agent_rotator = UserAgentRotator()
         self.headers = {
             "User-Agent": self.user_agent_rotator.get_random_user_agent(),
@@ -24,17 +26,8 @@ class HexaRateScraper(BaseScraper):
         return "hexarate"
     
     def extract(self) -> str:
-        try:
-            logger.info(f"[{datetime.now()}] Extracting from {self.url}")
-            response = requests.get(self.url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
+        response = self.fetch(self.url, headers=self.headers, timeout=10)
+        return response.json()
 
     def transform(self, raw_data) -> Dict[str, float]:
         try:
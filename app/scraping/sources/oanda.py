@@ -1,5 +1,5 @@
-import requests
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Dict
 from app.scraping.base import BaseScraper
 from app.utils.user_agent_rotator import UserAgentRotator
@@ -8,17 +8,28 @@ from app.utils.custom_logger import get_logger
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _date_params(today: date) -> Dict[str, str]:
+    # Computed once per day and shared by every scraper instance
+    return {
+        "start_date": (today - timedelta(days=1)).strftime("%Y-%m-%d"),
+        "end_date": today.strftime("%Y-%m-%d"),
+    }
+
+
 class OandaScraper(BaseScraper):
-    def __init__(self, base_currency: str, target_currency: str):
+    BASE_URL = "https://fxds-public-exchange-rates-api.oanda.com"
+    OFFLOAD_TRANSFORM = False
+
+    def __init__(self, base_currency: str, target_currency: str = None):
         super().__init__(base_currency, target_currency)
 
-        self.url = f"https://fxds-public-exchange-rates-api.oanda.com/cc-api/currencies"
+        self.url = f"{self.get_base_url()}/cc-api/currencies"
         self.params = {
             "base": base_currency,
             "quote": target_currency,
             "data_type": "chart",
-            "start_date": (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d"),
-            "end_date": datetime.now().strftime("%Y-%m-%d"),
+            **_date_params(date.today()),
         }
         self.user_agent_rotator = UserAgentRotator()
         self.headers = {
@@ -32,19 +43,8 @@ class OandaScraper(BaseScraper):
         return "oanda"
 
     def extract(self) -> str:
-        try:
-            logger.info(f"[{datetime.now()}] Extracting from {self.url}")
-            response = requests.get(
-                self.url, params=self.params, headers=self.headers, timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
+        response = self.fetch(self.url, params=self.params, headers=self.headers, timeout=10)
+        return response.json()
 
     def transform(self, raw_data) -> Dict[str, float]:
         try:
@@ -1,8 +1,6 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Dict
-from app.scraping.base import BaseScraper
+from app.scraping.base import BaseScraper, strain, stream_until
 from app.utils.user_agent_rotator import UserAgentRotator
 from app.utils.custom_logger import get_logger
 
@@ -10,10 +8,14 @@ logger = get_logger(__name__)
 
 
 class TradingEconomicsScraper(BaseScraper):
+    PARSE_ONLY = strain("table", "table-heatmap")
+    STREAM_UNTIL = stream_until("table-heatmap", "</table>")
+    BASE_URL = "https://tradingeconomics.com"
+
     def __init__(self, base_currency: str, target_currency: str = None):
         super().__init__(base_currency, target_currency)
 
-        self.url = f"https://tradingeconomics.com/currencies?base={base_currency}"
+        self.url = f"{self.get_base_url()}/currencies?base={base_currency}"
         self.user_agent_rotator = UserAgentRotator()
         self.headers = {
             "User-Agent": self.user_agent_rotator.get_random_user_agent(),
@@ -26,21 +28,11 @@ class TradingEconomicsScraper(BaseScraper):
         return "trading-economics"
     
     def extract(self) -> str:
-        try:
-            logger.info(f"[{datetime.now()}] Extracting from {self.url}")
-            response = requests.get(self.url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"An unexpected error occurred: {e}")
-            raise
+        return self.fetch_text(self.url, headers=self.headers, timeout=10)
 
     def transform(self, raw_data: str) -> Dict[str, float]:
         try:
-            soup = BeautifulSoup(raw_data, "html.parser")
+            soup = self.parse_html(raw_data)
             table = soup.find("table", class_="table-heatmap")
 
             if not table:
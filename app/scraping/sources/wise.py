@@ -1,18 +1,20 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Dict
-from app.scraping.base import BaseScraper
+from app.scraping.base import BaseScraper, strain, stream_until
 from app.utils.user_agent_rotator import UserAgentRotator
 from app.utils.custom_logger import get_logger
 
 logger = get_logger(__name__)
 
 class WiseScraper(BaseScraper):
+    PARSE_ONLY = strain("div", "tapestry-wrapper")
+    STREAM_UNTIL = stream_until('class="cc__source-to-target"', "</h3>")
+    BASE_URL = "https://wise.com"
+
     def __init__(self, base_currency: str, target_currency: str):
         super().__init__(base_currency, target_currency)
 
-        self.url = f"https://wise.com/currency-converter/{base_currency.lower()}-to-{target_currency.lower()}/chart"
+        self.url = f"{self.get_base_url()}/currency-converter/{base_currency.lower()}-to-{target_currency.lower()}/chart"
         self.user_agent_rotator = UserAgentRotator()
         self.headers = {
             "User-Agent": self.user_agent_rotator.get_random_user_agent(),
@@ -25,21 +27,11 @@ class WiseScraper(BaseScraper):
         return "wise"
     
     def extract(self) -> str:
-        try:
-            logger.info(f"[{datetime.now()}] Extracting from {self.url}")
-            response = requests.get(self.url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"An unexpected error occurred: {e}")
-            raise
+        return self.fetch_text(self.url, headers=self.headers, timeout=10)
 
     def transform(self, raw_data: str) -> Dict[str, float]:
         try:
-            soup = BeautifulSoup(raw_data, "html.parser")
+            soup = self.parse_html(raw_data)
             
             # Find the parent element that contains the exchange rate information.
             tapestry_element = soup.find("div", class_="tapestry-wrapper")
@@ -1,8 +1,6 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Dict
-from app.scraping.base import BaseScraper
+from app.scraping.base import BaseScraper, strain, stream_until
 from app.utils.user_agent_rotator import UserAgentRotator
 from app.utils.custom_logger import get_logger
 import re
@@ -10,10 +8,14 @@ import re
 logger = get_logger(__name__)
 
 class XeScraper(BaseScraper):
+    PARSE_ONLY = strain("div", **{"data-testid": "conversion"})
+    STREAM_UNTIL = stream_until('data-testid="conversion"', "</div>")
+    BASE_URL = "https://www.xe.com"
+
     def __init__(self, base_currency: str, target_currency: str):
         super().__init__(base_currency, target_currency)
 
-        self.url = f"https://www.xe.com/currencyconverter/convert/?Amount=1&From={base_currency}&To={target_currency}"
+        self.url = f"{self.get_base_url()}/currencyconverter/convert/?Amount=1&From={base_currency}&To={target_currency}"
         self.user_agent_rotator = UserAgentRotator()
         self.headers = {
             "User-Agent": self.user_agent_rotator.get_random_user_agent(),
@@ -26,21 +28,11 @@ class XeScraper(BaseScraper):
         return "xe"
     
     def extract(self) -> str:
-        try:
-            logger.info(f"[{datetime.now()}] Extracting from {self.url}")
-            response = requests.get(self.url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"An unexpected error occurred: {e}")
-            raise
+        return self.fetch_text(self.url, headers=self.headers, timeout=10)
 
     def transform(self, raw_data: str) -> Dict[str, float]:
         try:
-            soup = BeautifulSoup(raw_data, "html.parser")
+            soup = self.parse_html(raw_data)
 
             # For XE.com, locate the element that contains the conversion result.
             # Here we look for the container that has data-testid="conversion".
@@ -1,17 +1,19 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Dict
-from app.scraping.base import BaseScraper
+from app.scraping.base import BaseScraper, strain, stream_until
 from app.utils.user_agent_rotator import UserAgentRotator
 from app.utils.custom_logger import get_logger
 
 logger = get_logger(__name__)
 
 class XRatesScraper(BaseScraper):
+    PARSE_ONLY = strain("table", "ratesTable")
+    STREAM_UNTIL = stream_until('class="tablesorter ratesTable"', "</table>")
+    BASE_URL = "https://www.x-rates.com"
+
     def __init__(self, base_currency: str, target_currency: str = None):
         super().__init__(base_currency, target_currency)
-        self.url = f"https://www.x-rates.com/table/?from={base_currency}&amount=1"
+        self.url = f"{self.get_base_url()}/table/?from={base_currency}&amount=1"
         self.user_agent_rotator = UserAgentRotator()
         self.headers = {
             "User-Agent": self.user_agent_rotator.get_random_user_agent(),
@@ -24,18 +26,11 @@ class XRatesScraper(BaseScraper):
         return "xrates"
 
     def extract(self) -> str:
-        try:
-            logger.info(f"[{datetime.now()}] Extracting from {self.url}")
-            response = requests.get(self.url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            logger.error(f"Failed to extract from {self.url}: {e}")
-            raise
+        return self.fetch_text(self.url, headers=self.headers, timeout=10)
 
     def transform(self, raw_data: str) -> Dict[str, float]:
         try:
-            soup = BeautifulSoup(raw_data, "html.parser")
+            soup = self.parse_html(raw_data)
             table = soup.find("table", class_="tablesorter ratesTable")
             rows = table.find_all("tr") if table else []
 
@@ -0,0 +1,121 @@
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def anchor_row(anchor: str, rates: Dict[str, float]) -> Dict[str, float]:
+    """
+    Return the anchor's rates including the anchor itself (1.0), skipping unusable values.
+    """
+    row = {target: rate for target, rate in rates.items() if rate and rate > 0}
+    row[anchor] = 1.0
+    return row
+
+
+def cross_rates(anchor: str, rates: Dict[str, float], base: str) -> Optional[Dict[str, float]]:
+    """
+    Derive every rate of `base` from one anchor's rates: base->target = (anchor->target) / (anchor->base).
+
+    Args:
+        anchor: Anchor currency code the rates were scraped for (e.g. 'USD')
+        rates: { target_code: rate } for 1 anchor
+        base: Currency code to derive the row for
+
+    Returns:
+        { target_code: rate } for 1 base (excluding base itself), or None if the anchor
+        has no rate for base
+    """
+    row = anchor_row(anchor, rates)
+    anchor_to_base = row.get(base)
+    if not anchor_to_base:
+        return None
+
+    factor = 1 / anchor_to_base
+    return {target: rate * factor for target, rate in row.items() if target != base}
+
+
+def triangulate(
+    anchor_results: List[Tuple[str, Dict[str, float], str]], bases: List[str]
+) -> Tuple[Dict[str, Dict[str, float]], Dict[str, str]]:
+    """
+    Build the rate rows for `bases` from a few scraped anchor bases.
+
+    Anchors are used in the order given: each base is derived from the first anchor that
+    quotes it. An anchor that is itself one of `bases` keeps its scraped rates.
+
+    Args:
+        anchor_results: (anchor_code, rates, source_name) per successfully scraped anchor
+        bases: Base currency codes to produce rows for
+
+    Returns:
+        (rows, sources): { base: { target: rate } } and { base: source tag }, where the tag
+        is the scraped source for anchors and "triangulated:<anchor>:<source>" otherwise.
+        Bases no anchor quotes are missing from both.
+    """
+    rows = {}
+    sources = {}
+
+    for anchor, rates, source_name in anchor_results:
+        if anchor in bases:
+            rows[anchor] = dict(rates)
+            sources[anchor] = source_name
+
+    for base in bases:
+        if base in rows:
+            continue
+
+        for anchor, rates, source_name in anchor_results:
+            row = cross_rates(anchor, rates, base)
+            if row is not None:
+                rows[base] = row
+                sources[base] = f"triangulated:{anchor}:{source_name}"
+                break
+
+    return rows, sources
+
+
+def check_drift(
+    anchor_results: List[Tuple[str, Dict[str, float], str]], tolerance: float
+) -> List[Dict]:
+    """
+    Compare every pair of anchors: rates scraped for anchor A against the same rates
+    derived through anchor B. Large deviations mean a source is stale or wrong, so
+    anything derived from it is suspect.
+
+    Returns:
+        One entry per (anchor, anchor, target) whose relative deviation exceeds `tolerance`,
+        worst first.
+    """
+    drift = []
+
+    for (anchor_a, rates_a, source_a), (anchor_b, rates_b, source_b) in combinations(anchor_results, 2):
+        derived = cross_rates(anchor_b, rates_b, anchor_a)
+        if derived is None:
+            continue
+
+        for target, rate in anchor_row(anchor_a, rates_a).items():
+            if target == anchor_a or target not in derived:
+                continue
+
+            deviation = abs(derived[target] - rate) / rate
+            if deviation > tolerance:
+                drift.append(
+                    {
+                        "pair": f"{anchor_a}-{target}",
+                        "scraped": rate,
+                        "scraped_source": source_a,
+                        "derived": derived[target],
+                        "derived_via": f"{anchor_b}:{source_b}",
+                        "deviation": deviation,
+                    }
+                )
+
+    drift.sort(key=lambda entry: entry["deviation"], reverse=True)
+    if drift:
+        worst = ", ".join(f"{d['pair']} {d['deviation']:.2%}" for d in drift[:5])
+        logger.warning(
+            f"Cross-anchor drift above {tolerance:.2%} for {len(drift)} rates (worst: {worst})"
+        )
+    return drift
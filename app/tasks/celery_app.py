@@ -31,6 +31,11 @@ celery_app.conf.beat_schedule = {
     #     "task": "app.tasks.exchange_rates.scrape_all_exchange_rates",
     #     "schedule": crontab(hour="21", minute="0"),
     # },
+    # Failed bases due for a retry, in one batch (see RetryQueue)
+    "retry-failed-currencies": {
+        "task": "app.tasks.exchange_rates.retry_failed_currencies",
+        "schedule": config.RETRY_BATCH_INTERVAL,
+    },
     # Clean up old task records weekly
     "cleanup-old-task-records": {
         "task": "app.tasks.maintenance.cleanup_old_task_records",
@@ -42,5 +47,14 @@ celery_app.conf.beat_schedule = {
     },
 }
 
-from app.tasks.exchange_rates import scrape_currency_group, scrape_all_exchange_rates, scrape_single_currency
+# The adaptive schedule replaces the fixed group crontabs
+if config.SCRAPE_SCHEDULE == "adaptive":
+    del celery_app.conf.beat_schedule["scrape-primary-currencies-every-6-hours"]
+    del celery_app.conf.beat_schedule["scrape-secondary-currencies-every-12-hours"]
+    celery_app.conf.beat_schedule["schedule-adaptive-scrapes"] = {
+        "task": "app.tasks.exchange_rates.schedule_adaptive_scrapes",
+        "schedule": config.SCRAPE_ADAPTIVE_TICK,
+    }
+
+from app.tasks.exchange_rates import scrape_currency_group, scrape_all_exchange_rates, scrape_single_currency, scrape_base_currency, finalize_currency_group, schedule_adaptive_scrapes, retry_failed_currencies
 from app.tasks.maintenance import cleanup_old_task_records, create_next_month_partition
\ No newline at end of file
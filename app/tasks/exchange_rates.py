@@ -1,9 +1,11 @@
 import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from celery import chord, group
 from app.utils.custom_logger import get_logger
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.dialects.postgresql import insert
+from app.core.config import config
 from app.db.database import get_db
 from app.models.models import Currency, ExchangeRate
 from app.exceptions import ScrapingException
@@ -11,16 +13,239 @@ from app.tasks.celery_app import celery_app
 from app.scraping.manager import ScraperManager
 from app.exceptions import ScrapingException
 from app.scraping.manager import ScraperCapability
+from app.scraping.coverage import CoverageIndex
+from app.scraping.deadline import Deadline
+from app.scraping.hedging import scrape_hedged
+from app.scraping.refresh_schedule import RefreshSchedule
+from app.scraping.triangulation import check_drift, triangulate
+from app.db.ingest import RateIngestWriter, write_rates
+from app.tasks.job_lease import JobLease, PendingScrapes
 from app.tasks.progress_tracker import ProgressTracker
+from app.tasks.retry_queue import RetryQueue
+from app.utils.cache_manager import CacheManager
+from app.utils.job_events import JobEvents
 
 logger = get_logger(__name__)
 
+# Currency groups scraped by scrape_currency_group
+CURRENCY_GROUPS = {
+    "primary": [
+        "USD",  # US Dollar - Global reserve currency
+        "EUR",  # Euro - Major currency for the Eurozone
+        "GBP",  # British Pound Sterling - Historically significant
+        "JPY",  # Japanese Yen - Major Asian currency, safe-haven status
+        "CAD",  # Canadian Dollar - Commodity-linked, stable economy
+        "AUD",  # Australian Dollar - Commodity-driven, widely traded
+        "CHF",  # Swiss Franc - Safe-haven currency
+        "CNY",  # Chinese Yuan - Growing global influence
+        "SGD",  # Singapore Dollar - Strong, stable, regional hub
+        "HKD",  # Hong Kong Dollar - Pegged to USD, financial center
+        "KRW",  # South Korean Won - Major industrialized economy
+        "SEK",  # Swedish Krona - Stable, widely traded in Europe
+        "NOK",  # Norwegian Krone - Oil-linked, strong economy
+        "NZD",  # New Zealand Dollar - Commodity-driven, stable
+        "INR",  # Indian Rupee - Emerging market, large economy
+    ],
+    "secondary": [
+        "AED",
+        "AFN",
+        "XCD",
+        "ALL",
+        "AMD",
+        "AOA",
+        "ARS",
+        "AWG",
+        "AZN",
+        "BAM",
+        "BBD",
+        "BDT",
+        "XOF",
+        "BGN",
+        "BHD",
+        "BIF",
+        "BMD",
+        "BND",
+        "BOB",
+        "BRL",
+        "BSD",
+        "BTN",
+        "BWP",
+        "BYN",
+        "BZD",
+        "CDF",
+        "XAF",
+        "CLP",
+        "COP",
+        "CRC",
+        "CUP",
+        "CVE",
+        "ANG",
+        "CZK",
+        "DJF",
+        "DKK",
+        "DOP",
+        "DZD",
+        "EGP",
+        "MAD",
+        "ERN",
+        "ETB",
+        "FJD",
+        "FKP",
+        "GEL",
+        "GHS",
+        "GIP",
+        "GMD",
+        "GNF",
+        "GTQ",
+        "GYD",
+        "HNL",
+        "HRK",
+        "HTG",
+        "HUF",
+        "IDR",
+        "ILS",
+        "IQD",
+        "IRR",
+        "ISK",
+        "JMD",
+        "JOD",
+        "KES",
+        "KGS",
+        "KHR",
+        "KMF",
+        "KPW",
+        "KWD",
+        "KYD",
+        "KZT",
+        "LAK",
+        "LBP",
+        "LKR",
+        "LRD",
+        "LSL",
+        "LYD",
+        "MDL",
+        "MGA",
+        "MKD",
+        "MMK",
+        "MNT",
+        "MOP",
+        "MRO",
+        "MUR",
+        "MVR",
+        "MWK",
+        "MXN",
+        "MYR",
+        "MZN",
+        "NAD",
+        "XPF",
+        "NGN",
+        "NIO",
+        "NPR",
+        "OMR",
+        "PAB",
+        "PEN",
+        "PGK",
+        "PHP",
+        "PKR",
+        "PLN",
+        "PYG",
+        "QAR",
+        "RON",
+        "RSD",
+        "RUB",
+        "RWF",
+        "SAR",
+        "SBD",
+        "SCR",
+        "SDG",
+        "SHP",
+        "SLL",
+        "SOS",
+        "SRD",
+        "SSP",
+        "STD",
+        "SYP",
+        "SZL",
+        "THB",
+        "TJS",
+        "TMT",
+        "TND",
+        "TOP",
+        "TRY",
+        "TTD",
+        "TWD",
+        "TZS",
+        "UAH",
+        "UGX",
+        "UYU",
+        "UZS",
+        "VEF",
+        "VND",
+        "VUV",
+        "WST",
+        "YER",
+        "ZMW",
+        "ZWL",
+        "MRU",
+        "STN",
+    ],
+}
+
+# Bases in the order they are worth scraping when a job can't reach them all: the primary
+# group (itself listed from most to least widely used) first, then the secondary group.
+VALUE_ORDER = CURRENCY_GROUPS["primary"] + CURRENCY_GROUPS["secondary"]
+
+
+def order_by_value(currencies):
+    """
+    Sort currencies by VALUE_ORDER, most valuable first. Unlisted currencies keep their
+    order after the listed ones. With the adaptive SCRAPE_SCHEDULE, currencies are ranked
+    by their refresh priority (see `RefreshSchedule`) first.
+    """
+    rank = {code: index for index, code in enumerate(VALUE_ORDER)}
+    priority = RefreshSchedule.priorities() if config.SCRAPE_SCHEDULE == "adaptive" else {}
+    return sorted(
+        currencies,
+        key=lambda currency: (-priority.get(currency.code, 0.0), rank.get(currency.code, len(rank))),
+    )
+
+
+@celery_app.task
+def schedule_adaptive_scrapes():
+    """
+    Beat task of the adaptive SCRAPE_SCHEDULE: queue one scrape of every base whose
+    refresh interval (see `RefreshSchedule`) has passed since it was last refreshed or
+    queued. The groups' bases are always scheduled, other bases once the API serves them.
+    """
+    db = next(get_db())
+    try:
+        currencies = db.query(Currency).all()
+    finally:
+        db.close()
+
+    plan = RefreshSchedule.plan(currencies, VALUE_ORDER)
+    RefreshSchedule.save_plan(plan)
+    due = [entry["base"] for entry in plan if entry["due"]]
+    if not due:
+        return {"status": "idle", "message": f"None of {len(plan)} bases due"}
+
+    RefreshSchedule.mark_dispatched(due)
+    scrape_all_exchange_rates.apply_async(kwargs={"base_codes": due})
+    logger.info(f"Queued a scrape of {len(due)} due bases: {', '.join(due)}")
+    return {"status": "dispatched", "bases": due}
+
 
 @celery_app.task(bind=True, max_retries=3)
-def scrape_all_exchange_rates(self):
+def scrape_all_exchange_rates(self, base_codes=None):
     """
     Main task to scrape exchange rates for all currency pairs.
     Uses a failsafe mechanism to try different sources.
+
+    Bases are scraped most valuable first (see `order_by_value`) within SCRAPE_JOB_BUDGET
+    seconds; the ones not reached by then are deferred to a follow-up run.
+
+    Args:
+        base_codes: Only scrape these base currencies (used by deferred follow-up runs)
     """
 
     job_id = f"scrape_rates_{datetime.now().strftime('%Y%m%d%H%M%S')}"
@@ -40,136 +265,48 @@ def scrape_all_exchange_rates(self):
             ProgressTracker.complete_job(job_id, "failed")
             return {"status": "failed", "message": "No currencies found"}
 
+        bases = order_by_value(
+            [c for c in currencies if base_codes is None or c.code in base_codes]
+        )
+
         # Create scraper manager
-        scraper_manager = ScraperManager()
+        deadline = Deadline(config.SCRAPE_JOB_BUDGET)
+        scraper_manager = ScraperManager(deadline=deadline, job_id=job_id)
 
         # Track all successful and failed pairs
         successful_pairs = 0
         failed_pairs = 0
-        all_rates = []
+        deferred = []
 
-        for base_currency in currencies:
-            try:
-                success = False
-                result = None
-
-                # Try multi-pair scrapers first
-                try:
-                    # Use the scraper manager to get rates with failsafe (only multi-pair)
-                    result = scrape_with_multi_pair(
-                        scraper_manager=scraper_manager,
-                        base_currency=base_currency.code,
-                        base_name=base_currency.name,
-                        base_name_plural=base_currency.name_plural,
-                    )
-
-                    success = True
-
-                except ScrapingException as e:
-                    logger.error(
-                        f"Failed to scrape from all multi-pair sources for {base_currency.code}: {e}"
-                    )
-
-                # If multi-pair scrapers failed, try single-pair scrapers
-                if not success:
-                    combined_rates = {}
-                    source_used = None
-                    now = datetime.now()
-
-                    for target_currency in currencies:
-                        # Skip self-conversion
-                        if target_currency.id == base_currency.id:
-                            continue
-                        try:
-                            # Use the scraper manager to get rates with failsafe (only single-pair)
-                            result = scrape_with_single_pair(
-                                scraper_manager=scraper_manager,
-                                base_currency=base_currency.code,
-                                target_currency=target_currency.code,
-                                base_name=base_currency.name,
-                                base_name_plural=base_currency.name_plural,
-                            )
-                            combined_rates.update(result["rates"])
-                            # Track which source was used (use the first successful one)
-                            if not source_used:
-                                source_used = result["source"]
-
-                        except ScrapingException as e:
-                            logger.error(
-                                f"Failed to scrape from all single-pair sources for {base_currency.code} to {target_currency.code}: {e}"
-                            )
-                            failed_pairs += 1
-                            continue
-
-                    # If we got any rates, consider it a success
-                    if combined_rates:
-                        result = {
-                            "rates": combined_rates,
-                            "source": source_used or "combined",
-                            "timestamp": datetime.now(),
-                        }
-                        success = True
-                # If we got results, process them
-                if success and result:
-                    rates = result["rates"]
-                    source = result["source"]
-                    now = datetime.now()  # Ensure 'now' is defined regardless of which path was taken
-
-                    for target_currency in currencies:
-                        # Skip self-conversion
-                        if target_currency.id == base_currency.id:
-                            continue
-
-                        # Check if the rate exists in the scraped data
-                        if target_currency.code in rates:
-                            rate = rates[target_currency.code]
-                            all_rates.append(
-                                {
-                                    "base_currency_id": base_currency.id,
-                                    "target_currency_id": target_currency.id,
-                                    "rate": rate,
-                                    "source": source,
-                                    "created_at": now,
-                                }
-                            )
-                            successful_pairs += 1
-                        else:
-                            logger.warning(
-                                f"Rate for {base_currency.code} to {target_currency.code} not found in scraped data"
-                            )
-                            failed_pairs += 1
-                    # Mark this currency as complete
-                    ProgressTracker.mark_currency_complete(job_id, base_currency.code)
-                else:
-                    logger.error(
-                        f"Failed to scrape rates for {base_currency.code} from all sources"
-                    )
-                    failed_pairs += len(currencies) - 1
-                    ProgressTracker.mark_currency_failed(job_id, base_currency.code)
-
-                    # Schedule a retry for this currency if needed
-                    if ProgressTracker.should_retry_currency(
-                        job_id, base_currency.code
-                    ):
-                        scrape_single_currency.apply_async(
-                            args=[base_currency.id],
-                            countdown=60 * 5,  # Retry after 5 minutes
-                        )
-            except Exception as e:
-                logger.error(f"Scraping failed for {base_currency.code}: {e}")
-                failed_pairs += len(currencies) - 1  # All target currencies failed
-                ProgressTracker.mark_currency_failed(job_id, base_currency.code)
+        stored_codes = []
 
-                # Schedule a retry for this currency if needed
-                if ProgressTracker.should_retry_currency(job_id, base_currency.code):
-                    scrape_single_currency.apply_async(
-                        args=[base_currency.id],
-                        countdown=60 * 5,  # Retry after 5 minutes
-                    )
+        # Each base's rates are written while the next ones are scraped
+        with RateIngestWriter(job_id=job_id) as writer:
+            for index, base_currency in enumerate(bases):
+                if deadline.expired():
+                    deferred = bases[index:]
+                    break
 
-        # Bulk insert all rates into the database
-        if all_rates:
-            bulk_insert_rates(db, all_rates)
+                result = scrape_base(
+                    scraper_manager, base_currency, currencies, datetime.now(timezone.utc), writer
+                )
+                record_base_result(job_id, result)
+                successful_pairs += result["stored"]
+                failed_pairs += result["failed"]
+                if result["stored"]:
+                    stored_codes.append(base_currency.code)
+        successful_pairs -= writer.failed
+        failed_pairs += writer.failed
+
+        bases_refreshed(stored_codes)
+
+        if deferred:
+            deferred_codes = [c.code for c in deferred]
+            logger.warning(
+                f"Job budget of {config.SCRAPE_JOB_BUDGET}s spent, deferring {len(deferred_codes)} bases "
+                f"to a follow-up run: {', '.join(deferred_codes)}"
+            )
+            scrape_all_exchange_rates.apply_async(kwargs={"base_codes": deferred_codes})
 
         execution_time = time.time() - start_time
         logger.info(
@@ -182,6 +319,7 @@ def scrape_all_exchange_rates(self):
             "status": "success",
             "message": f"Scraped {successful_pairs} pairs successfully in {execution_time:.2f} seconds",
             "failed": failed_pairs,
+            "deferred": len(deferred),
             "job_id": job_id,
         }
 
@@ -202,9 +340,14 @@ def scrape_all_exchange_rates(self):
 @celery_app.task(bind=True, max_retries=3)
 def scrape_single_currency(self, currency_id):
     """
-    Retry task for a single currency that failed during the main scraping task.
+    Refresh task for a single currency, queued by the API when its rates are stale
+    (failed bases of scraping jobs are retried by `retry_failed_currencies`).
     Only processes one base currency against all target currencies.
 
+    Queued through `PendingScrapes`, so refreshes of a base coalesce into one pending task.
+    The base is scraped under its JobLease; if another task is scraping it, this one
+    has nothing left to do.
+
     Args:
         currency_id: ID of the base currency to scrape
     """
@@ -212,6 +355,7 @@ def scrape_single_currency(self, currency_id):
 
     # Get a database session
     db = next(get_db())
+    lease = None
 
     try:
         # Get the base currency and all target currencies
@@ -229,107 +373,38 @@ def scrape_single_currency(self, currency_id):
         base_currency_name_plural = base_currency.name_plural
         base_currency_id = base_currency.id
 
+        lease = JobLease(f"base:{base_currency_code}")
+        if not lease.acquire():
+            PendingScrapes.clear(base_currency_code)
+            logger.info(f"{base_currency_code} is being scraped by another task, skipping it")
+            return {
+                "status": "skipped",
+                "message": f"{base_currency_code} is being scraped by another task",
+            }
+
         all_currencies = db.query(Currency).all()
-        # Create a mapping of currency IDs to their codes for later reference
-        currency_mapping = {c.id: {"code": c.code, "id": c.id} for c in all_currencies}
 
         # Create a scraper manager
         scraper_manager = ScraperManager()
 
         try:
-            # Track results across multiple sources
-            current_rates = []
-            now = datetime.now()  # Define 'now' at the beginning for use in any path
-            source_used = None
-
-            # First try multi-pair scrapers
-            try:
-                # Use the multi-pair scrapers first
-                result = scrape_with_multi_pair(
-                    scraper_manager=scraper_manager,
-                    base_currency=base_currency_code,
-                    base_name=base_currency_name,
-                    base_name_plural=base_currency_name_plural,
-                )
+            targets = [c for c in all_currencies if c.id != base_currency_id]
+            result = scrape_base_rates(
+                scraper_manager=scraper_manager,
+                base_currency=base_currency_code,
+                target_currencies=[t.code for t in targets],
+                base_name=base_currency_name,
+                base_name_plural=base_currency_name_plural,
+            )
+            current_rates = rate_records(base_currency_id, targets, result, datetime.now(timezone.utc))
 
-                rates = result["rates"]
-                source = result["source"]
-
-                # Process the rates
-                for target_id, target_info in currency_mapping.items():
-                    # Skip self-conversion
-                    if target_id == base_currency_id:
-                        continue
-
-                    # Check if the rate exists in the scraped data
-                    target_code = target_info["code"]
-                    if target_code in rates:
-                        rate = rates[target_code]
-                        current_rates.append(
-                            {
-                                "base_currency_id": base_currency_id,
-                                "target_currency_id": target_id,
-                                "rate": rate,
-                                "source": source,
-                                "created_at": now,
-                            }
-                        )
-
-            except ScrapingException:
-                # If multi-pair scrapers fail, try single-pair for each target currency
-                for target_id, target_info in currency_mapping.items():
-                    # Skip self-conversion
-                    if target_id == base_currency_id:
-                        continue
-
-                    target_code = target_info["code"]
-
-                    try:
-                        result = scrape_with_single_pair(
-                            scraper_manager=scraper_manager,
-                            base_currency=base_currency_code,
-                            target_currency=target_code,
-                            base_name=base_currency_name,
-                            base_name_plural=base_currency_name_plural,
-                        )
-
-                        rates = result["rates"]
-                        source = result["source"]
-
-                        # Use the first successful source for all
-                        if not source_used:
-                            source_used = source
-
-                        # Get the rate for this specific target currency
-                        if target_code in rates:
-                            rate = rates[target_code]
-                            current_rates.append(
-                                {
-                                    "base_currency_id": base_currency_id,
-                                    "target_currency_id": target_id,
-                                    "rate": rate,
-                                    "source": source_used
-                                    or source,  # Use consistent source
-                                    "created_at": now,
-                                }
-                            )
-                    except ScrapingException:
-                        # Skip this target currency and continue with others
-                        logger.warning(
-                            f"Failed to scrape rate for {base_currency_code} to {target_code}"
-                        )
-                        continue
-
-            # Bulk insert the rates
-            if current_rates:
-                try:
-                    # Call bulk_insert_rates but don't let it close our session
-                    bulk_insert_rates_without_closing(db, current_rates)
-                    db.commit()
-                except Exception as e:
-                    db.rollback()
-                    logger.error(f"Error inserting rates: {e}")
-                    raise
+            # Store the rates (unchanged ones are skipped by the writer)
+            with RateIngestWriter() as writer:
+                writer.add(current_rates)
+            if writer.failed:
+                raise ScrapingException(f"Failed to store {writer.failed} rates for {base_currency_code}")
+            bases_refreshed([base_currency_code])
+            PendingScrapes.clear(base_currency_code)
 
             logger.info(
                 f"Successfully scraped {len(current_rates)} rates for {base_currency_code}"
@@ -341,6 +416,8 @@ def scrape_single_currency(self, currency_id):
 
         except Exception as e:
             logger.error(f"All sources failed for {base_currency_code}: {e}")
+            # The retry stays the base's pending scrape
+            PendingScrapes.renew(base_currency_code, 60 * 15 + config.RATE_REFRESH_DEDUP_TTL)
             self.retry(
                 exc=e, countdown=60 * 15
             )  # Retry after 15 minutes with exponential backoff
@@ -352,187 +429,45 @@ def scrape_single_currency(self, currency_id):
         self.retry(exc=e, countdown=60 * 5)  # Retry after 5 minutes
         return {"status": "failed", "message": str(e)}
     finally:
+        if lease is not None:
+            lease.release()
         db.close()
 
 
 @celery_app.task(bind=True, max_retries=3)
-def scrape_currency_group(self, group_type):
+def scrape_currency_group(self, group_type, mode=None, base_codes=None):
     """
     Task to scrape a specific group of currencies.
 
+    With SCRAPE_FAN_OUT, every base is scraped by its own `scrape_base_currency` subtask,
+    so the group is spread over all workers and a failing base only loses its own rates;
+    `finalize_currency_group` then stores the results of all subtasks. Otherwise the bases
+    are scraped in this task and stored the same way.
+
+    Bases are scraped most valuable first (see `order_by_value`) within SCRAPE_JOB_BUDGET
+    seconds; the ones not reached by then are deferred to a follow-up task, so a slow run
+    doesn't overlap the next scheduled one.
+
     Args:
         group_type: Type of currency group ('major', 'secondary', etc.)
+        mode: "direct" scrapes every base, "triangulated" scrapes the TRIANGULATION_ANCHORS
+            and derives the other bases from them (default: SCRAPE_GROUP_MODE)
+        base_codes: Only scrape these bases of the group (used by deferred follow-up tasks)
     """
-    logger.info(f"Starting scraping task for {group_type} currencies")
-
-    # Define currency groups
-    CURRENCY_GROUPS = {
-        "primary": [
-            "USD",  # US Dollar - Global reserve currency
-            "EUR",  # Euro - Major currency for the Eurozone
-            "GBP",  # British Pound Sterling - Historically significant
-            "JPY",  # Japanese Yen - Major Asian currency, safe-haven status
-            "CAD",  # Canadian Dollar - Commodity-linked, stable economy
-            "AUD",  # Australian Dollar - Commodity-driven, widely traded
-            "CHF",  # Swiss Franc - Safe-haven currency
-            "CNY",  # Chinese Yuan - Growing global influence
-            "SGD",  # Singapore Dollar - Strong, stable, regional hub
-            "HKD",  # Hong Kong Dollar - Pegged to USD, financial center
-            "KRW",  # South Korean Won - Major industrialized economy
-            "SEK",  # Swedish Krona - Stable, widely traded in Europe
-            "NOK",  # Norwegian Krone - Oil-linked, strong economy
-            "NZD",  # New Zealand Dollar - Commodity-driven, stable
-            "INR",  # Indian Rupee - Emerging market, large economy
-        ],
-        "secondary": [
-            "AED",
-            "AFN",
-            "XCD",
-            "ALL",
-            "AMD",
-            "AOA",
-            "ARS",
-            "AWG",
-            "AZN",
-            "BAM",
-            "BBD",
-            "BDT",
-            "XOF",
-            "BGN",
-            "BHD",
-            "BIF",
-            "BMD",
-            "BND",
-            "BOB",
-            "BRL",
-            "BSD",
-            "BTN",
-            "BWP",
-            "BYN",
-            "BZD",
-            "CDF",
-            "XAF",
-            "CLP",
-            "COP",
-            "CRC",
-            "CUP",
-            "CVE",
-            "ANG",
-            "CZK",
-            "DJF",
-            "DKK",
-            "DOP",
-            "DZD",
-            "EGP",
-            "MAD",
-            "ERN",
-            "ETB",
-            "FJD",
-            "FKP",
-            "GEL",
-            "GHS",
-            "GIP",
-            "GMD",
-            "GNF",
-            "GTQ",
-            "GYD",
-            "HNL",
-            "HRK",
-            "HTG",
-            "HUF",
-            "IDR",
-            "ILS",
-            "IQD",
-            "IRR",
-            "ISK",
-            "JMD",
-            "JOD",
-            "KES",
-            "KGS",
-            "KHR",
-            "KMF",
-            "KPW",
-            "KWD",
-            "KYD",
-            "KZT",
-            "LAK",
-            "LBP",
-            "LKR",
-            "LRD",
-            "LSL",
-            "LYD",
-            "MDL",
-            "MGA",
-            "MKD",
-            "MMK",
-            "MNT",
-            "MOP",
-            "MRO",
-            "MUR",
-            "MVR",
-            "MWK",
-            "MXN",
-            "MYR",
-            "MZN",
-            "NAD",
-            "XPF",
-            "NGN",
-            "NIO",
-            "NPR",
-            "OMR",
-            "PAB",
-            "PEN",
-            "PGK",
-            "PHP",
-            "PKR",
-            "PLN",
-            "PYG",
-            "QAR",
-            "RON",
-            "RSD",
-            "RUB",
-            "RWF",
-            "SAR",
-            "SBD",
-            "SCR",
-            "SDG",
-            "SHP",
-            "SLL",
-            "SOS",
-            "SRD",
-            "SSP",
-            "STD",
-            "SYP",
-            "SZL",
-            "THB",
-            "TJS",
-            "TMT",
-            "TND",
-            "TOP",
-            "TRY",
-            "TTD",
-            "TWD",
-            "TZS",
-            "UAH",
-            "UGX",
-            "UYU",
-            "UZS",
-            "VEF",
-            "VND",
-            "VUV",
-            "WST",
-            "YER",
-            "ZMW",
-            "ZWL",
-            "MRU",
-            "STN",
-        ],
-    }
+    mode = mode or config.SCRAPE_GROUP_MODE
+    logger.info(f"Starting {mode} scraping task for {group_type} currencies")
 
     if group_type not in CURRENCY_GROUPS:
         logger.error(f"Unknown currency group: {group_type}")
         return {"status": "failed", "message": f"Unknown currency group: {group_type}"}
 
+    # One run per group at a time; once the bases are scraped, finalize_currency_group
+    # releases the lease
+    lease = JobLease(f"group:{group_type}")
+    if not lease.acquire():
+        logger.warning(f"A {group_type} scraping task is already running, skipping this one")
+        return {"status": "skipped", "message": f"A {group_type} scraping task is already running"}
+
     job_id = f"scrape_{group_type}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
     ProgressTracker.start_job(job_id)
 
@@ -542,7 +477,11 @@ def scrape_currency_group(self, group_type):
     try:
         # Get currencies for this group
         group_codes = CURRENCY_GROUPS[group_type]
-        currencies = db.query(Currency).filter(Currency.code.in_(group_codes)).all()
+        if base_codes is not None:
+            group_codes = [code for code in group_codes if code in base_codes]
+        currencies = order_by_value(
+            db.query(Currency).filter(Currency.code.in_(group_codes)).all()
+        )
 
         if not currencies:
             logger.error(f"No currencies found for group {group_type}")
@@ -556,157 +495,438 @@ def scrape_currency_group(self, group_type):
         all_currencies = db.query(Currency).all()
 
         # Create a scraper manager
-        scraper_manager = ScraperManager()
+        deadline = Deadline(config.SCRAPE_JOB_BUDGET)
+        scraper_manager = ScraperManager(deadline=deadline, job_id=job_id)
 
         # Track results
         successful_pairs = 0
         failed_pairs = 0
-        all_rates = []
-        now = datetime.now()
-
-        # Process each base currency
-        for base_currency in currencies:
-            try:
-                # Use the scraper manager to get rates with failsafe
-                result = scrape_with_multi_pair(
-                    scraper_manager=scraper_manager,
-                    base_currency=base_currency.code,
-                    base_name=base_currency.name,
-                    base_name_plural=base_currency.name_plural,
-                )
-
-                rates = result["rates"]
-                source = result["source"]
-
-                # Create exchange rate records
-                for target_currency in all_currencies:
-                    # Skip self-conversion
-                    if target_currency.id == base_currency.id:
-                        continue
-
-                    # Check if the rate exists in the scraped data
-                    if target_currency.code in rates:
-                        rate = rates[target_currency.code]
-                        all_rates.append(
-                            {
-                                "base_currency_id": base_currency.id,
-                                "target_currency_id": target_currency.id,
-                                "rate": rate,
-                                "source": source,
-                                "created_at": now,
-                            }
-                        )
-                        successful_pairs += 1
-                    else:
-                        failed_pairs += 1
-
-                # Mark this currency as complete
-                ProgressTracker.mark_currency_complete(job_id, base_currency.code)
-
-            except ScrapingException:
-                # If multi-pair scrapers fail, try single-pair for each target
-                combined_success = False
-                source_used = None
-
-                for target_currency in all_currencies:
-                    # Skip self-conversion
-                    if target_currency.id == base_currency.id:
-                        continue
-
-                    try:
-                        result = scrape_with_single_pair(
-                            scraper_manager=scraper_manager,
-                            base_currency=base_currency.code,
-                            target_currency=target_currency.code,
-                            base_name=base_currency.name,
-                            base_name_plural=base_currency.name_plural,
-                        )
-
-                        rates = result["rates"]
-                        source = result["source"]
-
-                        # Use the first successful source for all
-                        if not source_used:
-                            source_used = source
-
-                        # Get the rate for this specific target currency
-                        if target_currency.code in rates:
-                            rate = rates[target_currency.code]
-                            all_rates.append(
-                                {
-                                    "base_currency_id": base_currency.id,
-                                    "target_currency_id": target_currency.id,
-                                    "rate": rate,
-                                    "source": source_used
-                                    or source,
-                                    "created_at": now,
-                                }
-                            )
-                            successful_pairs += 1
-                            combined_success = True
-                        else:
-                            failed_pairs += 1
-                    except ScrapingException:
-                        failed_pairs += 1
-                        continue
-
-                # Mark the currency complete if we had any success
-                if combined_success:
-                    ProgressTracker.mark_currency_complete(job_id, base_currency.code)
-                else:
-                    ProgressTracker.mark_currency_failed(job_id, base_currency.code)
-                    failed_pairs += (
-                        len(all_currencies) - 1
-                    )  # All target currencies failed
-                # Schedule a retry for this currency if needed
-                if ProgressTracker.should_retry_currency(job_id, base_currency.code):
-                    scrape_single_currency.apply_async(
-                        args=[base_currency.id],
-                        countdown=60 * 5,  # Retry after 5 minutes
-                    )
-            except Exception as e:
-                logger.error(f"Scraping failed for {base_currency.code}: {e}")
-                failed_pairs += len(all_currencies) - 1
-                ProgressTracker.mark_currency_failed(job_id, base_currency.code)
-                # Schedule a retry for this currency if needed
-                if ProgressTracker.should_retry_currency(job_id, base_currency.code):
-                    scrape_single_currency.apply_async(
-                        args=[base_currency.id],
-                        countdown=60 * 5,  # Retry after 5 minutes
-                    )
-        # If we have any rates, bulk insert them
-        if all_rates:
-            try:
-                bulk_insert_rates_without_closing(db, all_rates)
-                db.commit()
-            except Exception as e:
-                db.rollback()
-                logger.error(f"Error inserting rates: {e}")
-                raise
+        now = datetime.now(timezone.utc)
 
-        ProgressTracker.complete_job(job_id)
+        # Bases derived from the anchors are stored here; only the ones no anchor
+        # quotes are scraped below.
+        if mode == "triangulated":
+            triangulated_rates, failed_pairs, remaining = scrape_triangulated(
+                job_id, scraper_manager, currencies, all_currencies, now
+            )
+            with RateIngestWriter(job_id=job_id) as writer:
+                writer.add(triangulated_rates)
+            successful_pairs = writer.written
+            failed_pairs += writer.failed
+            bases_refreshed([c.code for c in currencies if c not in remaining])
+            currencies = remaining
+
+        finalize_args = [job_id, group_type, successful_pairs, failed_pairs]
+
+        if config.SCRAPE_FAN_OUT and currencies:
+            # One subtask per base, most valuable first; the chord callback completes the job
+            header = group(
+                scrape_base_currency.s(job_id, base_currency.id, deadline.expires_at, now.isoformat())
+                for base_currency in currencies
+            )
+            # Bases past the deadline return at once, so the chord is done by then
+            lease_token = lease.hand_over(min(deadline.remaining(), 86400) + config.JOB_LEASE_TTL)
+            chord(header)(finalize_currency_group.s(*finalize_args, lease_token=lease_token))
+            logger.info(f"Dispatched {len(currencies)} {group_type} bases of job {job_id} to subtasks")
+            return {
+                "status": "dispatched",
+                "message": f"Scraping {len(currencies)} {group_type} bases in subtasks ({mode})",
+                "job_id": job_id,
+            }
 
-        logger.info(
-            f"Completed {group_type} currency scraping task. "
-            f"Successful: {successful_pairs}, Failed: {failed_pairs}"
+        # Scrape every base in this task, then complete the job the way the chord callback does
+        results = []
+        with RateIngestWriter(job_id=job_id) as writer:
+            for base_currency in currencies:
+                if deadline.expired():
+                    results.append(deferred_result(base_currency))
+                    continue
+
+                result = scrape_base(scraper_manager, base_currency, all_currencies, now, writer)
+                record_base_result(job_id, result)
+                results.append(result)
+        return finalize_currency_group(
+            results,
+            *finalize_args,
+            write_failures=writer.failed,
+            lease_token=lease.hand_over(config.JOB_LEASE_TTL),
         )
 
-        return {
-            "status": "success",
-            "message": f"Scraped {successful_pairs} pairs successfully for {group_type} currencies",
-            "failed": failed_pairs,
-            "job_id": job_id,
-        }
-
     except Exception as e:
         logger.error(f"Error in {group_type} currency scraping task: {e}")
         db.rollback()
         ProgressTracker.complete_job(job_id, "failed")
         self.retry(exc=e, countdown=60 * 5)  # Retry after 5 minutes
         return {"status": "failed", "message": str(e)}
+    finally:
+        lease.release()
+        db.close()
+
+
+@celery_app.task
+def scrape_base_currency(job_id, base_currency_id, deadline_at, created_at):
+    """
+    Subtask of scrape_currency_group: scrape and store the rates of one base currency
+    against all targets.
+
+    Never raises, so one failing base can't fail the chord. The outcome is marked in the
+    job's progress right away (a failed base is scheduled for a retry) and returned for
+    finalize_currency_group.
+
+    Args:
+        job_id: ID of the group job
+        base_currency_id: ID of the base currency to scrape
+        deadline_at: Unix timestamp of the group job's deadline (None for no deadline)
+        created_at: ISO timestamp the rates are stored with
+
+    Returns:
+        Result dict of `scrape_base`
+    """
+    db = next(get_db())
+    try:
+        base_currency = db.query(Currency).filter(Currency.id == base_currency_id).first()
+        all_currencies = db.query(Currency).all()
+    except Exception as e:
+        logger.error(f"Failed to load currency {base_currency_id} for job {job_id}: {e}")
+        base_currency = None
+    finally:
+        db.close()
+
+    if not base_currency:
+        logger.error(f"Base currency with ID {base_currency_id} not found")
+        return {"base": None, "base_id": base_currency_id, "status": "failed", "stored": 0, "failed": 0}
+
+    deadline = Deadline.at(deadline_at)
+    if deadline.expired():
+        return deferred_result(base_currency)
+
+    with RateIngestWriter(job_id=job_id) as writer:
+        result = scrape_base(
+            ScraperManager(deadline=deadline, job_id=job_id),
+            base_currency,
+            all_currencies,
+            datetime.fromisoformat(created_at),
+            writer,
+        )
+    if writer.failed:
+        result["stored"] -= writer.failed
+        result["failed"] += writer.failed
+        result["status"] = "complete" if result["stored"] else "failed"
+
+    record_base_result(job_id, result)
+    return result
+
+
+@celery_app.task
+def finalize_currency_group(
+    results, job_id, group_type, successful_pairs=0, failed_pairs=0, write_failures=0, lease_token=None
+):
+    """
+    Chord callback of scrape_currency_group: once every base subtask has stored its rates,
+    refresh the API cache of the bases stored, release the group's lease and complete the job.
+
+    Bases the job budget didn't reach are deferred to a follow-up scrape_currency_group.
+
+    Args:
+        results: Result dicts of the base subtasks (see `scrape_base`)
+        job_id: ID of the group job
+        group_type: Currency group the job scrapes
+        successful_pairs: Pairs already stored by the group task (triangulated bases)
+        failed_pairs: Pairs the group task already failed
+        write_failures: Records of `results` that failed to be written
+        lease_token: Token of the group's JobLease handed over by the group task
+    """
+    deferred_codes = []
+    stored_codes = []
+    for result in results:
+        if result["status"] == "deferred":
+            deferred_codes.append(result["base"])
+            continue
+
+        successful_pairs += result["stored"]
+        failed_pairs += result["failed"]
+        if result["stored"]:
+            stored_codes.append(result["base"])
+    successful_pairs -= write_failures
+    failed_pairs += write_failures
+
+    bases_refreshed(stored_codes)
+
+    # Released before a follow-up is queued, so it can take the lease
+    if lease_token:
+        JobLease(f"group:{group_type}", token=lease_token).release()
+
+    if deferred_codes:
+        logger.warning(
+            f"Job budget of {config.SCRAPE_JOB_BUDGET}s spent, deferring {len(deferred_codes)} "
+            f"{group_type} bases to a follow-up task: {', '.join(deferred_codes)}"
+        )
+        # Anchors are already done, so the follow-up scrapes what's left directly
+        scrape_currency_group.apply_async(
+            args=[group_type], kwargs={"mode": "direct", "base_codes": deferred_codes}
+        )
+
+    ProgressTracker.complete_job(job_id)
+
+    logger.info(
+        f"Completed {group_type} currency scraping job {job_id}. "
+        f"Successful: {successful_pairs}, Failed: {failed_pairs}"
+    )
+
+    return {
+        "status": "success",
+        "message": f"Scraped {successful_pairs} pairs successfully for {group_type} currencies",
+        "failed": failed_pairs,
+        "deferred": len(deferred_codes),
+        "job_id": job_id,
+    }
+
+
+@celery_app.task
+def retry_failed_currencies():
+    """
+    Retry the failed bases that are due (see `RetryQueue`) in one job, instead of a task
+    per base: currencies are loaded once, and the bases are scraped on this worker with one
+    ScraperManager, reusing its pooled HTTP connections, and stored by one RateIngestWriter
+    in bulk batches. Bases failing again are queued with a doubled delay.
+    """
+    due = RetryQueue.take_due()
+    if not due:
+        return {"status": "idle", "message": "No failed bases due for a retry"}
+
+    job_id = f"retry_failed_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    ProgressTracker.start_job(job_id)
+    logger.info(f"Retrying {len(due)} failed bases in job {job_id}: {', '.join(due)}")
+
+    db = next(get_db())
+    try:
+        all_currencies = db.query(Currency).all()
+    except Exception as e:
+        logger.error(f"Failed to load currencies for job {job_id}: {e}")
+        RetryQueue.requeue(due)
+        ProgressTracker.complete_job(job_id, "failed")
+        return {"status": "failed", "message": str(e)}
     finally:
         db.close()
 
+    bases = order_by_value([c for c in all_currencies if c.code in due])
+    deadline = Deadline(config.SCRAPE_JOB_BUDGET)
+    scraper_manager = ScraperManager(deadline=deadline, job_id=job_id)
+    now = datetime.now(timezone.utc)
+
+    results = []
+    deferred_codes = []
+    with RateIngestWriter(job_id=job_id) as writer:
+        for base_currency in bases:
+            if deadline.expired():
+                deferred_codes.append(base_currency.code)
+                continue
+            results.append(scrape_base(scraper_manager, base_currency, all_currencies, now, writer))
+
+    successful_pairs = -writer.failed
+    failed_pairs = writer.failed
+    stored_codes = []
+    for result in results:
+        successful_pairs += result["stored"]
+        failed_pairs += result["failed"]
+        if result["status"] == "failed":
+            ProgressTracker.mark_currency_failed(job_id, result["base"])
+            RetryQueue.failed(result["base"])
+            continue
+
+        RetryQueue.succeeded(result["base"])
+        if result["status"] == "complete":
+            ProgressTracker.mark_currency_complete(job_id, result["base"])
+            stored_codes.append(result["base"])
+
+    bases_refreshed(stored_codes)
+    RetryQueue.requeue(deferred_codes)
+    ProgressTracker.complete_job(job_id)
+
+    logger.info(
+        f"Completed retry job {job_id}. Successful: {successful_pairs}, Failed: {failed_pairs}, "
+        f"still failing: {len(results) - len(stored_codes)}"
+    )
+    return {
+        "status": "success",
+        "message": f"Retried {len(results)} bases, {len(stored_codes)} stored",
+        "failed": failed_pairs,
+        "deferred": len(deferred_codes),
+        "job_id": job_id,
+    }
+
+
+def scrape_base(scraper_manager, base_currency, all_currencies, created_at, writer):
+    """
+    Scrape one base currency against all other currencies and hand its rate records
+    to `writer` (a RateIngestWriter). Start and outcome are recorded in the events of
+    the scraper manager's job.
+
+    The base is scraped under its JobLease, held until its records are handed to `writer`,
+    so it is skipped while another task scrapes it.
+
+    Returns:
+        Dict of base (code), base_id, status ("complete", "failed" or "busy"), stored
+        (records handed to the writer) and failed (pairs not scraped)
+    """
+    lease = JobLease(f"base:{base_currency.code}")
+    if not lease.acquire():
+        logger.info(f"{base_currency.code} is being scraped by another task, skipping it")
+        return {"base": base_currency.code, "base_id": base_currency.id, "status": "busy", "stored": 0, "failed": 0}
+
+    targets = [c for c in all_currencies if c.id != base_currency.id]
+    started = time.perf_counter()
+    JobEvents.emit(scraper_manager.job_id, "base_started", base=base_currency.code)
+    try:
+        try:
+            result = scrape_base_rates(
+                scraper_manager=scraper_manager,
+                base_currency=base_currency.code,
+                target_currencies=[t.code for t in targets],
+                base_name=base_currency.name,
+                base_name_plural=base_currency.name_plural,
+            )
+            records = rate_records(base_currency.id, targets, result, created_at)
+        except Exception as e:
+            logger.error(f"Scraping failed for {base_currency.code}: {e}")
+            records = []
+
+        if records:
+            writer.add(records)
+        else:
+            logger.error(f"Failed to scrape rates for {base_currency.code} from all sources")
+    finally:
+        # Only now may another task scrape the base, or its older rates could be queued last
+        lease.release()
+    result = {
+        "base": base_currency.code,
+        "base_id": base_currency.id,
+        "status": "complete" if records else "failed",
+        "stored": len(records),
+        "failed": len(targets) - len(records),
+    }
+    JobEvents.emit(
+        scraper_manager.job_id,
+        "base_finished",
+        seconds=round(time.perf_counter() - started, 2),
+        **result,
+    )
+    return result
+
+
+def deferred_result(base_currency):
+    """Result of a base the job budget didn't reach (see `scrape_base`)."""
+    return {
+        "base": base_currency.code,
+        "base_id": base_currency.id,
+        "status": "deferred",
+        "stored": 0,
+        "failed": 0,
+    }
+
+
+def record_base_result(job_id, result):
+    """
+    Mark a base (see `scrape_base`) complete or failed in the job's progress, and queue
+    a failed base for `retry_failed_currencies` if it still has retries left. Bases
+    another task was scraping are left to it.
+    """
+    if result["base"] is None or result["status"] == "busy":
+        return
+
+    if result["status"] == "complete":
+        ProgressTracker.mark_currency_complete(job_id, result["base"])
+        return
+
+    ProgressTracker.mark_currency_failed(job_id, result["base"])
+    # Queue a retry for this currency if needed
+    if ProgressTracker.should_retry_currency(job_id, result["base"]):
+        RetryQueue.add(result["base"])
+
+
+def bases_refreshed(base_codes):
+    """
+    Drop the cached API responses (see ExchangeRateController) of the bases whose
+    rates were just stored, so they are served fresh, and note the refresh for the
+    adaptive schedule.
+    """
+    RefreshSchedule.mark_refreshed(base_codes)
+    for code in base_codes:
+        try:
+            CacheManager.delete_pattern(f"exchange_rate:{code}-*")
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cached rates of {code}: {e}")
+
+
+def scrape_triangulated(job_id, scraper_manager, currencies, all_currencies, now):
+    """
+    Scrape the TRIANGULATION_ANCHORS bases and derive the rates of `currencies` from them,
+    instead of requesting a page per base.
+
+    Anchors are scraped with the multi-pair sources; every other base's rates are computed
+    as cross rates of the first anchor that quotes it. Rates scraped for different anchors
+    are cross-checked and deviations above TRIANGULATION_DRIFT_TOLERANCE are logged.
+
+    Returns:
+        Tuple of (rate records, failed pair count, currencies no anchor could derive)
+    """
+    currencies_by_code = {currency.code: currency for currency in all_currencies}
+
+    anchor_results = []
+    for anchor_code in config.TRIANGULATION_ANCHORS:
+        anchor = currencies_by_code.get(anchor_code)
+        if not anchor:
+            logger.warning(f"Triangulation anchor {anchor_code} not found in currencies")
+            continue
+        try:
+            result = scrape_with_multi_pair(
+                scraper_manager=scraper_manager,
+                base_currency=anchor.code,
+                base_name=anchor.name,
+                base_name_plural=anchor.name_plural,
+            )
+            source = getattr(result["source"], "value", result["source"])
+            anchor_results.append((anchor.code, result["rates"], source))
+        except ScrapingException as e:
+            logger.error(f"Failed to scrape triangulation anchor {anchor_code}: {e}")
+
+    if len(anchor_results) > 1:
+        check_drift(anchor_results, config.TRIANGULATION_DRIFT_TOLERANCE)
+
+    rows, sources = triangulate(anchor_results, [currency.code for currency in currencies])
+
+    rates = []
+    failed_pairs = 0
+    remaining = []
+    for base_currency in currencies:
+        row = rows.get(base_currency.code)
+        if not row:
+            remaining.append(base_currency)
+            continue
+
+        for target_currency in all_currencies:
+            if target_currency.id == base_currency.id:
+                continue
+            if target_currency.code in row:
+                rates.append(
+                    {
+                        "base_currency_id": base_currency.id,
+                        "target_currency_id": target_currency.id,
+                        "rate": row[target_currency.code],
+                        "source": sources[base_currency.code],
+                        "created_at": now,
+                    }
+                )
+            else:
+                failed_pairs += 1
+        ProgressTracker.mark_currency_complete(job_id, base_currency.code)
+
+    logger.info(
+        f"Triangulated {len(currencies) - len(remaining)} bases from {len(anchor_results)} anchors, "
+        f"{len(remaining)} left to scrape directly"
+    )
+    return rates, failed_pairs, remaining
+
 
 def bulk_insert_rates(db, rates: List[Dict]):
     """
@@ -719,15 +939,8 @@ def bulk_insert_rates(db, rates: List[Dict]):
     """
     try:
         if rates:
-            stmt = insert(ExchangeRate).values(rates)
-
             # Handle conflicts - update rate and source if the record already exists
-            stmt = stmt.on_conflict_do_update(
-                constraint=f"unique_{ExchangeRate.__tablename__}",
-                set_=dict(rate=stmt.excluded.rate, source=stmt.excluded.source),
-            )
-
-            db.execute(stmt)
+            write_rates(db, rates)
             db.commit()
             logger.info(
                 f"Bulk inserted {len(rates)} exchange rates into {ExchangeRate.__tablename__}"
@@ -756,15 +969,8 @@ def bulk_insert_rates_without_closing(db, rates: List[Dict]):
     """
     try:
         if rates:
-            stmt = insert(ExchangeRate).values(rates)
-
             # Handle conflicts - update rate and source if the record already exists
-            stmt = stmt.on_conflict_do_update(
-                constraint=f"unique_{ExchangeRate.__tablename__}",
-                set_=dict(rate=stmt.excluded.rate, source=stmt.excluded.source),
-            )
-
-            db.execute(stmt)
+            write_rates(db, rates)
             logger.info(
                 f"Bulk inserted {len(rates)} exchange rates into {ExchangeRate.__tablename__}"
             )
@@ -777,28 +983,45 @@ def bulk_insert_rates_without_closing(db, rates: List[Dict]):
 
 
 def scrape_with_multi_pair(
-    scraper_manager, base_currency, base_name=None, base_name_plural=None
+    scraper_manager,
+    base_currency,
+    base_name=None,
+    base_name_plural=None,
+    target_currencies=None,
+    coverage=None,
 ):
     """
     Try to scrape using multi-pair scrapers only.
 
+    If `target_currencies` is given, targets missing from the first successful source are
+    filled from the next multi-pair sources (dozens of rates per request) until every
+    target is covered or the sources run out. With a `coverage` (see `CoverageIndex.load`)
+    the sources are tried in the order of its request plan instead, so the targets are
+    usually covered with the fewest requests.
+
     Returns:
-        Dict containing rates and source info
+        Dict containing rates, source info (the first successful source) and
+        sources (the source of each rate)
 
     Raises:
         ScrapingException: If all multi-pair sources fail
     """
     errors = []
+    rates = {}
+    sources = {}
+    primary = None
+    wanted = set(target_currencies) if target_currencies else None
 
-    for source_name in scraper_manager.source_priority:
-        if source_name not in scraper_manager.sources:
-            continue
+    # Cheapest sources first; sources with an open circuit are skipped
+    source_names = scraper_manager.ranked_sources(ScraperCapability.MULTI_PAIR)
+    if coverage is not None and wanted:
+        source_names = coverage.plan_multi_pair(source_names, target_currencies)
 
-        source = scraper_manager.sources[source_name]
+    for source_name in source_names:
+        if primary is not None and (wanted is None or wanted <= rates.keys()):
+            break
 
-        # Skip single-pair sources
-        if source.capability != ScraperCapability.MULTI_PAIR:
-            continue
+        source = scraper_manager.sources[source_name]
 
         # Skip sources that need special parameters if we don't have them
         if (source.needs_base_name and not base_name) or (
@@ -815,25 +1038,39 @@ def scrape_with_multi_pair(
                 scraper_params["base_name_plural"] = base_name_plural
 
             scraper = source.scraper_cls(**scraper_params)
-            raw_data = scraper.extract()
-            rates = scraper.transform(raw_data)
+            scraped = scraper_manager.scrape_source(source_name, scraper, wanted=wanted)
 
-            if not rates:
+            if not scraped:
                 error_msg = f"Source {source_name} returned empty rates, considering as failure"
                 logger.warning(error_msg)
                 errors.append(error_msg)
                 continue
 
-            return {
-                "rates": rates,
-                "source": source_name,
-                "timestamp": datetime.now(),
+            filled = {
+                code: rate
+                for code, rate in scraped.items()
+                if code not in rates and (primary is None or code in wanted)
             }
+            rates.update(filled)
+            sources.update(dict.fromkeys(filled, getattr(source_name, "value", source_name)))
+
+            if primary is None:
+                primary = source_name
+            else:
+                logger.info(f"Filled {len(filled)} missing rates for {base_currency} from {source_name}")
         except Exception as e:
             error_msg = f"Failed to scrape from {source_name}: {str(e)}"
             logger.warning(error_msg)
             errors.append(error_msg)
 
+    if primary is not None:
+        return {
+            "rates": rates,
+            "source": primary,
+            "sources": sources,
+            "timestamp": datetime.now(),
+        }
+
     # If we get here, all multi-pair sources failed
     error_details = "\n".join(errors)
     raise ScrapingException(
@@ -841,33 +1078,209 @@ def scrape_with_multi_pair(
     )
 
 
-def scrape_with_single_pair(
+def scrape_base_rates(
+    scraper_manager, base_currency, target_currencies, base_name=None, base_name_plural=None
+):
+    """
+    Scrape the rates of one base currency against `target_currencies`.
+
+    Multi-pair sources are merged first (see `scrape_with_multi_pair`); only the targets
+    still missing afterwards are scraped pair by pair with the single-pair sources. With
+    SCRAPER_PARSE_PROCESSES set and SCRAPER_HEDGING off, those pairs are pipelined: each
+    page is parsed while the next pair is requested (see `scrape_with_pipelined_pairs`).
+
+    With SCRAPER_COVERAGE_PLANNING, requests follow the plan built from the coverage
+    index: targets every source is known not to serve are not requested at all, and
+    sources known not to serve a target are skipped for it.
+
+    Returns:
+        Dict containing rates (target code -> rate), sources (target code -> source)
+        and missing (target codes no source returned)
+    """
+    rates = {}
+    sources = {}
+    missing = []
+    coverage = None
+
+    if config.SCRAPER_COVERAGE_PLANNING:
+        coverage = CoverageIndex.load(base_currency, scraper_manager.source_priority)
+        impossible = [
+            target_currency
+            for target_currency in target_currencies
+            if coverage.impossible(target_currency, scraper_manager.source_priority)
+        ]
+        if impossible:
+            logger.info(
+                f"Skipping {len(impossible)} targets for {base_currency} no source serves: {', '.join(impossible)}"
+            )
+            missing.extend(impossible)
+            target_currencies = [t for t in target_currencies if t not in impossible]
+
+    try:
+        result = scrape_with_multi_pair(
+            scraper_manager=scraper_manager,
+            base_currency=base_currency,
+            base_name=base_name,
+            base_name_plural=base_name_plural,
+            target_currencies=target_currencies,
+            coverage=coverage,
+        )
+        rates.update(result["rates"])
+        sources.update(result["sources"])
+    except ScrapingException as e:
+        logger.error(f"Failed to scrape from all multi-pair sources for {base_currency}: {e}")
+
+    if config.SCRAPER_PARSE_PROCESSES > 0 and not config.SCRAPER_HEDGING:
+        result = scrape_with_pipelined_pairs(
+            scraper_manager=scraper_manager,
+            base_currency=base_currency,
+            target_currencies=[target_currency for target_currency in target_currencies if target_currency not in rates],
+            base_name=base_name,
+            base_name_plural=base_name_plural,
+            coverage=coverage,
+        )
+        rates.update(result["rates"])
+        sources.update(result["sources"])
+        missing.extend(result["missing"])
+        return {"rates": rates, "sources": sources, "missing": missing}
+
+    for target_currency in target_currencies:
+        if target_currency in rates:
+            continue
+        try:
+            result = scrape_with_single_pair(
+                scraper_manager=scraper_manager,
+                base_currency=base_currency,
+                target_currency=target_currency,
+                base_name=base_name,
+                base_name_plural=base_name_plural,
+                coverage=coverage,
+            )
+            rates[target_currency] = result["rates"][target_currency]
+            sources[target_currency] = getattr(result["source"], "value", result["source"])
+        except ScrapingException:
+            logger.warning(f"Failed to scrape rate for {base_currency} to {target_currency}")
+            missing.append(target_currency)
+
+    return {"rates": rates, "sources": sources, "missing": missing}
+
+
+def scrape_with_pipelined_pairs(
     scraper_manager,
     base_currency,
-    target_currency,
+    target_currencies,
     base_name=None,
     base_name_plural=None,
+    coverage=None,
 ):
     """
-    Try to scrape a single currency pair using single-pair scrapers.
+    Scrape `target_currencies` pair by pair with the single-pair sources, without waiting
+    for each page to be parsed.
 
-    Returns:
-        Dict containing rates and source info
+    Every response is handed to the parse pool and the next pair is requested right away;
+    at most SCRAPER_PARSE_QUEUE_SIZE pages are parsing at a time, so a slow parse stage
+    holds back the requests. Parsed pairs are collected as they complete. A pair its source
+    failed goes on to its next source, ahead of the pairs not requested yet, as
+    `scrape_with_single_pair` would.
 
-    Raises:
-        ScrapingException: If all single-pair sources fail
+    Returns:
+        Dict containing rates (target code -> rate), sources (target code -> source)
+        and missing (target codes no source returned)
     """
-    errors = []
+    attempts = {
+        target_currency: iter(single_pair_attempts(
+            scraper_manager, base_currency, target_currency, base_name, base_name_plural, coverage
+        ))
+        for target_currency in target_currencies
+    }
+    rates = {}
+    sources = {}
+    failed = set()
+    # Pairs due for their next attempt, and the pages being parsed (future -> pair, source, pending)
+    due = list(target_currencies)
+    parsing = {}
+
+    def collect(futures):
+        for future in futures:
+            target_currency, source_name, pending = parsing.pop(future)
+            try:
+                scraped = pending.result()
+            except Exception as e:
+                logger.warning(f"Failed to scrape from {source_name}: {str(e)}")
+                scraped = None
 
-    for source_name in scraper_manager.source_priority:
-        if source_name not in scraper_manager.sources:
+            if scraped and target_currency in scraped:
+                rates[target_currency] = scraped[target_currency]
+                sources[target_currency] = getattr(source_name, "value", source_name)
+                continue
+            if scraped is not None:
+                logger.warning(f"Source {source_name} did not return rate for target currency {target_currency}")
+            due.insert(0, target_currency)
+
+    while due or parsing:
+        collect([future for future in parsing if future.done()])
+        if not due:
+            collect(wait(parsing, return_when=FIRST_COMPLETED).done)
             continue
 
-        source = scraper_manager.sources[source_name]
+        target_currency = due.pop(0)
+        attempt = next(attempts[target_currency], None)
+        if attempt is None:
+            logger.warning(f"Failed to scrape rate for {base_currency} to {target_currency}")
+            failed.add(target_currency)
+            continue
 
-        # Skip multi-pair sources
-        if source.capability != ScraperCapability.SINGLE_PAIR:
+        source_name, scraper = attempt
+        try:
+            pending = scraper_manager.submit_source(source_name, scraper)
+        except Exception as e:
+            logger.warning(f"Failed to scrape from {source_name}: {str(e)}")
+            due.insert(0, target_currency)
             continue
+        parsing[pending.future] = (target_currency, source_name, pending)
+
+    missing = [target_currency for target_currency in target_currencies if target_currency in failed]
+    return {"rates": rates, "sources": sources, "missing": missing}
+
+
+def rate_records(base_currency_id, target_currencies, result, created_at):
+    """
+    Build exchange rate records for the targets `result` (from `scrape_base_rates`) has rates for.
+    """
+    return [
+        {
+            "base_currency_id": base_currency_id,
+            "target_currency_id": target_currency.id,
+            "rate": result["rates"][target_currency.code],
+            "source": result["sources"][target_currency.code],
+            "created_at": created_at,
+        }
+        for target_currency in target_currencies
+        if target_currency.code in result["rates"]
+    ]
+
+
+def single_pair_attempts(
+    scraper_manager,
+    base_currency,
+    target_currency,
+    base_name=None,
+    base_name_plural=None,
+    coverage=None,
+):
+    """
+    Return the (source name, scraper) attempts for one pair, in the order the single-pair
+    sources are tried: cheapest first, sources with an open circuit skipped, and with a
+    `coverage`, sources known to serve the pair first and those known not to serve it left out.
+    """
+    attempts = []
+
+    source_names = scraper_manager.ranked_sources(ScraperCapability.SINGLE_PAIR)
+    if coverage is not None:
+        source_names = coverage.plan_single_pair(source_names, target_currency)
+
+    for source_name in source_names:
+        source = scraper_manager.sources[source_name]
 
         # Skip sources that need special parameters if we don't have them
         if (source.needs_base_name and not base_name) or (
@@ -875,20 +1288,64 @@ def scrape_with_single_pair(
         ):
             continue
 
-        try:
-            scraper_params = {
-                "base_currency": base_currency,
-                "target_currency": target_currency,
-            }
+        scraper_params = {
+            "base_currency": base_currency,
+            "target_currency": target_currency,
+        }
 
-            if source.needs_base_name:
-                scraper_params["base_name"] = base_name
-            if source.needs_base_plural:
-                scraper_params["base_name_plural"] = base_name_plural
+        if source.needs_base_name:
+            scraper_params["base_name"] = base_name
+        if source.needs_base_plural:
+            scraper_params["base_name_plural"] = base_name_plural
 
-            scraper = source.scraper_cls(**scraper_params)
-            raw_data = scraper.extract()
-            rates = scraper.transform(raw_data)
+        attempts.append((source_name, source.scraper_cls(**scraper_params)))
+
+    return attempts
+
+
+def scrape_with_single_pair(
+    scraper_manager,
+    base_currency,
+    target_currency,
+    base_name=None,
+    base_name_plural=None,
+    coverage=None,
+):
+    """
+    Try to scrape a single currency pair using single-pair scrapers.
+
+    With SCRAPER_HEDGING, a source that is slower than its p90 latency is raced
+    against the next one instead of being waited out (see `scrape_hedged`). With a
+    `coverage`, sources known to serve the pair go first and sources known not to
+    serve it are skipped.
+
+    Returns:
+        Dict containing rates and source info
+
+    Raises:
+        ScrapingException: If all single-pair sources fail
+    """
+    errors = []
+    attempts = single_pair_attempts(
+        scraper_manager, base_currency, target_currency, base_name, base_name_plural, coverage
+    )
+
+    if config.SCRAPER_HEDGING:
+        source_name, rates = scrape_hedged(
+            scraper_manager,
+            attempts,
+            is_valid=lambda rates: bool(rates) and target_currency in rates,
+            description=f"pair {base_currency}-{target_currency}",
+        )
+        return {
+            "rates": rates,
+            "source": source_name,
+            "timestamp": datetime.now(),
+        }
+
+    for source_name, scraper in attempts:
+        try:
+            rates = scraper_manager.scrape_source(source_name, scraper)
 
             if not rates:
                 error_msg = f"Source {source_name} returned empty rates, considering as failure"
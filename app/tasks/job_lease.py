@@ -0,0 +1,157 @@
+import threading
+import uuid
+from typing import Optional
+from app.core.config import config
+from app.utils.cache_manager import redis_client
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class JobLease:
+    """
+    Exclusive claim on a piece of scrape work (a currency group or a base currency),
+    shared by every worker through Redis, so overlapping runs don't scrape it twice.
+
+    - lease:<name> holds the owner's random token and expires after JOB_LEASE_TTL seconds
+
+    The owner's heartbeat thread extends the lease every third of its TTL, so a worker that
+    dies only holds it for up to JOB_LEASE_TTL seconds. Extending and releasing only touch
+    the key while it still holds the owner's token, so an expired lease taken over by
+    another worker is never extended or released by the previous owner.
+
+    If Redis is unavailable the lease is treated as acquired, so scrapes still run.
+    """
+
+    PREFIX = "lease"
+
+    # KEYS[1]: lease key, ARGV[1]: owner token, ARGV[2]: new TTL in ms
+    EXTEND_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+
+    # KEYS[1]: lease key, ARGV[1]: owner token
+    RELEASE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, name: str, token: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            name: What the lease covers, e.g. "group:primary" or "base:USD"
+            token: Token of a lease handed over by another task (see `hand_over`)
+            ttl: Seconds the lease lasts without a heartbeat (default: JOB_LEASE_TTL)
+        """
+        self.name = name
+        self.key = f"{self.PREFIX}:{name}"
+        self.token = token or uuid.uuid4().hex
+        self.ttl = ttl or config.JOB_LEASE_TTL
+        self.lost = False
+        self._extend_script = redis_client.register_script(self.EXTEND_SCRIPT)
+        self._release_script = redis_client.register_script(self.RELEASE_SCRIPT)
+        self._stop = threading.Event()
+        self._heartbeat = None
+        self._handed_over = False
+
+    def __enter__(self) -> "JobLease":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def acquire(self) -> bool:
+        """Take the lease and start its heartbeat; False if another owner holds it."""
+        try:
+            acquired = redis_client.set(self.key, self.token, nx=True, px=int(self.ttl * 1000))
+        except Exception as e:
+            logger.warning(f"Lease {self.name} unavailable, running without it: {e}")
+            return True
+        if not acquired:
+            return False
+
+        self._heartbeat = threading.Thread(target=self._beat, name=f"lease-{self.name}", daemon=True)
+        self._heartbeat.start()
+        return True
+
+    def hand_over(self, seconds: float) -> str:
+        """
+        Stop the heartbeat and keep the lease for `seconds` more, for another task to
+        release with the returned token. `release()` of this instance does nothing after.
+        """
+        self._stop_heartbeat()
+        self._extend(seconds)
+        self._handed_over = True
+        return self.token
+
+    def release(self):
+        """Stop the heartbeat and drop the lease if this owner still holds it."""
+        self._stop_heartbeat()
+        if self._handed_over:
+            return
+        try:
+            self._release_script(keys=[self.key], args=[self.token])
+        except Exception as e:
+            logger.warning(f"Failed to release lease {self.name}: {e}")
+
+    def _extend(self, seconds: float) -> bool:
+        try:
+            extended = self._extend_script(keys=[self.key], args=[self.token, int(seconds * 1000)])
+        except Exception as e:
+            logger.warning(f"Failed to extend lease {self.name}: {e}")
+            return True
+        return bool(extended)
+
+    def _beat(self):
+        while not self._stop.wait(self.ttl / 3):
+            if not self._extend(self.ttl):
+                self.lost = True
+                logger.error(f"Lease {self.name} expired and was taken over; another run may duplicate this one")
+                return
+
+    def _stop_heartbeat(self):
+        self._stop.set()
+        if self._heartbeat is not None and self._heartbeat is not threading.current_thread():
+            self._heartbeat.join()
+        self._heartbeat = None
+
+
+class PendingScrapes:
+    """
+    Coalesces queued `scrape_single_currency` tasks, so at most one per base is pending.
+
+    - pending_scrape:<BASE> exists from when a scrape of the base is queued until it has
+      run, and expires after the given TTL in case the task is lost
+    """
+
+    PREFIX = "pending_scrape"
+
+    @staticmethod
+    def claim(base_code: str, ttl: float) -> bool:
+        """Mark a scrape of `base_code` as pending; False if one already is, so none should be queued."""
+        try:
+            return bool(redis_client.set(f"{PendingScrapes.PREFIX}:{base_code}", 1, nx=True, ex=int(ttl)))
+        except Exception as e:
+            logger.warning(f"Pending scrapes unavailable, queueing {base_code} anyway: {e}")
+            return True
+
+    @staticmethod
+    def renew(base_code: str, ttl: float):
+        """Keep the pending mark of `base_code` for `ttl` seconds, e.g. while its task is retried."""
+        try:
+            redis_client.set(f"{PendingScrapes.PREFIX}:{base_code}", 1, ex=int(ttl))
+        except Exception as e:
+            logger.warning(f"Failed to renew the pending scrape of {base_code}: {e}")
+
+    @staticmethod
+    def clear(base_code: str):
+        """The pending scrape of `base_code` has run."""
+        try:
+            redis_client.delete(f"{PendingScrapes.PREFIX}:{base_code}")
+        except Exception as e:
+            logger.warning(f"Failed to clear the pending scrape of {base_code}: {e}")
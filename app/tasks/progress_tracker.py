@@ -1,13 +1,28 @@
 from datetime import datetime
-from app.utils.cache_manager import CacheManager
+from app.core.config import config
+from app.utils.cache_manager import redis_client
+from app.utils.job_events import JobEvents
 
 
 class ProgressTracker:
     """
     Track progress of scraping tasks and handle retries.
     Uses Redis to maintain state between task runs.
+
+    - job:<job_id> is a hash of status, start_time, end_time, duration and retry_count
+    - job:<job_id>:completed and job:<job_id>:failed are sets of currency codes
+    - retry:<job_id>:<currency> counts the retries scheduled for a currency
+
+    Every update is a single pipelined round trip of atomic commands, so subtasks of
+    the same job can report concurrently. All keys expire JOB_PROGRESS_TTL seconds after
+    the job's last update.
     """
-    
+
+    @staticmethod
+    def _keys(job_id: str):
+        key = f"job:{job_id}"
+        return key, f"{key}:completed", f"{key}:failed"
+
     @staticmethod
     def start_job(job_id: str):
         """Mark a job as started in Redis"""
@@ -15,66 +30,92 @@ class ProgressTracker:
         job_data = {
             "status": "running",
             "start_time": now,
-            "completed_currencies": [],
-            "failed_currencies": [],
-            "retry_count": 0
+            "retry_count": 0,
         }
-        CacheManager.set(f"job:{job_id}", job_data)
-        return job_data
-    
+        pipe = redis_client.pipeline()
+        pipe.delete(*ProgressTracker._keys(job_id))
+        pipe.hset(f"job:{job_id}", mapping=job_data)
+        pipe.expire(f"job:{job_id}", config.JOB_PROGRESS_TTL)
+        pipe.execute()
+        JobEvents.emit(job_id, "job_started")
+        return {**job_data, "completed_currencies": [], "failed_currencies": []}
+
     @staticmethod
     def get_job_status(job_id: str):
         """Get current status of a job"""
-        job_data = CacheManager.get(f"job:{job_id}")
-        if job_data:
-            return job_data
-        return None
-    
+        key, completed_key, failed_key = ProgressTracker._keys(job_id)
+        pipe = redis_client.pipeline()
+        pipe.hgetall(key)
+        pipe.smembers(completed_key)
+        pipe.smembers(failed_key)
+        job_data, completed, failed = pipe.execute()
+        if not job_data:
+            return None
+
+        job_data["retry_count"] = int(job_data.get("retry_count", 0))
+        if "duration" in job_data:
+            job_data["duration"] = float(job_data["duration"])
+        job_data["completed_currencies"] = sorted(completed)
+        job_data["failed_currencies"] = sorted(failed)
+        return job_data
+
     @staticmethod
     def mark_currency_complete(job_id: str, currency_code: str):
         """Mark a currency as successfully processed"""
-        job_data = ProgressTracker.get_job_status(job_id)
-        if job_data:
-            if currency_code not in job_data["completed_currencies"]:
-                job_data["completed_currencies"].append(currency_code)
-            CacheManager.set(f"job:{job_id}", job_data)
-    
+        key, completed_key, failed_key = ProgressTracker._keys(job_id)
+        pipe = redis_client.pipeline()
+        pipe.sadd(completed_key, currency_code)
+        pipe.srem(failed_key, currency_code)
+        pipe.expire(completed_key, config.JOB_PROGRESS_TTL)
+        pipe.expire(key, config.JOB_PROGRESS_TTL)
+        pipe.execute()
+
     @staticmethod
     def mark_currency_failed(job_id: str, currency_code: str):
         """Mark a currency as failed to process"""
-        job_data = ProgressTracker.get_job_status(job_id)
-        if job_data:
-            if currency_code not in job_data["failed_currencies"]:
-                job_data["failed_currencies"].append(currency_code)
-            CacheManager.set(f"job:{job_id}", job_data)
-    
+        key, _, failed_key = ProgressTracker._keys(job_id)
+        pipe = redis_client.pipeline()
+        pipe.sadd(failed_key, currency_code)
+        pipe.expire(failed_key, config.JOB_PROGRESS_TTL)
+        pipe.expire(key, config.JOB_PROGRESS_TTL)
+        pipe.execute()
+
     @staticmethod
     def should_retry_currency(job_id: str, currency_code: str, max_retries: int = 3):
         """Check if a currency should be retried based on its retry count"""
         key = f"retry:{job_id}:{currency_code}"
-        retry_count = CacheManager.get(key)
-        
-        if retry_count is None:
-            CacheManager.set(key, "1")
-            return True
-        
-        retry_count = int(retry_count)
-        if retry_count < max_retries:
-            CacheManager.set(key, str(retry_count + 1))
-            return True
-        
-        return False
-    
+        pipe = redis_client.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, config.JOB_PROGRESS_TTL)
+        retry_count, _ = pipe.execute()
+
+        if retry_count > max_retries:
+            return False
+
+        pipe = redis_client.pipeline()
+        pipe.hincrby(f"job:{job_id}", "retry_count", 1)
+        pipe.expire(f"job:{job_id}", config.JOB_PROGRESS_TTL)
+        pipe.execute()
+        return True
+
     @staticmethod
     def complete_job(job_id: str, status: str = "completed"):
         """Mark a job as completed"""
-        job_data = ProgressTracker.get_job_status(job_id)
-        if job_data:
-            job_data["status"] = status
-            job_data["end_time"] = datetime.now().isoformat()
-            job_data["duration"] = (
-                datetime.fromisoformat(job_data["end_time"]) - 
-                datetime.fromisoformat(job_data["start_time"])
-            ).total_seconds()
-            CacheManager.set(f"job:{job_id}", job_data)
-        return job_data
\ No newline at end of file
+        key = f"job:{job_id}"
+        start_time = redis_client.hget(key, "start_time")
+        if start_time:
+            end_time = datetime.now()
+            pipe = redis_client.pipeline()
+            pipe.hset(
+                key,
+                mapping={
+                    "status": status,
+                    "end_time": end_time.isoformat(),
+                    "duration": (end_time - datetime.fromisoformat(start_time)).total_seconds(),
+                },
+            )
+            for job_key in ProgressTracker._keys(job_id):
+                pipe.expire(job_key, config.JOB_PROGRESS_TTL)
+            pipe.execute()
+        JobEvents.emit(job_id, "job_finished", status=status)
+        return ProgressTracker.get_job_status(job_id)
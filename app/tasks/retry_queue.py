@@ -0,0 +1,101 @@
+import time
+from typing import Iterable, List, Optional
+from app.core.config import config
+from app.utils.cache_manager import redis_client
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RetryQueue:
+    """
+    Failed bases waiting to be retried together by `retry_failed_currencies`.
+
+    - retry_queue is a sorted set of base code -> Unix time its retry is due
+    - retry_attempts is a hash of base code -> failed retries so far
+
+    A base is retried RETRY_BASE_DELAY seconds after it failed; every failed retry
+    doubles the delay, up to RETRY_MAX_DELAY, and after RETRY_MAX_ATTEMPTS failed retries
+    the base is dropped until it fails again in a later job. A base failing in several
+    jobs is queued once.
+
+    Redis errors are logged and never fail a task: a retry that can't be queued is lost,
+    and nothing is due while the queue can't be read.
+    """
+
+    KEY = "retry_queue"
+    ATTEMPTS_KEY = "retry_attempts"
+
+    @staticmethod
+    def delay(attempts: int) -> float:
+        """Seconds before the retry of a base that has failed `attempts` retries."""
+        return min(config.RETRY_BASE_DELAY * 2 ** attempts, config.RETRY_MAX_DELAY)
+
+    @staticmethod
+    def add(base_code: str) -> bool:
+        """
+        Queue a retry of a failed base. A base already queued keeps its due time.
+
+        Returns:
+            False if the base has used up its retries
+        """
+        try:
+            attempts = int(redis_client.hget(RetryQueue.ATTEMPTS_KEY, base_code) or 0)
+            if attempts >= config.RETRY_MAX_ATTEMPTS:
+                return False
+            redis_client.zadd(RetryQueue.KEY, {base_code: time.time() + RetryQueue.delay(attempts)}, nx=True)
+        except Exception as e:
+            logger.warning(f"Failed to queue a retry of {base_code}: {e}")
+        return True
+
+    @staticmethod
+    def take_due(now: Optional[float] = None) -> List[str]:
+        """Remove and return the bases whose retry is due, in one transaction."""
+        now = now or time.time()
+        try:
+            pipe = redis_client.pipeline()
+            pipe.zrangebyscore(RetryQueue.KEY, "-inf", now)
+            pipe.zremrangebyscore(RetryQueue.KEY, "-inf", now)
+            due, _ = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Retry queue unavailable: {e}")
+            return []
+        return due
+
+    @staticmethod
+    def requeue(base_codes: Iterable[str]):
+        """Queue bases taken but not retried (e.g. out of time) to be retried right away."""
+        due = {code: time.time() for code in base_codes}
+        if not due:
+            return
+        try:
+            redis_client.zadd(RetryQueue.KEY, due)
+        except Exception as e:
+            logger.warning(f"Failed to requeue {len(due)} bases: {e}")
+
+    @staticmethod
+    def failed(base_code: str) -> bool:
+        """
+        Count a failed retry and queue the next one after a doubled delay.
+
+        Returns:
+            False if that was the base's last retry
+        """
+        try:
+            attempts = redis_client.hincrby(RetryQueue.ATTEMPTS_KEY, base_code, 1)
+            if attempts >= config.RETRY_MAX_ATTEMPTS:
+                redis_client.hdel(RetryQueue.ATTEMPTS_KEY, base_code)
+                logger.error(f"Giving up on {base_code} after {attempts} failed retries")
+                return False
+            redis_client.zadd(RetryQueue.KEY, {base_code: time.time() + RetryQueue.delay(attempts)})
+        except Exception as e:
+            logger.warning(f"Failed to queue the next retry of {base_code}: {e}")
+        return True
+
+    @staticmethod
+    def succeeded(base_code: str):
+        """Reset the backoff of a base that no longer needs retrying."""
+        try:
+            redis_client.hdel(RetryQueue.ATTEMPTS_KEY, base_code)
+        except Exception as e:
+            logger.warning(f"Failed to reset the retries of {base_code}: {e}")
@@ -43,3 +43,22 @@ class CacheManager:
     def delete(key: str):
         """Remove a key from Redis."""
         redis_client.delete(key)
+
+    @staticmethod
+    def delete_pattern(pattern: str, batch_size: int = 500) -> int:
+        """
+        Remove every key matching the glob `pattern` (e.g. "exchange_rate:USD-*").
+        Keys are found with SCAN and unlinked in batches, so Redis is never blocked.
+
+        :return: Number of keys removed.
+        """
+        deleted = 0
+        batch = []
+        for key in redis_client.scan_iter(match=pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += redis_client.unlink(*batch)
+        return deleted
@@ -0,0 +1,144 @@
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from app.core.config import config
+from app.utils.cache_manager import redis_client
+from app.utils.custom_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class JobEvents:
+    """
+    Structured telemetry of scrape jobs, kept in a capped Redis Stream per job.
+
+    - job_events:<job_id> holds at most about JOB_EVENTS_MAXLEN entries and expires
+      JOB_PROGRESS_TTL seconds after the job's last event
+
+    Every entry has an `event` field:
+
+    - job_started / job_finished (status)
+    - base_started (base) / base_finished (base, status, stored, failed, seconds)
+    - source (source, base, targets, latency_ms, rates, cached, error)
+    - flush (written, skipped, failed, ms)
+
+    Emitting never raises: telemetry errors are logged and the scrape goes on.
+    """
+
+    PREFIX = "job_events"
+
+    @staticmethod
+    def emit(job_id: Optional[str], event: str, **fields):
+        """Append an event to the stream of `job_id` (no-op without a job or with JOB_EVENTS off)."""
+        if not job_id or not config.JOB_EVENTS:
+            return
+
+        entry = {"event": event}
+        for name, value in fields.items():
+            if value is None:
+                continue
+            entry[name] = str(getattr(value, "value", value))
+
+        key = f"{JobEvents.PREFIX}:{job_id}"
+        try:
+            pipe = redis_client.pipeline()
+            pipe.xadd(key, entry, maxlen=config.JOB_EVENTS_MAXLEN, approximate=True)
+            pipe.expire(key, config.JOB_PROGRESS_TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record {event} event of job {job_id}: {e}")
+
+    @staticmethod
+    def read(
+        job_id: str, after: str = "0-0", count: int = 100, block_ms: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Events of `job_id` after the stream ID `after`, oldest first.
+
+        Args:
+            job_id: Job to read
+            after: Stream ID to read after ("0-0" for the start)
+            count: Maximum number of events returned
+            block_ms: Wait up to this long for new events if there are none yet
+        """
+        streams = redis_client.xread({f"{JobEvents.PREFIX}:{job_id}": after}, count=count, block=block_ms)
+        return streams[0][1] if streams else []
+
+    @staticmethod
+    def exists(job_id: str) -> bool:
+        """Whether `job_id` has recorded any events (without reading them)."""
+        return bool(redis_client.exists(f"{JobEvents.PREFIX}:{job_id}"))
+
+    @staticmethod
+    def summary(job_id: str) -> Optional[Dict]:
+        """
+        Aggregate the events of `job_id` into per-source request statistics, the bases
+        in flight and finished, and the rows written. None if the job has no events.
+        """
+        entries = redis_client.xrange(f"{JobEvents.PREFIX}:{job_id}")
+        if not entries:
+            return None
+
+        now_ms = time.time() * 1000
+        sources = defaultdict(lambda: {"requests": 0, "errors": 0, "cached": 0, "rates": 0, "latencies": []})
+        started = {}
+        finished = {}
+        rows = {"written": 0, "skipped": 0, "failed": 0}
+
+        for entry_id, fields in entries:
+            at_ms = int(entry_id.split("-")[0])
+            event = fields.get("event")
+
+            if event == "source":
+                stats = sources[fields["source"]]
+                if fields.get("cached") == "True":
+                    stats["cached"] += 1
+                    continue
+                stats["requests"] += 1
+                stats["rates"] += int(fields.get("rates", 0))
+                if "error" in fields:
+                    stats["errors"] += 1
+                if "latency_ms" in fields:
+                    stats["latencies"].append(float(fields["latency_ms"]))
+            elif event == "base_started":
+                started[fields["base"]] = at_ms
+            elif event == "base_finished":
+                finished[fields["base"]] = {
+                    "base": fields["base"],
+                    "status": fields.get("status"),
+                    "stored": int(fields.get("stored", 0)),
+                    "failed": int(fields.get("failed", 0)),
+                    "seconds": float(fields.get("seconds", 0)),
+                }
+            elif event == "flush":
+                for name in rows:
+                    rows[name] += int(fields.get(name, 0))
+
+        source_stats = []
+        for name, stats in sources.items():
+            latencies = sorted(stats.pop("latencies"))
+            source_stats.append(
+                {
+                    "source": name,
+                    **stats,
+                    "mean_latency_ms": round(sum(latencies) / len(latencies), 1) if latencies else None,
+                    "max_latency_ms": round(latencies[-1], 1) if latencies else None,
+                }
+            )
+        source_stats.sort(key=lambda stats: -(stats["mean_latency_ms"] or 0))
+
+        in_flight = [
+            {"base": base, "running_seconds": round((now_ms - at_ms) / 1000, 1)}
+            for base, at_ms in started.items()
+            if base not in finished
+        ]
+        in_flight.sort(key=lambda base: -base["running_seconds"])
+
+        return {
+            "events": len(entries),
+            "last_event_at": int(entries[-1][0].split("-")[0]) / 1000,
+            "sources": source_stats,
+            "in_flight": in_flight,
+            "slowest_bases": sorted(finished.values(), key=lambda base: -base["seconds"])[:10],
+            "rows": rows,
+        }
@@ -24,8 +24,11 @@ class UserAgentRotator:
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
-                    cls._instance = super(UserAgentRotator, cls).__new__(cls)
-                    cls._instance._initialize(user_agents_file)
+                    # Only publish the instance once it is initialized, so other threads
+                    # never see it without its User-Agent list
+                    instance = super(UserAgentRotator, cls).__new__(cls)
+                    instance._initialize(user_agents_file)
+                    cls._instance = instance
         return cls._instance
 
     def _initialize(self, user_agents_file: str):
@@ -0,0 +1,93 @@
+"""
+Rate ingest benchmark: multi-row INSERT ... ON CONFLICT against binary COPY into the
+staging table plus a set-based merge.
+
+Writes synthetic rates for the currencies in the configured database (DB_* settings,
+migrated with `alembic upgrade head`) in batches like RateIngestWriter does, and reports
+rows per second for each method. Every batch runs in a transaction that is rolled back,
+so the tables are left as they were.
+
+Usage:
+    python -m benchmarks.ingest_bench --rows 24000 --batch-size 1000
+    python -m benchmarks.ingest_bench --methods copy --rows 100000 --repeat 5
+"""
+import argparse
+import json
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from app.db.database import SessionLocal
+from app.db.ingest import copy_rates, upsert_rates
+from app.models.models import Currency
+from app.utils.custom_logger import CustomLogger
+
+METHODS = {"insert": upsert_rates, "copy": copy_rates}
+
+
+def make_rates(currency_ids: List[int], rows: int, created_at: datetime) -> List[Dict]:
+    """Unique synthetic rate records, one timestamp per full set of pairs."""
+    pairs = [(base, target) for base in currency_ids for target in currency_ids if base != target]
+    return [
+        {
+            "base_currency_id": pairs[index % len(pairs)][0],
+            "target_currency_id": pairs[index % len(pairs)][1],
+            "rate": random.uniform(0.001, 1000),
+            "source": "ingest-bench",
+            "created_at": created_at + timedelta(microseconds=index // len(pairs)),
+        }
+        for index in range(rows)
+    ]
+
+
+def run(method: str, rates: List[Dict], batch_size: int) -> float:
+    """Write `rates` in batches with `method`, rolling every batch back. Returns seconds."""
+    write = METHODS[method]
+    elapsed = 0.0
+    for start in range(0, len(rates), batch_size):
+        db = SessionLocal()
+        try:
+            began = time.perf_counter()
+            write(db, rates[start : start + batch_size])
+            db.flush()
+            elapsed += time.perf_counter() - began
+        finally:
+            db.rollback()
+            db.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rate ingest methods")
+    parser.add_argument("--rows", type=int, default=24000, help="Rates written per run")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rates per transaction")
+    parser.add_argument("--methods", default="insert,copy", help="Comma-separated methods to compare")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per method; the best is reported")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    CustomLogger().logger.setLevel(logging.CRITICAL)
+    random.seed(args.seed)
+
+    db = SessionLocal()
+    try:
+        currency_ids = [currency_id for (currency_id,) in db.query(Currency.id).all()]
+    finally:
+        db.close()
+    if len(currency_ids) < 2:
+        raise SystemExit("Seed the currencies first (python app/db/seed.py)")
+
+    rates = make_rates(currency_ids, args.rows, datetime.now(timezone.utc))
+
+    results = {}
+    for method in args.methods.split(","):
+        seconds = min(run(method, rates, args.batch_size) for _ in range(args.repeat))
+        results[method] = {"seconds": round(seconds, 3), "rows_per_second": round(len(rates) / seconds)}
+
+    print(json.dumps({"rows": len(rates), "batch_size": args.batch_size, "methods": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
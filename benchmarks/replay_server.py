@@ -0,0 +1,369 @@
+"""
+Local stand-in for every scrape source, serving the fixture corpus (synthetic unless captured).
+
+Point the scrapers at it with SCRAPER_BASE_URL_OVERRIDE; each source is then requested
+as <override>/<scraper.get_source_name()>/<original path and query>.
+
+Usage:
+    python -m benchmarks.replay_server --port 8900 \\
+        --latency lognormal:-1.6,0.6 --rate-429 0.05 --timeout-rate 0.02 --truncate-rate 0.01
+    SCRAPER_BASE_URL_OVERRIDE=http://127.0.0.1:8900 celery -A app.tasks.celery_app worker
+
+Latency specs: fixed:<s>, uniform:<min>,<max>, exponential:<mean>, lognormal:<mu>,<sigma>.
+Per-source fault profiles can be given as a JSON file mapping source name to overrides:
+    {"fx_empire": {"latency": "fixed:3", "rate_429": 0.5}}
+
+Requests for a base/pair without a recorded fixture are served from another fixture of the
+same source with the currency codes rewritten, so full runs over every currency work
+offline. Use --strict to answer them with 404 instead. GET /_stats returns request counts.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.scrapers import FIXTURES_DIR
+from app.scraping.factory import ScraperSourceName
+
+
+def _query(name: str) -> Callable[[str, Dict], Optional[str]]:
+    def get(path: str, query: Dict) -> Optional[str]:
+        values = query.get(name)
+        return values[0].upper() if values else None
+    return get
+
+
+def _path(pattern: str, group: int = 1) -> Callable[[str, Dict], Optional[str]]:
+    regex = re.compile(pattern, re.IGNORECASE)
+
+    def get(path: str, query: Dict) -> Optional[str]:
+        match = regex.search(path)
+        return match.group(group).upper() if match else None
+    return get
+
+
+# Path prefix (the scraper's get_source_name()) -> fixture directory and how to read the
+# requested base and target currency from the URL each scraper builds.
+ROUTES = {
+    "trading-economics": (ScraperSourceName.TRADING_ECONOMICS, _query("base"), None),
+    "exchange-rates-org-uk": (
+        ScraperSourceName.EXCHANGE_RATES_ORG_UK,
+        _path(r"-([A-Z]{3})-currency-table\.html$"),
+        None,
+    ),
+    "currency-converter-org-uk": (
+        ScraperSourceName.CURRENCY_CONVERTER_ORG_UK,
+        _path(r"/convert-([A-Z]{3})/"),
+        None,
+    ),
+    "xrates": (ScraperSourceName.X_RATES, _query("from"), None),
+    "forbes": (
+        ScraperSourceName.FORBES,
+        _path(r"/currency-converter/([a-z]{3})-([a-z]{3})/"),
+        _path(r"/currency-converter/([a-z]{3})-([a-z]{3})/", 2),
+    ),
+    "hexarate": (ScraperSourceName.HEXA_RATE, _path(r"/latest/([A-Z]{3})"), _query("target")),
+    "fx_empire": (
+        ScraperSourceName.FX_EMPIRE,
+        _path(r"/currencies/([a-z]{3})-([a-z]{3})"),
+        _path(r"/currencies/([a-z]{3})-([a-z]{3})", 2),
+    ),
+    "oanda": (ScraperSourceName.OANDA, _query("base"), _query("quote")),
+    "wise": (
+        ScraperSourceName.WISE,
+        _path(r"/currency-converter/([a-z]{3})-to-([a-z]{3})/"),
+        _path(r"/currency-converter/([a-z]{3})-to-([a-z]{3})/", 2),
+    ),
+    "xe": (ScraperSourceName.XE, _query("From"), _query("To")),
+}
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Turn a latency spec such as "lognormal:-1.6,0.6" into a sampler returning seconds."""
+    kind, _, args = spec.partition(":")
+    params = [float(arg) for arg in args.split(",") if arg]
+
+    if kind == "fixed":
+        return lambda rnd: params[0] if params else 0.0
+    if kind == "uniform":
+        return lambda rnd: rnd.uniform(params[0], params[1])
+    if kind == "exponential":
+        return lambda rnd: rnd.expovariate(1 / params[0])
+    if kind == "lognormal":
+        return lambda rnd: rnd.lognormvariate(params[0], params[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class FaultProfile:
+    """
+    Latency and failure injection settings for one source.
+
+    Args:
+        latency: Latency spec applied before every response
+        rate_429: Probability of answering 429 Too Many Requests
+        timeout_rate: Probability of stalling for `hang_seconds` (longer than the scraper timeout)
+        truncate_rate: Probability of closing the connection halfway through the body
+        hang_seconds: How long a "timed out" request stalls
+    """
+
+    def __init__(
+        self,
+        latency: str = "fixed:0",
+        rate_429: float = 0.0,
+        timeout_rate: float = 0.0,
+        truncate_rate: float = 0.0,
+        hang_seconds: float = 15.0,
+    ):
+        self.latency = latency
+        self.sample_latency = parse_latency(latency)
+        self.rate_429 = rate_429
+        self.timeout_rate = timeout_rate
+        self.truncate_rate = truncate_rate
+        self.hang_seconds = hang_seconds
+
+    def with_overrides(self, overrides: Dict) -> "FaultProfile":
+        settings = {
+            "latency": self.latency,
+            "rate_429": self.rate_429,
+            "timeout_rate": self.timeout_rate,
+            "truncate_rate": self.truncate_rate,
+            "hang_seconds": self.hang_seconds,
+        }
+        settings.update(overrides)
+        return FaultProfile(**settings)
+
+
+def _rewrite_codes(body: str, replacements: Dict[str, str]) -> str:
+    """Swap recorded currency codes for requested ones, in upper and lower case."""
+    placeholders = {}
+    for index, (old, new) in enumerate(replacements.items()):
+        if old == new:
+            continue
+        for old_code, new_code in ((old.upper(), new.upper()), (old.lower(), new.lower())):
+            placeholder = f"\x00{index}{'U' if old_code.isupper() else 'L'}\x00"
+            body = body.replace(old_code, placeholder)
+            placeholders[placeholder] = new_code
+    for placeholder, new_code in placeholders.items():
+        body = body.replace(placeholder, new_code)
+    return body
+
+
+class ReplayServer:
+    """
+    Threaded HTTP server replaying the fixture corpus with injected latency and failures.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8900,
+        default_profile: Optional[FaultProfile] = None,
+        profiles: Optional[Dict[str, FaultProfile]] = None,
+        strict: bool = False,
+        seed: Optional[int] = None,
+    ):
+        self.default_profile = default_profile or FaultProfile()
+        self.profiles = profiles or {}
+        self.strict = strict
+        self.random = random.Random(seed)
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def handle(self):
+                try:
+                    super().handle()
+                except (BrokenPipeError, ConnectionResetError):
+                    # Streaming scrapers hang up once they have read what they need
+                    pass
+
+            def do_GET(self):
+                replay.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Serve in a background thread and return the base URL to use as override."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self.random.random()
+
+    def _sample_latency(self, profile: FaultProfile) -> float:
+        with self._lock:
+            return max(0.0, profile.sample_latency(self.random))
+
+    def resolve(self, prefix: str, path: str, query: Dict) -> Tuple[Optional[str], str]:
+        """
+        Find the fixture body for a request, returning (body, content_type).
+        """
+        source_name, get_base, get_target = ROUTES[prefix]
+        base_currency = get_base(path, query)
+        target_currency = get_target(path, query) if get_target else None
+        if not base_currency or (get_target and not target_currency):
+            return None, "text/plain"
+
+        source_dir = os.path.join(FIXTURES_DIR, source_name.value)
+        stem = f"{base_currency}-{target_currency}" if target_currency else base_currency
+        recorded = sorted(os.listdir(source_dir)) if os.path.isdir(source_dir) else []
+
+        match = next((name for name in recorded if os.path.splitext(name)[0] == stem), None)
+        if match is None:
+            if self.strict or not recorded:
+                return None, "text/plain"
+            match = recorded[0]
+
+        with open(os.path.join(source_dir, match), "r", encoding="utf-8") as file:
+            body = file.read()
+
+        recorded_base, _, recorded_target = os.path.splitext(match)[0].partition("-")
+        replacements = {recorded_base: base_currency}
+        if target_currency and recorded_target:
+            replacements[recorded_target] = target_currency
+        body = _rewrite_codes(body, replacements)
+
+        content_type = "application/json" if match.endswith(".json") else "text/html; charset=utf-8"
+        return body, content_type
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        parts = urlsplit(request.path)
+        if parts.path == "/_stats":
+            return self._send(request, 200, json.dumps(self.stats), "application/json")
+
+        prefix, _, rest = parts.path.lstrip("/").partition("/")
+        if prefix not in ROUTES:
+            self._count("unknown")
+            return self._send(request, 404, "Unknown source", "text/plain")
+
+        profile = self.profiles.get(prefix, self.default_profile)
+        time.sleep(self._sample_latency(profile))
+
+        roll = self._roll()
+        if roll < profile.rate_429:
+            self._count(f"{prefix}:429")
+            return self._send(request, 429, "Too Many Requests", "text/plain", {"Retry-After": "30"})
+        roll -= profile.rate_429
+
+        if roll < profile.timeout_rate:
+            self._count(f"{prefix}:timeout")
+            time.sleep(profile.hang_seconds)
+            return self._send(request, 504, "Gateway Timeout", "text/plain")
+        roll -= profile.timeout_rate
+
+        body, content_type = self.resolve(prefix, "/" + rest, parse_qs(parts.query))
+        if body is None:
+            self._count(f"{prefix}:404")
+            return self._send(request, 404, "No fixture recorded", "text/plain")
+
+        if roll < profile.truncate_rate:
+            self._count(f"{prefix}:truncated")
+            return self._send_truncated(request, body, content_type)
+
+        # Fixtures never change while the server runs, so a content hash is a stable ETag.
+        etag = f'"{hashlib.sha1(body.encode("utf-8")).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            self._count(f"{prefix}:304")
+            return self._send(request, 304, "", content_type, {"ETag": etag})
+
+        self._count(f"{prefix}:200")
+        return self._send(request, 200, body, content_type, {"ETag": etag})
+
+    def _send(self, request, status: int, body: str, content_type: str, headers: Optional[Dict] = None):
+        payload = body.encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", content_type)
+        request.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def _send_truncated(self, request, body: str, content_type: str):
+        # No Content-Length: the client sees a short but "complete" body, like a dropped upstream.
+        payload = body.encode("utf-8")
+        request.send_response(200)
+        request.send_header("Content-Type", content_type)
+        request.send_header("Connection", "close")
+        request.end_headers()
+        request.wfile.write(payload[: len(payload) // 2])
+        request.close_connection = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded scrape sources locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", default="fixed:0", help="Latency spec, e.g. lognormal:-1.6,0.6")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=15.0)
+    parser.add_argument("--profiles", help="JSON file with per-source fault profile overrides")
+    parser.add_argument("--strict", action="store_true", help="404 for requests without a recorded fixture")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    default_profile = FaultProfile(
+        latency=args.latency,
+        rate_429=args.rate_429,
+        timeout_rate=args.timeout_rate,
+        truncate_rate=args.truncate_rate,
+        hang_seconds=args.hang_seconds,
+    )
+    profiles = {}
+    if args.profiles:
+        with open(args.profiles, "r", encoding="utf-8") as file:
+            profiles = {
+                name: default_profile.with_overrides(overrides)
+                for name, overrides in json.load(file).items()
+            }
+
+    server = ReplayServer(args.host, args.port, default_profile, profiles, args.strict, args.seed)
+    print(f"Replaying {FIXTURES_DIR} on {server.url}")
+    print(f"Set SCRAPER_BASE_URL_OVERRIDE={server.url} to point the scrapers at it")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
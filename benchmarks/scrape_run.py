@@ -0,0 +1,144 @@
+"""
+End-to-end scrape benchmark against the local replay server.
+
+Runs the same multi-pair merge / single-pair fallback used by the scrape tasks for a set
+of base currencies, without a database, and reports wall time, outcomes and the requests
+each source received.
+
+Usage:
+    python -m benchmarks.scrape_run --bases 20 --latency lognormal:-1.6,0.6 --rate-429 0.1
+    python -m benchmarks.scrape_run --bases USD,EUR --profiles profiles.json --rate-limit
+    python -m benchmarks.scrape_run --bases 40 --max-targets 0 --concurrency 8 --parse-processes 4
+"""
+import argparse
+import json
+import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from app.core.config import config
+from app.scraping.deadline import Deadline
+from app.scraping.manager import ScraperManager
+from app.scraping.rate_limiter import RateLimiter
+from app.tasks import celery_app  # noqa: F401 - must load before the task modules it imports
+from app.tasks.exchange_rates import scrape_base_rates
+from app.utils.custom_logger import CustomLogger
+from benchmarks.replay_server import FaultProfile, ReplayServer
+from benchmarks.scrapers import load_currencies
+
+
+def run(
+    bases: List[Dict], currencies: List[Dict], scraper_manager: ScraperManager, max_targets: int, concurrency: int = 1
+) -> Dict:
+    stats = {"bases": len(bases), "pairs": 0, "failed_pairs": 0, "deferred_bases": 0, "sources": Counter()}
+
+    def scrape(base: Dict) -> Optional[Dict]:
+        if scraper_manager.deadline is not None and scraper_manager.deadline.expired():
+            return None
+
+        # Keep the single-pair residue bounded when a base has no multi-pair coverage
+        targets = [c["code"] for c in currencies if c["code"] != base["code"]]
+        return scrape_base_rates(
+            scraper_manager=scraper_manager,
+            base_currency=base["code"],
+            target_currencies=targets[:max_targets] if max_targets else targets,
+            base_name=base["name"],
+            base_name_plural=base["name_plural"],
+        )
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for result in executor.map(scrape, bases):
+            if result is None:
+                stats["deferred_bases"] += 1
+                continue
+            stats["pairs"] += len(result["rates"])
+            stats["failed_pairs"] += len(result["missing"])
+            stats["sources"].update(result["sources"].values())
+
+    stats["sources"] = dict(stats["sources"].most_common())
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full scrape runs offline")
+    parser.add_argument("--bases", default="15", help="Number of bases, or comma-separated codes")
+    parser.add_argument("--max-targets", type=int, default=10, help="Targets per base (0 for every currency)")
+    parser.add_argument("--latency", default="fixed:0")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=12.0)
+    parser.add_argument("--profiles", help="JSON file with per-source fault profile overrides")
+    parser.add_argument("--rate-limit", action="store_true", help="Apply the real per-source rate limits")
+    parser.add_argument("--scrape-cache", action="store_true", help="Keep the Redis scrape result/validator caches on")
+    parser.add_argument("--adaptive", action="store_true", help="Rank sources by their live health stats in Redis")
+    parser.add_argument("--hedging", action="store_true", help="Hedge slow single-pair requests (uses Redis stats)")
+    parser.add_argument("--coverage", action="store_true", help="Plan requests from the Redis coverage index")
+    parser.add_argument("--budget", type=float, default=0, help="Job deadline in seconds (0 for none)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Bases scraped in parallel threads")
+    parser.add_argument("--parse-processes", type=int, default=0, help="Run HTML transform() on this many processes")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    CustomLogger().logger.setLevel(logging.CRITICAL)
+
+    default_profile = FaultProfile(
+        latency=args.latency,
+        rate_429=args.rate_429,
+        timeout_rate=args.timeout_rate,
+        truncate_rate=args.truncate_rate,
+        hang_seconds=args.hang_seconds,
+    )
+    profiles = {}
+    if args.profiles:
+        with open(args.profiles, "r", encoding="utf-8") as file:
+            profiles = {
+                name: default_profile.with_overrides(overrides)
+                for name, overrides in json.load(file).items()
+            }
+
+    if not args.scrape_cache:
+        # Every run should reach the replay server rather than a result cached by a previous run.
+        config.SCRAPER_RESULT_CACHE_TTL = 0
+        config.SCRAPER_VALIDATOR_CACHE_TTL = 0
+
+    config.SCRAPER_ADAPTIVE_ORDERING = args.adaptive
+    config.SCRAPER_HEDGING = args.hedging
+    config.SCRAPER_COVERAGE_PLANNING = args.coverage
+    config.SCRAPER_PARSE_PROCESSES = args.parse_processes
+
+    server = ReplayServer(port=0, default_profile=default_profile, profiles=profiles, seed=args.seed)
+    config.SCRAPER_BASE_URL_OVERRIDE = server.start()
+
+    currencies = [c for c in load_currencies().values() if c["name"]]
+    if args.bases.isdigit():
+        bases = currencies[: int(args.bases)]
+    else:
+        codes = args.bases.upper().split(",")
+        bases = [c for c in currencies if c["code"] in codes]
+
+    deadline = Deadline(args.budget)
+    if args.rate_limit:
+        scraper_manager = ScraperManager(deadline=deadline)
+    else:
+        scraper_manager = ScraperManager(
+            rate_limiter=RateLimiter.for_sources(ScraperManager().sources, 0.001), deadline=deadline
+        )
+
+    start = time.perf_counter()
+    try:
+        stats = run(bases, currencies, scraper_manager, args.max_targets, args.concurrency)
+    finally:
+        elapsed = time.perf_counter() - start
+        server.stop()
+
+    stats["seconds"] = round(elapsed, 2)
+    stats["requests"] = sum(server.stats.values())
+    stats["responses"] = dict(sorted(server.stats.items()))
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
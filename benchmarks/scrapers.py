@@ -0,0 +1,239 @@
+"""
+Offline benchmark for scraper transform() against the fixture corpus.
+
+The shipped corpus is synthetic (see fixtures/README.md): timings compare parser and
+engine changes with each other, not with the live pages, until it is captured. Every
+result says whether its fixture was captured (listed in fixtures/captured.json) or not.
+
+Usage:
+    python -m benchmarks.scrapers                      # benchmark every source
+    python -m benchmarks.scrapers --source x-rates     # benchmark one source
+    python -m benchmarks.scrapers --parser html.parser # compare parser backends
+    python -m benchmarks.scrapers capture USD EUR      # replace fixtures with live responses
+
+Fixtures live in benchmarks/fixtures/<source-name>/ as <BASE>.html for multi-pair
+sources and <BASE>-<TARGET>.html (or .json for JSON APIs) for single-pair sources.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import config
+from app.scraping import base
+from app.scraping.factory import SCRAPER_SOURCES, ScraperCapability, ScraperSourceName
+from app.utils.custom_logger import CustomLogger
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Fixture path (relative to FIXTURES_DIR) -> URL and time it was captured from
+CAPTURED_FILE = os.path.join(FIXTURES_DIR, "captured.json")
+CURRENCIES_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "db", "currencies.json"
+)
+
+
+def load_currencies() -> Dict[str, Dict[str, Any]]:
+    """Load currency metadata from the seed file so no database is needed."""
+    with open(CURRENCIES_FILE, "r", encoding="utf-8") as file:
+        return {currency["code"]: currency for currency in json.load(file)}
+
+
+def build_scraper(source_name: ScraperSourceName, base_currency: str, target_currency: Optional[str] = None):
+    """Instantiate the scraper for a source with the parameters it requires."""
+    source = SCRAPER_SOURCES[source_name]
+    currencies = load_currencies()
+    params = {"base_currency": base_currency}
+
+    if target_currency:
+        params["target_currency"] = target_currency
+    if source.needs_base_name:
+        params["base_name"] = currencies[base_currency]["name"]
+    if source.needs_base_plural:
+        params["base_name_plural"] = currencies[base_currency]["name_plural"]
+
+    return source.scraper_cls(**params)
+
+
+def fixture_path(source_name: ScraperSourceName, base_currency: str, target_currency: Optional[str], ext: str) -> str:
+    stem = f"{base_currency}-{target_currency}" if target_currency else base_currency
+    return os.path.join(FIXTURES_DIR, source_name.value, f"{stem}.{ext}")
+
+
+def load_fixture(path: str) -> Any:
+    """Return a fixture in the form the source's extract() would have returned it."""
+    with open(path, "r", encoding="utf-8") as file:
+        if path.endswith(".json"):
+            return json.load(file)
+        return file.read()
+
+
+def load_captured() -> Dict[str, Dict[str, str]]:
+    """Provenance of the fixtures recorded by `capture`; fixtures not listed are synthetic."""
+    if not os.path.exists(CAPTURED_FILE):
+        return {}
+    with open(CAPTURED_FILE, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def iter_fixtures(source: Optional[str] = None) -> Iterator[Tuple[ScraperSourceName, str, Optional[str], str]]:
+    """
+    Yield (source_name, base_currency, target_currency, path) for every fixture.
+    """
+    for source_name in SCRAPER_SOURCES:
+        if source and source_name.value != source:
+            continue
+
+        source_dir = os.path.join(FIXTURES_DIR, source_name.value)
+        if not os.path.isdir(source_dir):
+            continue
+
+        for file_name in sorted(os.listdir(source_dir)):
+            stem, ext = os.path.splitext(file_name)
+            if ext not in (".html", ".json"):
+                continue
+            base_currency, _, target_currency = stem.partition("-")
+            yield source_name, base_currency, target_currency or None, os.path.join(source_dir, file_name)
+
+
+def benchmark_fixture(scraper, raw_data: Any, repeat: int) -> Dict[str, Any]:
+    """
+    Run transform() `repeat` times and report timing, allocations and rates extracted.
+    """
+    rates = scraper.transform(raw_data)  # warm-up, also validates the fixture
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scraper.transform(raw_data)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    scraper.transform(raw_data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "rates": len(rates or {}),
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": sorted(timings)[max(0, int(len(timings) * 0.95) - 1)] * 1000,
+        "peak_kb": peak / 1024,
+        "size_kb": len(raw_data) / 1024 if isinstance(raw_data, str) else len(json.dumps(raw_data)) / 1024,
+    }
+
+
+def run_benchmarks(source: Optional[str] = None, repeat: int = 20) -> List[Dict[str, Any]]:
+    results = []
+    captured = load_captured()
+    for source_name, base_currency, target_currency, path in iter_fixtures(source):
+        scraper = build_scraper(source_name, base_currency, target_currency)
+        stats = benchmark_fixture(scraper, load_fixture(path), repeat)
+        stats.update(
+            source=source_name.value,
+            fixture=os.path.basename(path),
+            captured=os.path.relpath(path, FIXTURES_DIR) in captured,
+        )
+        results.append(stats)
+    return results
+
+
+def print_results(results: List[Dict[str, Any]]):
+    header = (
+        f"{'source':<26} {'fixture':<14} {'origin':<9} {'size KB':>8} {'rates':>6} "
+        f"{'median ms':>10} {'p95 ms':>8} {'peak KB':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['source']:<26} {row['fixture']:<14} {'captured' if row['captured'] else 'synthetic':<9} "
+            f"{row['size_kb']:>8.1f} {row['rates']:>6} "
+            f"{row['median_ms']:>10.2f} {row['p95_ms']:>8.2f} {row['peak_kb']:>9.1f}"
+        )
+
+    total_ms = sum(row["median_ms"] for row in results)
+    total_rates = sum(row["rates"] for row in results)
+    print("-" * len(header))
+    print(f"{len(results)} fixtures, {total_rates} rates, {total_ms:.1f} ms total median parse time")
+    synthetic = sum(not row["captured"] for row in results)
+    if synthetic:
+        print(f"{synthetic} of {len(results)} fixtures are synthetic: their timings don't reflect live pages")
+
+
+def capture(base_currencies: List[str], target_currency: str = "EUR", source: Optional[str] = None):
+    """
+    Record live responses into the fixture corpus (requires network access).
+    Multi-pair sources are captured once per base, single-pair sources for base -> target_currency.
+    Each capture is listed in CAPTURED_FILE with the URL it came from. Pages are read in
+    full (without streaming), so they can show where a `STREAM_UNTIL` cut really lands.
+    """
+    config.SCRAPER_STREAMING = False
+    captured = load_captured()
+    for source_name, scraper_source in SCRAPER_SOURCES.items():
+        if source and source_name.value != source:
+            continue
+
+        for base_currency in base_currencies:
+            target = None
+            if scraper_source.capability == ScraperCapability.SINGLE_PAIR:
+                target = target_currency if base_currency != target_currency else "USD"
+
+            scraper = build_scraper(source_name, base_currency, target)
+            try:
+                raw_data = scraper.extract()
+            except Exception as e:
+                print(f"Failed to capture {source_name.value} {base_currency}: {e}")
+                continue
+
+            is_json = not isinstance(raw_data, str)
+            path = fixture_path(source_name, base_currency, target, "json" if is_json else "html")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                if is_json:
+                    json.dump(raw_data, file)
+                else:
+                    file.write(raw_data)
+            captured[os.path.relpath(path, FIXTURES_DIR)] = {
+                "url": (scraper._validators or {}).get("url"),
+                "captured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+            with open(CAPTURED_FILE, "w", encoding="utf-8") as file:
+                json.dump(captured, file, indent=2, sort_keys=True)
+            print(f"Captured {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmarks")
+    parser.add_argument("command", nargs="?", default="run", choices=["run", "capture"])
+    parser.add_argument("bases", nargs="*", default=["USD", "EUR", "GBP"], help="Base currencies to capture")
+    parser.add_argument("--source", help="Only benchmark or capture this source (e.g. x-rates)")
+    parser.add_argument("--target", default="EUR", help="Target currency for single-pair captures")
+    parser.add_argument("--repeat", type=int, default=20, help="transform() runs per fixture")
+    parser.add_argument("--parser", choices=["lxml", "html.parser"], help="Override SCRAPER_HTML_PARSER")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    # Scrapers log every transform; keep the benchmark output readable.
+    CustomLogger().logger.setLevel(logging.WARNING)
+
+    if args.parser:
+        config.SCRAPER_HTML_PARSER = args.parser
+        base.get_html_parser.cache_clear()
+
+    if args.command == "capture":
+        capture(args.bases, args.target, args.source)
+        return
+
+    results = run_benchmarks(args.source, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
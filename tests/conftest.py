@@ -0,0 +1,37 @@
+import sys
+
+import fakeredis
+import pytest
+
+from app.core.config import config
+# The Celery app imports the task modules; load it first, as the worker does
+from app.tasks.celery_app import celery_app  # noqa: F401
+from benchmarks.replay_server import ReplayServer
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    """
+    In-memory Redis (with Lua scripting) swapped in for the `redis_client` every loaded
+    app module imported from app.utils.cache_manager.
+    """
+    client = fakeredis.FakeRedis(decode_responses=True)
+    for name, module in list(sys.modules.items()):
+        if name.startswith("app.") and hasattr(module, "redis_client"):
+            monkeypatch.setattr(module, "redis_client", client)
+    return client
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    """Start replay servers on free ports and point every scraper at the last one."""
+    def start(**kwargs) -> ReplayServer:
+        server = ReplayServer(port=0, seed=1, **kwargs)
+        monkeypatch.setattr(config, "SCRAPER_BASE_URL_OVERRIDE", server.start())
+        servers.append(server)
+        return server
+
+    servers = []
+    yield start
+    for server in servers:
+        server.stop()
@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.params import Depends
+
+from app.api.dependencies import require_admin
+from app.api.route import router
+from app.controllers.admin_controller import AdminController
+from app.core.config import config
+from app.tasks.progress_tracker import ProgressTracker
+from app.utils.job_events import JobEvents
+
+
+def status_code(call):
+    with pytest.raises(HTTPException) as error:
+        call()
+    return error.value.status_code
+
+
+def test_admin_is_refused_without_a_configured_key(monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_API_KEY", None)
+
+    assert status_code(lambda: require_admin("anything")) == 403
+
+
+def test_admin_needs_the_configured_key(monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_API_KEY", "s3cret")
+
+    assert status_code(lambda: require_admin(None)) == 401
+    assert status_code(lambda: require_admin("wrong")) == 403
+    require_admin("s3cret")
+
+
+def test_every_admin_route_is_guarded():
+    admin_routes = [route for route in router.routes if route.path.startswith("/admin")]
+
+    assert admin_routes
+    for route in admin_routes:
+        assert any(
+            isinstance(dependency, Depends) and dependency.dependency is require_admin
+            for dependency in route.dependencies
+        ), route.path
+
+
+@pytest.fixture
+def job(redis, monkeypatch):
+    monkeypatch.setattr(config, "JOB_EVENTS", True)
+    monkeypatch.setattr(config, "JOB_EVENTS_SSE_KEEPALIVE", 0.05)
+    ProgressTracker.start_job("job-1")
+    return "job-1"
+
+
+def collect(job_id, last_event_id="0-0"):
+    async def run():
+        return [message async for message in AdminController.stream_job_events(job_id, last_event_id)]
+
+    return asyncio.run(run())
+
+
+def test_stream_of_an_unknown_job_is_not_found(redis):
+    assert status_code(lambda: AdminController.stream_job_events("missing")) == 404
+
+
+def test_stream_of_a_job_known_only_by_its_events(job):
+    JobEvents.emit("job-2", "job_finished", status="completed")
+
+    assert len(collect("job-2")) == 1
+
+
+def test_stream_ends_with_the_job(job):
+    ProgressTracker.complete_job(job)
+
+    messages = collect(job)
+
+    assert [message.split("\n")[1] for message in messages] == ["event: job_started", "event: job_finished"]
+
+
+def test_stream_resumes_after_the_last_event_id(job):
+    first = JobEvents.read(job)[0][0]
+    ProgressTracker.complete_job(job)
+
+    messages = collect(job, first)
+
+    assert len(messages) == 1
+    assert "event: job_finished" in messages[0]
+
+
+def test_stream_of_a_running_job_closes_after_its_lifetime(job, monkeypatch):
+    monkeypatch.setattr(config, "JOB_EVENTS_SSE_MAX_SECONDS", 0.3)
+
+    started = time.monotonic()
+    messages = collect(job)
+
+    assert time.monotonic() - started < 2
+    assert messages[0].startswith("id: ")
+    assert ": keep-alive\n\n" in messages[1:]
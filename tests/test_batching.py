@@ -0,0 +1,32 @@
+import pytest
+
+from app.scraping.base import BaseScraper
+from app.scraping.factory import SCRAPER_SOURCES
+
+
+class PairScraper(BaseScraper):
+    def extract(self):
+        return self.target_currency
+
+    def transform(self, raw_data):
+        return {raw_data: 0.9}
+
+    def get_source_name(self) -> str:
+        return "pair"
+
+
+def test_batch_protocol_is_not_implemented_by_default():
+    scraper = PairScraper("USD")
+
+    with pytest.raises(NotImplementedError):
+        scraper.extract_many(["EUR", "JPY"])
+    with pytest.raises(NotImplementedError):
+        scraper.transform_many(None, ["EUR", "JPY"])
+
+
+def test_no_source_implements_the_batch_protocol():
+    assert all(
+        source.scraper_cls.extract_many is BaseScraper.extract_many
+        and source.scraper_cls.transform_many is BaseScraper.transform_many
+        for source in SCRAPER_SOURCES.values()
+    )
@@ -0,0 +1,67 @@
+import struct
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.ingest import as_utc, encode_copy_rows
+
+BATCH_ID = uuid.UUID("12345678-1234-5678-1234-567812345678")
+CREATED_AT = datetime(2026, 10, 19, 12, 30, 15, 250, tzinfo=timezone.utc)
+
+
+def parse_copy_rows(data: bytes):
+    """Decode the binary COPY stream written by encode_copy_rows."""
+    assert data.startswith(b"PGCOPY\n\xff\r\n\x00")
+    offset = 19
+    rows = []
+    while True:
+        (fields,) = struct.unpack_from("!h", data, offset)
+        offset += 2
+        if fields == -1:
+            break
+        values = []
+        for _ in range(fields):
+            (size,) = struct.unpack_from("!i", data, offset)
+            values.append(data[offset + 4:offset + 4 + size])
+            offset += 4 + size
+        rows.append(values)
+    assert offset == len(data)
+    return rows
+
+
+def test_rows_are_encoded_as_binary_copy_fields():
+    rate = {"base_currency_id": 1, "target_currency_id": 42, "rate": 0.9183, "source": "x-rates", "created_at": CREATED_AT}
+
+    (row,) = parse_copy_rows(encode_copy_rows(BATCH_ID, [rate]))
+
+    batch_id, base_id, target_id, value, source, created_at = row
+    assert uuid.UUID(bytes=batch_id) == BATCH_ID
+    assert struct.unpack("!i", base_id) == (1,)
+    assert struct.unpack("!i", target_id) == (42,)
+    assert struct.unpack("!d", value) == (0.9183,)
+    assert source.decode() == "x-rates"
+    microseconds = struct.unpack("!q", created_at)[0]
+    assert datetime(2000, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=microseconds) == CREATED_AT
+
+
+def test_empty_batch_is_header_and_trailer_only():
+    assert parse_copy_rows(encode_copy_rows(BATCH_ID, [])) == []
+
+
+def test_non_ascii_source_length_is_in_bytes():
+    rate = {"base_currency_id": 1, "target_currency_id": 2, "rate": 1.0, "source": "bürse", "created_at": CREATED_AT}
+
+    (row,) = parse_copy_rows(encode_copy_rows(BATCH_ID, [rate]))
+
+    assert row[4].decode("utf-8") == "bürse"
+
+
+@pytest.mark.parametrize(
+    "value",
+    [CREATED_AT, CREATED_AT.replace(tzinfo=None), CREATED_AT.astimezone(timezone(timedelta(hours=-5)))],
+    ids=["utc", "naive", "offset"],
+)
+def test_created_at_is_one_utc_instant_however_it_is_given(value):
+    assert as_utc(value) == CREATED_AT
+    assert as_utc(value).utcoffset() == timedelta(0)
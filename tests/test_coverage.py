@@ -0,0 +1,99 @@
+import time
+
+import pytest
+import requests
+
+from app.core.config import config
+from app.scraping.base import BaseScraper
+from app.scraping.coverage import BaseCoverage, CoverageIndex
+from app.scraping.manager import ScraperManager
+from app.scraping.rate_limiter import RateLimiter, SourceLimit
+
+
+class PageScraper(BaseScraper):
+    """Returns `page` from scrape(), or raises it if it is an exception."""
+
+    page = {}
+
+    def extract(self):
+        raise AssertionError("scrape() is stubbed")
+
+    def transform(self, raw_data):
+        return {}
+
+    def get_source_name(self) -> str:
+        return "page"
+
+    def scrape(self, throttle=None):
+        with throttle:
+            if isinstance(self.page, Exception):
+                raise self.page
+            return self.page
+
+
+@pytest.fixture
+def manager(redis, monkeypatch):
+    monkeypatch.setattr(config, "SCRAPER_COVERAGE_PLANNING", True)
+    monkeypatch.setattr(config, "SCRAPER_ADAPTIVE_ORDERING", False)
+    return ScraperManager(rate_limiter=RateLimiter({"src": SourceLimit("src", rate=1000, burst=100)}))
+
+
+def miss_ttl(redis, target):
+    return redis.zscore("coverage_miss:src:USD", target) - time.time()
+
+
+def test_targets_missing_from_a_response_are_negative_cached_briefly(manager, redis):
+    scraper = PageScraper("USD")
+    scraper.page = {"EUR": 0.9}
+
+    manager.scrape_source("src", scraper, wanted={"EUR", "JPY"})
+
+    coverage = CoverageIndex.load("USD", ["src"])
+    assert coverage.can_serve("src", "EUR") is True
+    assert coverage.can_serve("src", "JPY") is False
+    assert miss_ttl(redis, "JPY") == pytest.approx(config.COVERAGE_INFERRED_NEGATIVE_TTL, abs=5)
+
+
+def test_not_found_is_negative_cached_for_the_full_ttl(manager, redis):
+    response = requests.Response()
+    response.status_code = 404
+    scraper = PageScraper("USD", "JPY")
+    scraper.page = requests.HTTPError("404 Not Found", response=response)
+
+    with pytest.raises(requests.HTTPError):
+        manager.scrape_source("src", scraper)
+
+    assert miss_ttl(redis, "JPY") == pytest.approx(config.COVERAGE_NEGATIVE_TTL, abs=5)
+
+
+def test_a_brief_miss_does_not_shorten_the_key_holding_longer_ones(manager, redis):
+    CoverageIndex.record("src", "USD", [], ["XAU"])
+    CoverageIndex.record("src", "USD", ["EUR"], ["EUR", "JPY"], negative_ttl=60)
+
+    assert redis.ttl("coverage_miss:src:USD") == pytest.approx(config.COVERAGE_NEGATIVE_TTL, abs=5)
+    assert CoverageIndex.load("USD", ["src"]).missing["src"] == {"XAU", "JPY"}
+
+
+def test_a_returned_target_clears_its_negative_entry(redis):
+    CoverageIndex.record("src", "USD", [], ["JPY"])
+    CoverageIndex.record("src", "USD", ["JPY"])
+
+    assert CoverageIndex.load("USD", ["src"]).can_serve("src", "JPY") is True
+
+
+def test_multi_pair_plan_is_a_greedy_set_cover():
+    coverage = BaseCoverage(
+        "USD",
+        served={"a": {"EUR"}, "b": {"EUR", "JPY", "GBP"}, "c": {"CHF"}, "d": set()},
+        missing={"d": {"EUR", "JPY", "GBP", "CHF"}},
+    )
+
+    assert coverage.plan_multi_pair(["a", "b", "c", "d", "e"], ["EUR", "JPY", "GBP", "CHF"]) == ["b", "c", "a", "e"]
+
+
+def test_single_pair_plan_puts_known_servers_first_and_drops_misses():
+    coverage = BaseCoverage("USD", served={"b": {"EUR"}}, missing={"c": {"EUR"}})
+
+    assert coverage.plan_single_pair(["a", "b", "c"], "EUR") == ["b", "a"]
+    assert coverage.impossible("EUR", ["c"])
+    assert not coverage.impossible("EUR", ["a", "c"])
@@ -0,0 +1,92 @@
+import pytest
+
+from app.core.config import config
+from app.exceptions import ScrapingException
+from app.scraping.deadline import Deadline
+from app.scraping.manager import ScraperManager
+from app.scraping.rate_limiter import RateLimiter, SourceLimit
+from app.scraping.source_health import SourceHealth
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("app.scraping.deadline.time", clock)
+    return clock
+
+
+@pytest.fixture
+def timeouts(monkeypatch):
+    monkeypatch.setattr(config, "SCRAPER_REQUEST_TIMEOUT", 10.0)
+    monkeypatch.setattr(config, "SCRAPER_MIN_REQUEST_TIMEOUT", 2.0)
+    monkeypatch.setattr(config, "SCRAPER_TIMEOUT_P95_FACTOR", 3.0)
+    monkeypatch.setattr(config, "SCRAPER_ADAPTIVE_ORDERING", True)
+
+
+def test_no_budget_never_expires(clock):
+    deadline = Deadline(None)
+
+    assert deadline.remaining() == float("inf")
+    assert not deadline.expired()
+
+
+def test_deadline_expires_when_less_than_the_shortest_request_is_left(clock, timeouts):
+    deadline = Deadline(60)
+
+    clock.now += 57
+    assert deadline.remaining() == pytest.approx(3)
+    assert not deadline.expired()
+
+    clock.now += 1.5
+    assert deadline.expired()
+    assert Deadline.at(deadline.expires_at).expired()
+
+
+def test_request_timeout_follows_the_source_p95_within_bounds(redis, clock, timeouts):
+    for latency in (0.5, 1.0, 1.5):
+        SourceHealth.record("slow", latency, rates=1)
+    SourceHealth.record("fast", 0.1, rates=1)
+    deadline = Deadline(600)
+
+    assert deadline.request_timeout("slow") == pytest.approx(4.5)
+    assert deadline.request_timeout("fast") == 2.0
+    assert deadline.request_timeout("unknown") == 10.0
+
+
+def test_request_timeout_never_exceeds_the_budget_left(redis, clock, timeouts):
+    deadline = Deadline(60)
+    clock.now += 55
+
+    assert deadline.request_timeout("unknown") == pytest.approx(5)
+
+
+def test_source_p95_is_read_from_redis_once_per_stats_ttl(redis, clock, timeouts):
+    deadline = Deadline(600)
+    SourceHealth.record("s", 1.0, rates=1)
+    assert deadline.request_timeout("s") == pytest.approx(3)
+
+    SourceHealth.record("s", 3.0, rates=1)
+    assert deadline.request_timeout("s") == pytest.approx(3)
+
+    clock.now += Deadline.STATS_TTL + 1
+    assert deadline.request_timeout("s") == pytest.approx(9)
+
+
+def test_manager_sends_nothing_once_the_deadline_has_passed(clock, timeouts):
+    deadline = Deadline(60)
+    clock.now += 59
+    manager = ScraperManager(rate_limiter=RateLimiter({"s": SourceLimit("s", rate=1)}), deadline=deadline)
+
+    with pytest.raises(ScrapingException, match="deadline"):
+        manager.scrape_source("s", scraper=None)
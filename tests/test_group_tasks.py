@@ -0,0 +1,51 @@
+import pytest
+
+from app.tasks import exchange_rates
+from app.tasks.exchange_rates import finalize_currency_group
+from app.tasks.job_lease import JobLease
+from app.tasks.progress_tracker import ProgressTracker
+
+
+def result(base, status, stored=0, failed=0):
+    return {"base": base, "base_id": 1, "status": status, "stored": stored, "failed": failed}
+
+
+@pytest.fixture
+def follow_ups(monkeypatch):
+    queued = []
+    monkeypatch.setattr(
+        exchange_rates.scrape_currency_group, "apply_async", lambda args, kwargs: queued.append((args, kwargs))
+    )
+    return queued
+
+
+def test_finalize_totals_subtask_results_and_completes_the_job(redis, follow_ups):
+    ProgressTracker.start_job("job")
+    results = [result("USD", "complete", 150, 4), result("EUR", "failed", 0, 154), result("GBP", "complete", 154)]
+
+    summary = finalize_currency_group(results, "job", "major", successful_pairs=10, failed_pairs=1, write_failures=2)
+
+    assert summary["status"] == "success"
+    assert summary["failed"] == 1 + 4 + 154 + 2
+    assert summary["message"].startswith(f"Scraped {10 + 150 + 154 - 2} pairs")
+    assert summary["deferred"] == 0
+    assert follow_ups == []
+    assert ProgressTracker.get_job_status("job")["status"] == "completed"
+
+
+def test_finalize_releases_the_group_lease_and_defers_unreached_bases(redis, follow_ups):
+    lease = JobLease("group:major")
+    assert lease.acquire()
+    token = lease.hand_over(60)
+
+    summary = finalize_currency_group(
+        [result("USD", "complete", 150), result("JPY", "deferred"), result("CHF", "deferred")],
+        "job", "major", lease_token=token,
+    )
+
+    assert summary["deferred"] == 2
+    assert follow_ups == [(["major"], {"mode": "direct", "base_codes": ["JPY", "CHF"]})]
+    # Released first, so the follow-up can take it
+    follow_up_lease = JobLease("group:major")
+    assert follow_up_lease.acquire()
+    follow_up_lease.release()
@@ -0,0 +1,139 @@
+import threading
+import time
+
+import pytest
+
+from app.core.config import config
+from app.exceptions import ScrapingException
+from app.scraping import hedging
+from app.scraping.hedging import scrape_hedged
+from app.scraping.manager import ScraperManager
+from app.scraping.rate_limiter import RateLimiter, SourceLimit
+
+
+class FakeManager:
+    """
+    Stands in for ScraperManager.scrape_source: each "scraper" is (seconds, rates or
+    exception), or (token wait, seconds, rates or exception).
+    """
+
+    def __init__(self):
+        self.started = []
+
+    def scrape_source(self, source_name, scraper, cancelled, on_request=None):
+        self.started.append(source_name)
+        token_wait, seconds, result = scraper if len(scraper) == 3 else (0, *scraper)
+        time.sleep(token_wait)
+        on_request()
+        time.sleep(seconds)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """Hedge after 50 ms and count the lookups of the delay."""
+    lookups = []
+
+    def hedge_delay(source_name):
+        lookups.append(source_name)
+        return 0.05
+
+    monkeypatch.setattr(hedging, "hedge_delay", hedge_delay)
+    monkeypatch.setattr(hedging, "get_hedge_slots", lambda: threading.BoundedSemaphore(4))
+    return lookups
+
+
+def test_fast_first_attempt_is_not_hedged(delays):
+    manager = FakeManager()
+
+    result = scrape_hedged(manager, [("a", (0, {"EUR": 1.0})), ("b", (0, {"EUR": 2.0}))], bool, "USD-EUR")
+
+    assert result == ("a", {"EUR": 1.0})
+    assert manager.started == ["a"]
+
+
+def test_slow_attempt_is_hedged_and_the_first_valid_answer_wins(delays):
+    manager = FakeManager()
+
+    result = scrape_hedged(manager, [("a", (1, {"EUR": 1.0})), ("b", (0, {"EUR": 2.0}))], bool, "USD-EUR")
+
+    assert result == ("b", {"EUR": 2.0})
+    assert manager.started == ["a", "b"]
+
+
+def test_failed_attempt_is_replaced_without_waiting(delays):
+    manager = FakeManager()
+    attempts = [("a", (0, RuntimeError("503"))), ("b", (0, {})), ("c", (0, {"EUR": 3.0}))]
+
+    assert scrape_hedged(manager, attempts, bool, "USD-EUR") == ("c", {"EUR": 3.0})
+    assert manager.started == ["a", "b", "c"]
+
+
+def test_all_attempts_failing_raises(delays):
+    with pytest.raises(ScrapingException, match="503"):
+        scrape_hedged(FakeManager(), [("a", (0, RuntimeError("503"))), ("b", (0, {}))], bool, "USD-EUR")
+
+
+def test_without_a_free_slot_the_delay_is_looked_up_once(delays, monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(hedging, "get_hedge_slots", lambda: slots)
+    manager = FakeManager()
+
+    result = scrape_hedged(manager, [("a", (0.3, {"EUR": 1.0})), ("b", (0, {"EUR": 2.0}))], bool, "USD-EUR")
+
+    assert result == ("a", {"EUR": 1.0})
+    assert manager.started == ["a"]
+    assert delays == ["a"]
+
+
+def test_waiting_for_a_rate_limit_token_is_not_hedged(delays):
+    manager = FakeManager()
+
+    result = scrape_hedged(manager, [("a", (0.3, 0, {"EUR": 1.0})), ("b", (0, {"EUR": 2.0}))], bool, "USD-EUR")
+
+    assert result == ("a", {"EUR": 1.0})
+    assert manager.started == ["a"]
+
+
+def test_slow_answer_after_the_token_wait_is_hedged(delays):
+    manager = FakeManager()
+
+    result = scrape_hedged(manager, [("a", (0.2, 1, {"EUR": 1.0})), ("b", (0, {"EUR": 2.0}))], bool, "USD-EUR")
+
+    assert result == ("b", {"EUR": 2.0})
+    assert manager.started == ["a", "b"]
+
+
+class InstantScraper:
+    """Answers at once, but only inside the manager's rate limit."""
+
+    base_currency = "USD"
+    target_currency = "EUR"
+    timeout = None
+
+    def __init__(self, rate):
+        self.rate = rate
+
+    def scrape(self, throttle):
+        with throttle:
+            return {"EUR": self.rate}
+
+
+def test_rate_limited_fast_source_is_not_hedged(delays, monkeypatch):
+    monkeypatch.setattr(config, "SCRAPER_ADAPTIVE_ORDERING", False)
+    monkeypatch.setattr(config, "SCRAPER_COVERAGE_PLANNING", False)
+    limiter = RateLimiter({"a": SourceLimit("a", rate=1 / 0.4), "b": SourceLimit("b", rate=100)})
+    manager = ScraperManager(rate_limiter=limiter)
+    # Spend the token of "a", so the hedged scrape queues 0.4s for the next one
+    manager.scrape_source("a", InstantScraper(0.9))
+    started = []
+    monkeypatch.setattr(manager, "scrape_source", lambda name, *args, **kwargs: started.append(name) or
+                        ScraperManager.scrape_source(manager, name, *args, **kwargs))
+
+    result = scrape_hedged(manager, [("a", InstantScraper(1.0)), ("b", InstantScraper(2.0))], bool, "USD-EUR")
+
+    assert result == ("a", {"EUR": 1.0})
+    assert started == ["a"]
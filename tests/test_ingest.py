@@ -0,0 +1,103 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import config
+from app.db import ingest
+from app.db.ingest import RateIngestWriter
+
+
+class FakeSession:
+    def __init__(self, log):
+        self.log = log
+
+    def commit(self):
+        self.log.append("commit")
+
+    def rollback(self):
+        self.log.append("rollback")
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """Record the batches written and the session calls instead of talking to PostgreSQL."""
+    db = SimpleNamespace(batches=[], log=[], fail=False, written=threading.Event())
+
+    def write_rates(session, rows):
+        if db.fail:
+            raise RuntimeError("connection lost")
+        db.batches.append([row["target_currency_id"] for row in rows])
+        db.written.set()
+
+    monkeypatch.setattr(ingest, "SessionLocal", lambda: FakeSession(db.log))
+    monkeypatch.setattr(ingest, "write_rates", write_rates)
+    monkeypatch.setattr(config, "RATE_CHANGE_FILTER", False)
+    monkeypatch.setattr(config, "SCRAPE_SCHEDULE", "fixed")
+    return db
+
+
+def records(*target_ids):
+    return [
+        {"base_currency_id": 1, "target_currency_id": target_id, "rate": 1.0, "source": "test", "created_at": None}
+        for target_id in target_ids
+    ]
+
+
+def test_records_are_written_in_batches_of_batch_size(database):
+    with RateIngestWriter(batch_size=3, flush_interval=60) as writer:
+        writer.add(records(1, 2))
+        writer.add(records(3, 4))
+        writer.add(records(5, 6, 7))
+
+    assert database.batches == [[1, 2, 3], [4, 5, 6], [7]]
+    assert database.log == ["commit"] * 3
+    assert writer.written == 7
+
+
+def test_partial_batch_is_flushed_after_the_interval(database):
+    writer = RateIngestWriter(batch_size=100, flush_interval=0.05)
+    try:
+        writer.add(records(1, 2))
+
+        assert database.written.wait(2)
+        assert database.batches == [[1, 2]]
+    finally:
+        writer.close()
+    assert writer.written == 2
+
+
+def test_failed_batch_is_rolled_back_and_counted(database):
+    database.fail = True
+    with RateIngestWriter(batch_size=2, flush_interval=60) as writer:
+        writer.add(records(1, 2, 3))
+
+    assert writer.failed == 3
+    assert writer.written == 0
+    assert database.log == ["rollback", "rollback"]
+
+
+def test_add_blocks_while_the_writer_is_behind(database, monkeypatch):
+    release = threading.Event()
+    original = ingest.write_rates
+
+    def slow_write(session, rows):
+        release.wait(2)
+        original(session, rows)
+
+    monkeypatch.setattr(ingest, "write_rates", slow_write)
+    writer = RateIngestWriter(batch_size=1, flush_interval=60, queue_size=1)
+    blocked = threading.Thread(target=lambda: [writer.add(records(n)) for n in range(4)])
+    blocked.start()
+
+    time.sleep(0.1)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join(2)
+    writer.close()
+    assert writer.written == 4
@@ -0,0 +1,72 @@
+import pytest
+
+from app.core.config import config
+from app.utils.job_events import JobEvents
+
+
+@pytest.fixture
+def events(redis, monkeypatch):
+    monkeypatch.setattr(config, "JOB_EVENTS", True)
+    return redis
+
+
+def test_events_are_read_back_in_order(events):
+    JobEvents.emit("job-1", "job_started")
+    JobEvents.emit("job-1", "base_started", base="USD")
+
+    entries = JobEvents.read("job-1")
+
+    assert [fields for _, fields in entries] == [{"event": "job_started"}, {"event": "base_started", "base": "USD"}]
+    assert JobEvents.read("job-1", after=entries[0][0]) == entries[1:]
+
+
+def test_none_fields_are_left_out(events):
+    JobEvents.emit("job-1", "source", source="wise", error=None)
+
+    assert JobEvents.read("job-1")[0][1] == {"event": "source", "source": "wise"}
+
+
+def test_nothing_is_recorded_without_a_job_or_with_events_off(events, monkeypatch):
+    JobEvents.emit(None, "job_started")
+    monkeypatch.setattr(config, "JOB_EVENTS", False)
+    JobEvents.emit("job-1", "job_started")
+
+    assert events.keys("*") == []
+
+
+def test_exists_only_for_jobs_with_events(events):
+    JobEvents.emit("job-1", "job_started")
+
+    assert JobEvents.exists("job-1")
+    assert not JobEvents.exists("job-2")
+
+
+def test_stream_expires_after_the_progress_ttl(events, monkeypatch):
+    monkeypatch.setattr(config, "JOB_PROGRESS_TTL", 60)
+    JobEvents.emit("job-1", "flush", written=1)
+
+    assert 0 < events.ttl("job_events:job-1") <= 60
+
+
+def test_summary_aggregates_sources_bases_and_rows(events):
+    JobEvents.emit("job-1", "source", source="wise", base="USD", latency_ms=100, rates=10)
+    JobEvents.emit("job-1", "source", source="wise", base="EUR", latency_ms=300, error="timeout")
+    JobEvents.emit("job-1", "source", source="wise", base="GBP", cached=True)
+    JobEvents.emit("job-1", "base_started", base="USD")
+    JobEvents.emit("job-1", "base_started", base="EUR")
+    JobEvents.emit("job-1", "base_finished", base="USD", status="completed", stored=10, seconds=1.5)
+    JobEvents.emit("job-1", "flush", written=8, skipped=2)
+
+    summary = JobEvents.summary("job-1")
+
+    assert summary["events"] == 7
+    (wise,) = summary["sources"]
+    assert (wise["requests"], wise["errors"], wise["cached"], wise["rates"]) == (2, 1, 1, 10)
+    assert (wise["mean_latency_ms"], wise["max_latency_ms"]) == (200.0, 300.0)
+    assert [base["base"] for base in summary["in_flight"]] == ["EUR"]
+    assert summary["slowest_bases"][0]["stored"] == 10
+    assert summary["rows"] == {"written": 8, "skipped": 2, "failed": 0}
+
+
+def test_summary_of_a_job_without_events_is_none(events):
+    assert JobEvents.summary("job-1") is None
@@ -0,0 +1,140 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.tasks import exchange_rates
+from app.tasks.job_lease import JobLease, PendingScrapes
+
+
+def test_a_held_lease_cannot_be_acquired_again(redis):
+    with JobLease("base:USD", ttl=30) as lease:
+        assert lease.acquire()
+        assert not JobLease("base:USD", ttl=30).acquire()
+
+    assert JobLease("base:USD", ttl=30).acquire()
+
+
+def test_release_only_drops_the_owners_lease(redis):
+    lease = JobLease("base:USD", ttl=30)
+    lease.acquire()
+    redis.set(lease.key, "another-owner")
+
+    lease.release()
+
+    assert redis.get(lease.key) == "another-owner"
+
+
+def test_heartbeat_keeps_the_lease_past_its_ttl(redis):
+    lease = JobLease("base:USD", ttl=0.3)
+    lease.acquire()
+    time.sleep(0.6)
+
+    assert redis.get(lease.key) == lease.token
+    assert not lease.lost
+    lease.release()
+    assert redis.get(lease.key) is None
+
+
+def test_a_lease_taken_over_is_marked_lost(redis):
+    lease = JobLease("base:USD", ttl=0.3)
+    lease.acquire()
+    redis.set(lease.key, "another-owner")
+    time.sleep(0.3)
+
+    assert lease.lost
+    lease.release()
+
+
+def test_handed_over_lease_is_released_by_its_token(redis):
+    lease = JobLease("group:primary", ttl=30)
+    lease.acquire()
+    token = lease.hand_over(60)
+    lease.release()
+
+    assert redis.get(lease.key) == token
+    assert 30 < redis.pttl(lease.key) / 1000 <= 60
+
+    JobLease("group:primary", token=token).release()
+    assert redis.get(lease.key) is None
+
+
+class UnavailableRedis:
+    def register_script(self, script):
+        return self.fail
+
+    def fail(self, *args, **kwargs):
+        raise ConnectionError("redis down")
+
+    set = delete = fail
+
+
+def test_leases_and_pending_scrapes_are_granted_without_redis(monkeypatch):
+    monkeypatch.setattr("app.tasks.job_lease.redis_client", UnavailableRedis())
+
+    lease = JobLease("base:USD", ttl=30)
+    assert lease.acquire()
+    lease.release()
+    assert PendingScrapes.claim("USD", 60)
+    PendingScrapes.renew("USD", 60)
+    PendingScrapes.clear("USD")
+
+
+def test_one_scrape_per_base_is_pending(redis):
+    assert PendingScrapes.claim("USD", 60)
+    assert not PendingScrapes.claim("USD", 60)
+
+    PendingScrapes.clear("USD")
+    assert PendingScrapes.claim("USD", 60)
+
+
+def test_renewing_a_pending_scrape_extends_its_mark(redis):
+    PendingScrapes.claim("USD", 60)
+    PendingScrapes.renew("USD", 600)
+
+    assert 60 < redis.ttl("pending_scrape:USD") <= 600
+
+
+@pytest.fixture
+def scrape(redis, monkeypatch):
+    """scrape_base of USD against EUR, with the scraped rates stubbed."""
+    monkeypatch.setattr(
+        exchange_rates,
+        "scrape_base_rates",
+        lambda **kwargs: {"rates": {"EUR": 0.92}, "sources": {"EUR": "test"}, "missing": []},
+    )
+    usd = SimpleNamespace(id=1, code="USD", name="US Dollar", name_plural="US dollars")
+    eur = SimpleNamespace(id=2, code="EUR", name="Euro", name_plural="euros")
+
+    def run(writer):
+        return exchange_rates.scrape_base(SimpleNamespace(job_id=None), usd, [usd, eur], None, writer)
+
+    return run
+
+
+def test_base_lease_is_held_until_its_records_are_handed_over(scrape, redis):
+    held = []
+    writer = SimpleNamespace(add=lambda records: held.append(redis.exists("lease:base:USD")))
+
+    result = scrape(writer)
+
+    assert result["status"] == "complete"
+    assert held == [1]
+    assert not redis.exists("lease:base:USD")
+
+
+def test_base_lease_is_released_when_handing_over_fails(scrape, redis):
+    def add(records):
+        raise RuntimeError("writer stopped")
+
+    with pytest.raises(RuntimeError):
+        scrape(SimpleNamespace(add=add))
+
+    assert not redis.exists("lease:base:USD")
+
+
+def test_busy_base_is_skipped(scrape, redis):
+    with JobLease("base:USD", ttl=30) as lease:
+        lease.acquire()
+
+        assert scrape(SimpleNamespace(add=lambda records: None))["status"] == "busy"
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.controllers.currency_controller import CurrencyController
+from app.controllers.exchange_rate_controller import ExchangeRateController
+from app.core.config import config
+from app.db.latest_rates import LatestRates
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def record(target_id, rate, created_at=NOW):
+    return {"base_currency_id": 1, "target_currency_id": target_id, "rate": rate, "created_at": created_at}
+
+
+@pytest.fixture
+def epsilons(monkeypatch):
+    monkeypatch.setattr(config, "RATE_CHANGE_EPSILON", 0.001)
+    monkeypatch.setattr(config, "RATE_HEARTBEAT_MAX_AGE", 3600)
+
+
+def test_pairs_without_a_stored_rate_are_stored(epsilons):
+    records = [record(2, 1.0)]
+
+    assert LatestRates.changed(records, [None], {}) == records
+
+
+def test_everything_is_stored_when_redis_is_unavailable(epsilons):
+    records = [record(2, 1.0), record(3, 2.0)]
+
+    assert LatestRates.changed(records, None, {}) == records
+
+
+def test_rates_within_epsilon_are_skipped(epsilons):
+    stored_at = (NOW - timedelta(minutes=5)).timestamp()
+    records = [record(2, 1.0005), record(3, 1.002)]
+
+    changed = LatestRates.changed(records, [(1.0, stored_at), (1.0, stored_at)], {})
+
+    assert [row["target_currency_id"] for row in changed] == [3]
+
+
+def test_a_pair_uses_the_larger_epsilon_of_its_currencies(epsilons):
+    stored_at = (NOW - timedelta(minutes=5)).timestamp()
+
+    assert LatestRates.changed([record(2, 1.002)], [(1.0, stored_at)], {2: 0.005}) == []
+
+
+def test_unchanged_rates_are_stored_once_the_heartbeat_is_due(epsilons):
+    stored_at = (NOW - timedelta(seconds=3600)).timestamp()
+    records = [record(2, 1.0)]
+
+    assert LatestRates.changed(records, [(1.0, stored_at)], {}) == records
+
+
+def test_recorded_rates_are_fetched_back(redis, epsilons):
+    LatestRates.record([record(2, 0.92)])
+
+    assert LatestRates.fetch([record(2, 0.0), record(3, 0.0)]) == [(0.92, NOW.timestamp()), None]
+
+
+class FakeQuery:
+    def __init__(self, rows, previous):
+        self.rows = rows
+        self.previous = previous
+
+    def filter(self, *conditions):
+        return self
+
+    def order_by(self, *columns):
+        return self
+
+    def all(self):
+        return list(self.rows)
+
+    def first(self):
+        self.previous.queried = True
+        return self.previous.row
+
+
+@pytest.fixture
+def history(monkeypatch):
+    """get_rate_history over rows in range and the last row stored before from_date."""
+    previous = SimpleNamespace(row=None, queried=False)
+    state = SimpleNamespace(rows=[], previous=previous)
+    db = SimpleNamespace(query=lambda model: FakeQuery(state.rows, previous))
+    monkeypatch.setattr(
+        CurrencyController, "get_currency_by_code", staticmethod(lambda db, code: SimpleNamespace(id={"USD": 3, "EUR": 4}[code]))
+    )
+
+    def get(from_date):
+        result = ExchangeRateController.get_rate_history(db, "USD", "EUR", from_date, NOW)
+        return [rate.rate for rate in result.rates]
+
+    state.get = get
+    return state
+
+
+def row(rate, created_at):
+    return SimpleNamespace(
+        id=1, base_currency_id=3, target_currency_id=4, rate=rate, source="test", created_at=created_at
+    )
+
+
+def test_history_is_only_the_range_without_the_change_filter(history, monkeypatch):
+    monkeypatch.setattr(config, "RATE_CHANGE_FILTER", False)
+    history.rows = [row(0.92, NOW - timedelta(hours=1))]
+    history.previous.row = row(0.91, NOW - timedelta(days=2))
+
+    assert history.get(NOW - timedelta(days=1)) == [0.92]
+    assert not history.previous.queried
+
+
+def test_history_starts_with_the_rate_in_effect_with_the_change_filter(history, monkeypatch):
+    monkeypatch.setattr(config, "RATE_CHANGE_FILTER", True)
+    history.rows = [row(0.92, NOW - timedelta(hours=1))]
+    history.previous.row = row(0.91, NOW - timedelta(days=2))
+
+    assert history.get(NOW - timedelta(days=1)) == [0.91, 0.92]
+
+
+def test_history_with_a_row_at_from_date_does_not_carry_an_older_one(history, monkeypatch):
+    monkeypatch.setattr(config, "RATE_CHANGE_FILTER", True)
+    from_date = NOW - timedelta(days=1)
+    history.rows = [row(0.92, from_date)]
+    history.previous.row = row(0.91, NOW - timedelta(days=2))
+
+    assert history.get(from_date) == [0.92]
+    assert not history.previous.queried
@@ -0,0 +1,110 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+import pytest
+
+from app.core.config import config
+from app.scraping import parse_pool
+from app.scraping.base import BaseScraper
+from app.scraping.factory import ScraperSourceName
+from benchmarks.scrapers import build_scraper, fixture_path, load_fixture
+
+
+@pytest.fixture
+def xrates_page():
+    scraper = build_scraper(ScraperSourceName.X_RATES, "USD")
+    return scraper, load_fixture(fixture_path(ScraperSourceName.X_RATES, "USD", None, "html"))
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(config, "SCRAPER_PARSE_PROCESSES", 1)
+    parse_pool.get_parse_pool.cache_clear()
+    parse_pool.get_parse_slots.cache_clear()
+    yield
+    parse_pool.get_parse_pool().shutdown()
+    parse_pool.get_parse_pool.cache_clear()
+    parse_pool.get_parse_slots.cache_clear()
+
+
+def test_html_is_parsed_in_the_pool_with_the_same_result(pool, xrates_page):
+    scraper, page = xrates_page
+
+    assert scraper.run_transform(page) == scraper.transform(page)
+
+
+def test_broken_pool_falls_back_to_parsing_in_process(pool, xrates_page, monkeypatch):
+    scraper, page = xrates_page
+    broken = ProcessPoolExecutor(max_workers=1)
+    broken.shutdown()
+    monkeypatch.setattr(parse_pool, "get_parse_pool", lru_cache(maxsize=1)(lambda: broken))
+
+    assert parse_pool.transform_in_pool(scraper, page) == scraper.transform(page)
+
+
+def test_json_sources_are_not_offloaded(monkeypatch):
+    monkeypatch.setattr(config, "SCRAPER_PARSE_PROCESSES", 1)
+    scraper = build_scraper(ScraperSourceName.OANDA, "USD", "EUR")
+    monkeypatch.setattr("app.scraping.base.submit_transform", None)
+
+    raw = load_fixture(fixture_path(ScraperSourceName.OANDA, "USD", "EUR", "json"))
+    assert scraper.run_transform(raw) == scraper.transform(raw)
+
+
+class GatedScraper(BaseScraper):
+    """Parses a page once `gate` is set."""
+
+    gate = threading.Event()
+
+    def extract(self):
+        raise AssertionError("pages are handed over directly")
+
+    def transform(self, raw_data):
+        self.gate.wait(5)
+        return {"EUR": float(raw_data)}
+
+    def get_source_name(self) -> str:
+        return "gated"
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    """A parse pool of threads with a single parse slot."""
+    monkeypatch.setattr(config, "SCRAPER_PARSE_QUEUE_SIZE", 1)
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(parse_pool, "get_parse_pool", lru_cache(maxsize=1)(lambda: executor))
+    parse_pool.get_parse_slots.cache_clear()
+    GatedScraper.gate = threading.Event()
+    yield
+    GatedScraper.gate.set()
+    executor.shutdown()
+    parse_pool.get_parse_slots.cache_clear()
+
+
+def test_handed_over_pages_are_parsed_while_the_caller_moves_on(thread_pool):
+    first = parse_pool.submit_transform(GatedScraper("USD"), "0.9")
+    assert not first.done()
+
+    # The only slot is taken, so the next page waits until the first one is parsed
+    submitted = []
+    second = threading.Thread(target=lambda: submitted.append(parse_pool.submit_transform(GatedScraper("USD"), "0.8")))
+    second.start()
+    second.join(0.2)
+    assert second.is_alive()
+
+    GatedScraper.gate.set()
+    second.join(5)
+    assert first.result() == {"EUR": 0.9}
+    assert submitted[0].result() == {"EUR": 0.8}
+
+
+def test_steps_chained_on_a_parse_run_once_in_the_collecting_thread(thread_pool):
+    GatedScraper.gate.set()
+    threads = []
+    pending = parse_pool.submit_transform(GatedScraper("USD"), "0.9").then(
+        lambda get: threads.append(threading.current_thread()) or get()["EUR"]
+    )
+
+    assert pending.result() == pending.result() == 0.9
+    assert threads == [threading.current_thread()]
@@ -0,0 +1,222 @@
+import json
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.core.config import config
+from app.scraping import base
+from app.scraping.base import BaseScraper, read_until, strain, stream_until
+from app.scraping.coverage import CoverageIndex
+from app.scraping.manager import ScraperManager
+from app.scraping.rate_limiter import RateLimiter, SourceLimit
+from benchmarks import scrapers
+from benchmarks.scrapers import FIXTURES_DIR, build_scraper, iter_fixtures, load_captured, load_fixture
+
+FIXTURES = list(iter_fixtures())
+
+
+@pytest.fixture
+def html_parser(monkeypatch):
+    """Switch SCRAPER_HTML_PARSER for one test."""
+    def use(parser: str):
+        monkeypatch.setattr(config, "SCRAPER_HTML_PARSER", parser)
+        base.get_html_parser.cache_clear()
+
+    yield use
+    base.get_html_parser.cache_clear()
+
+
+def test_strain_matches_one_class_token_of_many():
+    html = '<div class="rates"></div><table class="table table-heatmap"><tr><td>1</td></tr></table>'
+
+    soup = BeautifulSoup(html, "html.parser", parse_only=strain("table", "table-heatmap"))
+
+    assert [tag.name for tag in soup.find_all(True)] == ["table", "tr", "td"]
+
+
+def test_strain_skips_elements_without_the_class():
+    html = '<table class="other"></table><table></table>'
+
+    soup = BeautifulSoup(html, "html.parser", parse_only=strain("table", "rates"))
+
+    assert soup.find("table") is None
+
+
+@pytest.mark.parametrize(
+    "source_name, base_currency, target_currency, path",
+    [fixture for fixture in FIXTURES if fixture[3].endswith(".html")],
+    ids=lambda value: getattr(value, "value", None),
+)
+def test_partial_lxml_parse_matches_full_html_parser(html_parser, source_name, base_currency, target_currency, path):
+    scraper = build_scraper(source_name, base_currency, target_currency)
+    raw = load_fixture(path)
+
+    html_parser("html.parser")
+    scraper.PARSE_ONLY = None
+    full = scraper.transform(raw)
+
+    html_parser("lxml")
+    del scraper.PARSE_ONLY
+    partial = scraper.transform(raw)
+
+    assert partial and partial == full
+
+
+def test_every_source_has_fixtures():
+    from app.scraping.factory import SCRAPER_SOURCES
+
+    assert {fixture[0] for fixture in FIXTURES} == set(SCRAPER_SOURCES)
+
+
+def test_captured_fixtures_are_in_the_corpus():
+    paths = {os.path.relpath(fixture[3], FIXTURES_DIR) for fixture in FIXTURES}
+
+    assert set(load_captured()) <= paths
+
+
+def test_benchmark_results_say_whether_a_fixture_was_captured(tmp_path, monkeypatch):
+    captured_file = tmp_path / "captured.json"
+    captured_file.write_text(json.dumps({"x-rates/USD.html": {"url": "https://www.x-rates.com/table/"}}))
+    monkeypatch.setattr(scrapers, "CAPTURED_FILE", str(captured_file))
+
+    results = scrapers.run_benchmarks("x-rates", repeat=1)
+
+    assert {row["fixture"]: row["captured"] for row in results} == {
+        "EUR.html": False, "GBP.html": False, "USD.html": True,
+    }
+
+
+@pytest.mark.parametrize("source_name, base_currency, target_currency, path", FIXTURES)
+def test_fixture_transforms_to_rates(source_name, base_currency, target_currency, path):
+    scraper = build_scraper(source_name, base_currency, target_currency)
+
+    rates = scraper.transform(load_fixture(path))
+
+    assert rates and all(rate > 0 for rate in rates.values())
+    if target_currency:
+        assert target_currency in rates
+
+
+class ChunkedResponse:
+    """Stands in for a streamed requests.Response, recording how much was read."""
+
+    def __init__(self, body: bytes, chunk_size: int):
+        self.chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+        self.read = 0
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_read_until_stops_after_the_last_needed_block(chunk_size):
+    body = b"<p>x</p><table>1</table><div><table>2</table><footer>" + b"z" * 5000
+    response = ChunkedResponse(body, chunk_size)
+
+    read, cut = read_until(response, stream_until("<table", "</table>", 2))
+
+    assert cut
+    assert read == body[:body.index(b"<footer>")]
+    if chunk_size < len(body) // 2:
+        assert response.read < len(response.chunks)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_read_until_ends_a_block_with_the_tag_closing_it(chunk_size):
+    body = b'<div data-testid="conversion"><div>1</div><divider/><p>0.92</p></div><footer>' + b"z" * 5000
+
+    read, cut = read_until(ChunkedResponse(body, chunk_size), stream_until('data-testid="conversion"', "</div>"))
+
+    assert cut
+    assert read == body[:body.index(b"<footer>")]
+
+
+def test_read_until_returns_the_whole_page_without_the_marker():
+    body = b"<table>1</table>"
+
+    assert read_until(ChunkedResponse(body, 4), stream_until("<table", "</table>", 2)) == (body, False)
+
+
+@pytest.mark.parametrize(
+    "source_name, base_currency, target_currency, path",
+    [fixture for fixture in FIXTURES if build_scraper(*fixture[:3]).STREAM_UNTIL is not None],
+)
+def test_cut_page_gives_the_same_rates(source_name, base_currency, target_currency, path):
+    scraper = build_scraper(source_name, base_currency, target_currency)
+    page = load_fixture(path)
+
+    body, cut = read_until(ChunkedResponse(page.encode("utf-8"), 4096), scraper.STREAM_UNTIL)
+
+    assert cut
+    assert scraper.transform(body.decode("utf-8")) == scraper.transform(page)
+
+
+class StreamedResponse(ChunkedResponse):
+    encoding = "utf-8"
+
+    @property
+    def text(self):
+        return b"".join(self.chunks).decode(self.encoding)
+
+    def close(self):
+        pass
+
+
+class StreamedScraper(BaseScraper):
+    """Reads its rate from the first <p>; `page` is served streamed or whole."""
+
+    STREAM_UNTIL = stream_until('class="rates"', "</div>")
+    page = b""
+    fetched = []
+
+    def fetch(self, url, params=None, headers=None, timeout=10, stream=False):
+        self.fetched.append("streamed" if stream else "whole")
+        return StreamedResponse(self.page, 8)
+
+    def extract(self):
+        return self.fetch_text("http://rates.test/")
+
+    def transform(self, raw_data):
+        rate = BeautifulSoup(raw_data, "html.parser").find("p")
+        if rate is None:
+            raise ValueError("Rate not found")
+        return {self.target_currency: float(rate.get_text())}
+
+    def get_source_name(self) -> str:
+        return "streamed"
+
+
+@pytest.fixture
+def streamed(redis, monkeypatch):
+    monkeypatch.setattr(config, "SCRAPER_STREAMING", True)
+    StreamedScraper.fetched = []
+    return StreamedScraper
+
+
+def test_cut_page_is_not_fetched_again_when_it_parses(streamed):
+    streamed.page = b'<div class="rates"><p>0.92</p></div>' + b"z" * 100
+
+    assert streamed("USD", "EUR").scrape() == {"EUR": 0.92}
+    assert streamed.fetched == ["streamed"]
+
+
+def test_cut_page_that_fails_to_parse_is_fetched_again_whole(streamed):
+    # The marker no longer fits: the rate moved past the block
+    streamed.page = b'<div class="rates"></div><div class="moved"><p>0.92</p></div>'
+
+    assert streamed("USD", "EUR").scrape() == {"EUR": 0.92}
+    assert streamed.fetched == ["streamed", "whole"]
+    assert streamed.STREAM_UNTIL is not None
+
+
+def test_targets_of_a_cut_page_that_failed_are_not_recorded_missing(streamed, monkeypatch):
+    monkeypatch.setattr(config, "SCRAPER_COVERAGE_PLANNING", True)
+    monkeypatch.setattr(config, "SCRAPER_ADAPTIVE_ORDERING", False)
+    streamed.page = b'<div class="rates"></div><div class="moved"><p>0.92</p></div>'
+    manager = ScraperManager(rate_limiter=RateLimiter({"streamed": SourceLimit("streamed", rate=1000, burst=100)}))
+
+    assert manager.scrape_source("streamed", streamed("USD", "EUR")) == {"EUR": 0.92}
+    assert CoverageIndex.load("USD", ["streamed"]).can_serve("streamed", "EUR") is True
@@ -0,0 +1,86 @@
+import threading
+
+from app.core.config import config
+from app.tasks.progress_tracker import ProgressTracker
+
+
+def test_started_job_is_running_with_nothing_processed(redis):
+    ProgressTracker.start_job("job-1")
+
+    status = ProgressTracker.get_job_status("job-1")
+    assert status["status"] == "running"
+    assert status["retry_count"] == 0
+    assert status["completed_currencies"] == []
+    assert status["failed_currencies"] == []
+
+
+def test_unknown_job_has_no_status(redis):
+    assert ProgressTracker.get_job_status("missing") is None
+
+
+def test_restarting_a_job_clears_its_currencies(redis):
+    ProgressTracker.start_job("job-1")
+    ProgressTracker.mark_currency_complete("job-1", "USD")
+    ProgressTracker.mark_currency_failed("job-1", "EUR")
+
+    ProgressTracker.start_job("job-1")
+
+    status = ProgressTracker.get_job_status("job-1")
+    assert status["completed_currencies"] == []
+    assert status["failed_currencies"] == []
+
+
+def test_a_failed_currency_completed_on_retry_is_no_longer_failed(redis):
+    ProgressTracker.start_job("job-1")
+    ProgressTracker.mark_currency_failed("job-1", "EUR")
+    ProgressTracker.mark_currency_failed("job-1", "JPY")
+    ProgressTracker.mark_currency_complete("job-1", "EUR")
+
+    status = ProgressTracker.get_job_status("job-1")
+    assert status["completed_currencies"] == ["EUR"]
+    assert status["failed_currencies"] == ["JPY"]
+
+
+def test_concurrent_subtasks_lose_no_updates(redis):
+    ProgressTracker.start_job("job-1")
+    codes = [f"C{index:02d}" for index in range(40)]
+
+    threads = [
+        threading.Thread(target=ProgressTracker.mark_currency_complete, args=("job-1", code)) for code in codes
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert ProgressTracker.get_job_status("job-1")["completed_currencies"] == codes
+
+
+def test_retries_stop_after_max_retries(redis):
+    ProgressTracker.start_job("job-1")
+
+    retries = [ProgressTracker.should_retry_currency("job-1", "EUR", max_retries=2) for _ in range(3)]
+
+    assert retries == [True, True, False]
+    assert ProgressTracker.get_job_status("job-1")["retry_count"] == 2
+
+
+def test_completed_job_records_status_and_duration(redis):
+    ProgressTracker.start_job("job-1")
+
+    status = ProgressTracker.complete_job("job-1", status="partial")
+
+    assert status["status"] == "partial"
+    assert status["duration"] >= 0
+    assert "end_time" in status
+
+
+def test_job_keys_expire_after_the_progress_ttl(redis, monkeypatch):
+    monkeypatch.setattr(config, "JOB_PROGRESS_TTL", 120)
+    ProgressTracker.start_job("job-1")
+    ProgressTracker.mark_currency_complete("job-1", "USD")
+    ProgressTracker.mark_currency_failed("job-1", "EUR")
+    ProgressTracker.should_retry_currency("job-1", "EUR")
+
+    for key in ("job:job-1", "job:job-1:completed", "job:job-1:failed", "retry:job-1:EUR"):
+        assert 0 < redis.ttl(key) <= 120
@@ -0,0 +1,80 @@
+import pytest
+
+from app.scraping.rate_limiter import RateLimiter, RedisRateLimiter, SourceLimit, TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("app.scraping.rate_limiter.time.monotonic", clock)
+    return clock
+
+
+def test_token_bucket_allows_burst_then_spaces_requests(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_token_bucket_refills_up_to_burst(clock):
+    bucket = TokenBucket(rate=1, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("rate, burst", [(0, 1), (-1, 1), (1, 0)])
+def test_token_bucket_rejects_invalid_limits(rate, burst):
+    with pytest.raises(ValueError):
+        TokenBucket(rate=rate, burst=burst)
+
+
+def test_limits_are_per_source(clock):
+    limiter = RateLimiter({"a": SourceLimit("a", rate=1), "b": SourceLimit("b", rate=1)})
+
+    assert limiter._reserve(limiter.limits["a"]) == 0.0
+    assert limiter._reserve(limiter.limits["b"]) == 0.0
+    assert limiter._reserve(limiter.limits["a"]) == pytest.approx(1.0)
+
+
+def test_unknown_source_raises():
+    with pytest.raises(KeyError):
+        with RateLimiter({}).limit("missing"):
+            pass
+
+
+def test_gcra_shares_one_schedule_between_limiters(redis):
+    # Two limiters stand in for two worker processes sharing the source's limit.
+    workers = [RedisRateLimiter({"s": SourceLimit("s", rate=10, burst=2)}, redis_client=redis) for _ in range(2)]
+
+    waits = [worker._reserve(worker.limits["s"]) for worker in workers + workers]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.02)
+    assert waits[3] == pytest.approx(0.2, abs=0.02)
+    assert redis.pttl("rate_limit:s") > 0
+
+
+def test_gcra_falls_back_to_local_bucket_without_redis(redis, clock, monkeypatch):
+    limiter = RedisRateLimiter({"s": SourceLimit("s", rate=1)}, redis_client=redis)
+
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(limiter, "_script", unavailable)
+
+    assert limiter._reserve(limiter.limits["s"]) == 0.0
+    assert limiter._reserve(limiter.limits["s"]) == pytest.approx(1.0)
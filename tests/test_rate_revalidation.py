@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy.exc import OperationalError
+
+from app.controllers.exchange_rate_controller import ExchangeRateController
+from app.core.config import config
+from app.schemas.schema import ExchangeRateWithCurrencySchema
+from app.scraping.refresh_schedule import RefreshSchedule
+from app.tasks.celery_app import celery_app
+
+
+def currency(currency_id, code):
+    now = datetime.now(timezone.utc)
+    return {
+        "id": currency_id, "name": code, "code": code, "symbol": code,
+        "decimal_digits": 2, "created_at": now, "updated_at": now,
+    }
+
+
+def stored_rate(age_seconds):
+    return ExchangeRateWithCurrencySchema(
+        id=1,
+        base_currency_id=1,
+        target_currency_id=2,
+        rate=0.92,
+        source="test",
+        created_at=datetime.now(timezone.utc) - timedelta(seconds=age_seconds),
+        base_currency=currency(1, "USD"),
+        target_currency=currency(2, "EUR"),
+    )
+
+
+class FakeSession:
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def api(redis, monkeypatch):
+    """get_current_rate over a stored rate of a given age, recording the scrapes queued."""
+    monkeypatch.setattr(config, "RATE_FRESHNESS_TARGET", 3600)
+    monkeypatch.setattr(config, "DEMAND_SAMPLE_RATE", 0.0)
+    sent = []
+    monkeypatch.setattr(celery_app, "send_task", lambda name, args: sent.append((name, args)))
+
+    def get(age_seconds=0, error=None):
+        def query(db, base_code, target_code):
+            if error:
+                raise error
+            return stored_rate(age_seconds)
+
+        monkeypatch.setattr(ExchangeRateController, "_query_current_rate", staticmethod(query))
+        response = Response()
+        result = ExchangeRateController.get_current_rate(FakeSession(), "usd", "eur", Decimal("10"), response)
+        return result, response.headers
+
+    get.sent = sent
+    return get
+
+
+def test_fresh_rate_is_served_with_its_age_and_no_refresh(api):
+    result, headers = api(age_seconds=60)
+
+    assert 60 <= int(headers["Age"]) < 65
+    assert "Warning" not in headers
+    assert result.converted_amount == Decimal("9.20")
+    assert api.sent == []
+
+
+def test_stale_rate_is_served_with_a_warning_and_queues_one_refresh(api):
+    result, headers = api(age_seconds=7200)
+    api(age_seconds=7200)
+
+    assert result.rate == 0.92
+    assert headers["Warning"] == '110 - "Response is Stale"'
+    assert api.sent == [("app.tasks.exchange_rates.scrape_single_currency", [1])]
+
+
+def test_recent_scrape_of_the_base_keeps_an_unchanged_rate_fresh(api):
+    RefreshSchedule.mark_refreshed(["USD"])
+
+    _, headers = api(age_seconds=7200)
+
+    assert int(headers["Age"]) < 5
+    assert api.sent == []
+
+
+def test_failing_to_queue_a_refresh_still_serves_the_rate(api, monkeypatch):
+    def unavailable(name, args):
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr(celery_app, "send_task", unavailable)
+
+    result, headers = api(age_seconds=7200)
+
+    assert result.rate == 0.92
+    assert "Warning" in headers
+
+
+def test_last_served_rate_is_returned_when_the_database_times_out(api, redis):
+    api(age_seconds=60)
+    redis.delete("exchange_rate:USD-EUR")
+
+    result, headers = api(error=OperationalError("SELECT", {}, Exception("statement timeout")))
+
+    assert result.rate == 0.92
+    assert "Age" in headers
+
+
+def test_database_timeout_without_a_served_rate_is_unavailable(api):
+    with pytest.raises(HTTPException) as error:
+        api(error=OperationalError("SELECT", {}, Exception("statement timeout")))
+
+    assert error.value.status_code == 503
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import config
+from app.db.latest_rates import RateVolatility
+from app.scraping.refresh_schedule import RateDemand, RefreshSchedule
+
+USD = SimpleNamespace(id=1, code="USD")
+EUR = SimpleNamespace(id=2, code="EUR")
+JPY = SimpleNamespace(id=3, code="JPY")
+CHF = SimpleNamespace(id=4, code="CHF")
+
+
+@pytest.fixture
+def bounds(monkeypatch):
+    monkeypatch.setattr(config, "SCRAPE_ADAPTIVE_MIN_INTERVAL", 600)
+    monkeypatch.setattr(config, "SCRAPE_ADAPTIVE_MAX_INTERVAL", 86400)
+
+
+def test_intervals_are_inversely_proportional_to_priority(bounds):
+    intervals = RefreshSchedule.intervals({"USD": 2.0, "EUR": 1.0}, daily_budget=30)
+
+    assert intervals["EUR"] == pytest.approx(2 * intervals["USD"])
+    assert sum(86400 / interval for interval in intervals.values()) == pytest.approx(30)
+
+
+def test_intervals_are_held_within_the_bounds(bounds):
+    intervals = RefreshSchedule.intervals({"USD": 50.0, "EUR": 10.0, "JPY": 0.0001}, daily_budget=200)
+
+    assert intervals["USD"] == 600
+    assert intervals["JPY"] == 86400
+    assert 600 < intervals["EUR"] < 86400
+
+
+def test_budget_left_at_the_maximum_goes_to_the_other_bases(bounds):
+    intervals = RefreshSchedule.intervals({"USD": 1.0, "EUR": 1.0, "JPY": 0.0001}, daily_budget=5)
+
+    assert intervals["JPY"] == 86400
+    assert 86400 / intervals["USD"] + 86400 / intervals["EUR"] == pytest.approx(4)
+
+
+@pytest.fixture
+def schedule(redis, bounds, monkeypatch):
+    monkeypatch.setattr(config, "SCRAPE_ADAPTIVE_DAILY_BUDGET", 48)
+    monkeypatch.setattr(config, "DEMAND_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(config, "DEMAND_WINDOW_HOURS", 24)
+    return redis
+
+
+def test_plan_ranks_scheduled_bases_by_demand_and_volatility(schedule):
+    schedule.hset(RateVolatility.KEY, mapping={USD.id: 1e-8, EUR.id: 9e-8})
+    for _ in range(3):
+        RateDemand.hit("USD", "EUR")
+
+    plan = RefreshSchedule.plan([USD, EUR, JPY, CHF], ["USD", "EUR"])
+
+    assert [entry["base"] for entry in plan] == ["EUR", "USD"]
+    assert plan[1]["demand"] == 3.0
+    assert plan[0]["interval"] < plan[1]["interval"]
+
+
+def test_requested_bases_join_the_plan_with_the_typical_volatility(schedule):
+    schedule.hset(RateVolatility.KEY, mapping={USD.id: 1e-8})
+    RateDemand.hit("CHF", "USD")
+
+    plan = {entry["base"]: entry for entry in RefreshSchedule.plan([USD, EUR, JPY, CHF], ["USD"])}
+
+    assert set(plan) == {"USD", "CHF"}
+    assert plan["CHF"]["volatility"] is None
+    assert plan["CHF"]["priority"] > plan["USD"]["priority"]
+
+
+def test_bases_are_due_once_their_interval_passed_since_the_last_refresh_or_dispatch(schedule):
+    RefreshSchedule.mark_refreshed(["USD"])
+    RefreshSchedule.mark_dispatched(["EUR"])
+
+    plan = {entry["base"]: entry for entry in RefreshSchedule.plan([USD, EUR, JPY], ["USD", "EUR", "JPY"])}
+    assert not plan["USD"]["due"]
+    assert not plan["EUR"]["due"]
+    assert plan["JPY"]["due"]
+    assert plan["USD"]["last_refreshed"] is not None
+
+    later = RefreshSchedule.plan([USD, EUR, JPY], ["USD", "EUR", "JPY"], now=plan["USD"]["last_refreshed"] + 86400)
+    assert all(entry["due"] for entry in later)
+
+
+def test_saved_plan_gives_the_priorities(schedule):
+    plan = RefreshSchedule.plan([USD, EUR], ["USD", "EUR"])
+    RefreshSchedule.save_plan(plan)
+
+    assert RefreshSchedule.last_plan() == plan
+    assert RefreshSchedule.priorities() == {entry["base"]: entry["priority"] for entry in plan}
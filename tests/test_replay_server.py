@@ -0,0 +1,51 @@
+import random
+
+import pytest
+import requests
+
+from app.scraping.sources.xrates import XRatesScraper
+from benchmarks.replay_server import FaultProfile, _rewrite_codes, parse_latency
+
+
+def test_rewrite_codes_swaps_both_cases_without_chaining():
+    body = "USD/EUR usd eur"
+
+    assert _rewrite_codes(body, {"USD": "EUR", "EUR": "JPY"}) == "EUR/JPY eur jpy"
+
+
+@pytest.mark.parametrize("spec, low, high", [("fixed:0.5", 0.5, 0.5), ("uniform:1,2", 1, 2)])
+def test_parse_latency(spec, low, high):
+    sample = parse_latency(spec)(random.Random(0))
+
+    assert low <= sample <= high
+
+
+def test_parse_latency_rejects_unknown_distribution():
+    with pytest.raises(ValueError):
+        parse_latency("gamma:1")
+
+
+def test_scraper_runs_against_replayed_fixture(redis, replay):
+    server = replay()
+
+    rates = XRatesScraper("CHF").scrape()
+
+    assert rates
+    assert server.stats["xrates:200"] == 1
+
+
+def test_unrecorded_base_is_404_in_strict_mode(replay):
+    server = replay(strict=True)
+
+    response = requests.get(f"{server.url}/xrates/table/?from=CHF&amount=1", timeout=5)
+
+    assert response.status_code == 404
+
+
+def test_fault_profile_answers_429(replay):
+    server = replay(default_profile=FaultProfile(rate_429=1.0))
+
+    response = requests.get(f"{server.url}/xrates/table/?from=USD&amount=1", timeout=5)
+
+    assert response.status_code == 429
+    assert server.stats["xrates:429"] == 1
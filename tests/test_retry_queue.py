@@ -0,0 +1,95 @@
+import pytest
+
+from app.core.config import config
+from app.tasks.retry_queue import RetryQueue
+
+
+@pytest.fixture
+def backoff(redis, monkeypatch):
+    monkeypatch.setattr(config, "RETRY_BASE_DELAY", 60)
+    monkeypatch.setattr(config, "RETRY_MAX_DELAY", 600)
+    monkeypatch.setattr(config, "RETRY_MAX_ATTEMPTS", 3)
+    return redis
+
+
+def due_in(redis, base_code, now):
+    return redis.zscore(RetryQueue.KEY, base_code) - now
+
+
+def test_delay_doubles_up_to_the_maximum(backoff):
+    assert [RetryQueue.delay(attempts) for attempts in range(6)] == [60, 120, 240, 480, 600, 600]
+
+
+def test_failed_base_is_due_after_the_base_delay(backoff):
+    assert RetryQueue.add("USD")
+
+    (_, due_at), = backoff.zrange(RetryQueue.KEY, 0, -1, withscores=True)
+    assert RetryQueue.take_due(now=due_at - 1) == []
+    assert RetryQueue.take_due(now=due_at) == ["USD"]
+    assert RetryQueue.take_due(now=due_at) == []
+
+
+def test_a_base_queued_twice_keeps_its_due_time(backoff):
+    RetryQueue.add("USD")
+    first = backoff.zscore(RetryQueue.KEY, "USD")
+    RetryQueue.add("USD")
+
+    assert backoff.zcard(RetryQueue.KEY) == 1
+    assert backoff.zscore(RetryQueue.KEY, "USD") == first
+
+
+def test_failed_retries_double_the_delay_until_the_base_is_dropped(backoff, monkeypatch):
+    monkeypatch.setattr("app.tasks.retry_queue.time.time", lambda: 1000.0)
+
+    assert RetryQueue.failed("USD")
+    assert due_in(backoff, "USD", 1000.0) == 120
+    assert RetryQueue.failed("USD")
+    assert due_in(backoff, "USD", 1000.0) == 240
+    assert not RetryQueue.failed("USD")
+
+    # The count is reset, so a base failing in a later job is retried again
+    assert not backoff.hexists(RetryQueue.ATTEMPTS_KEY, "USD")
+    assert RetryQueue.add("USD")
+
+
+def test_base_out_of_retries_is_not_queued(backoff):
+    backoff.hset(RetryQueue.ATTEMPTS_KEY, "USD", 3)
+
+    assert not RetryQueue.add("USD")
+    assert backoff.zcard(RetryQueue.KEY) == 0
+
+
+def test_succeeded_base_starts_over_from_the_base_delay(backoff, monkeypatch):
+    monkeypatch.setattr("app.tasks.retry_queue.time.time", lambda: 1000.0)
+    RetryQueue.failed("USD")
+    RetryQueue.take_due(now=2000.0)
+    RetryQueue.succeeded("USD")
+
+    RetryQueue.add("USD")
+
+    assert due_in(backoff, "USD", 1000.0) == 60
+
+
+def test_requeued_bases_are_due_right_away(backoff):
+    RetryQueue.requeue(["USD", "EUR"])
+    RetryQueue.requeue([])
+
+    assert sorted(RetryQueue.take_due()) == ["EUR", "USD"]
+
+
+class UnavailableRedis:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("redis down")
+
+        return fail
+
+
+def test_redis_errors_never_fail_a_task(monkeypatch):
+    monkeypatch.setattr("app.tasks.retry_queue.redis_client", UnavailableRedis())
+
+    assert RetryQueue.add("USD")
+    assert RetryQueue.take_due() == []
+    RetryQueue.requeue(["USD"])
+    assert RetryQueue.failed("USD")
+    RetryQueue.succeeded("USD")
@@ -0,0 +1,35 @@
+from app.scraping.http_cache import ScrapeCache
+from app.scraping.sources.xrates import XRatesScraper
+
+
+def test_recent_result_is_reused_without_a_request(redis, replay):
+    server = replay()
+
+    first = XRatesScraper("USD").scrape()
+    second = XRatesScraper("USD").scrape()
+
+    assert second == first
+    assert server.stats["xrates:200"] == 1
+
+
+def test_unchanged_page_is_answered_304_and_reuses_parsed_rates(redis, replay):
+    server = replay()
+    first = XRatesScraper("USD").scrape()
+    redis.delete(f"{ScrapeCache.RESULT_PREFIX}:xrates:USD")
+
+    second = XRatesScraper("USD").scrape()
+
+    assert second == first
+    assert server.stats["xrates:200"] == 1
+    assert server.stats["xrates:304"] == 1
+
+
+def test_scrape_works_without_redis(redis, replay, monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(redis, "get", unavailable)
+    monkeypatch.setattr(redis, "setex", unavailable)
+    replay()
+
+    assert XRatesScraper("USD").scrape()
@@ -0,0 +1,119 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from app.core.config import config
+from app.scraping.base import BaseScraper
+from app.scraping.factory import ScraperCapability, ScraperSource
+from app.scraping.manager import ScraperManager
+from app.scraping.parse_pool import PendingParse
+from app.scraping.rate_limiter import RateLimiter
+from app.tasks.exchange_rates import scrape_base_rates
+
+MULTI = ScraperCapability.MULTI_PAIR
+SINGLE = ScraperCapability.SINGLE_PAIR
+
+
+class StubScraper(BaseScraper):
+    def extract(self):
+        raise AssertionError("the fake manager never extracts")
+
+    def transform(self, raw_data):
+        return {}
+
+    def get_source_name(self) -> str:
+        return "stub"
+
+
+class FakeManager(ScraperManager):
+    """
+    ScraperManager over stub sources: `responses` maps each source, in priority order, to
+    (capability, rates it serves for the base or an exception to raise).
+    """
+
+    def __init__(self, responses):
+        super().__init__(source_priority=list(responses), rate_limiter=RateLimiter({}))
+        self.sources = {
+            name: ScraperSource(name, StubScraper, capability)
+            for name, (capability, _) in responses.items()
+        }
+        self.responses = {name: response for name, (_, response) in responses.items()}
+        self.calls = []
+
+    def scrape_source(self, source_name, scraper, cancelled=None, wanted=None, on_request=None):
+        requested = [scraper.target_currency] if scraper.target_currency else None
+        self.calls.append((source_name, requested))
+        response = self.responses[source_name]
+        if isinstance(response, Exception):
+            raise response
+        return {code: rate for code, rate in response.items() if requested is None or code in requested}
+
+    def submit_source(self, source_name, scraper, cancelled=None, wanted=None, on_request=None):
+        # Answers at once, but the page is "parsed" 50ms later
+        future = Future()
+        try:
+            rates = self.scrape_source(source_name, scraper)
+        except Exception as e:
+            threading.Timer(0.05, future.set_exception, [e]).start()
+        else:
+            threading.Timer(0.05, future.set_result, [rates]).start()
+        future.add_done_callback(lambda _: self.calls.append(("parsed", source_name)))
+        return PendingParse(future)
+
+
+@pytest.fixture(autouse=True)
+def planning(monkeypatch):
+    monkeypatch.setattr(config, "SCRAPER_ADAPTIVE_ORDERING", False)
+    monkeypatch.setattr(config, "SCRAPER_HEDGING", False)
+    monkeypatch.setattr(config, "SCRAPER_COVERAGE_PLANNING", False)
+
+
+def test_multi_pair_results_are_merged_and_only_the_residue_goes_single_pair():
+    manager = FakeManager({
+        "a": (MULTI, {"EUR": 0.9, "JPY": 150.0}),
+        "down": (MULTI, RuntimeError("503")),
+        "b": (MULTI, {"EUR": 0.91, "GBP": 0.8}),
+        "s": (SINGLE, {"CHF": 0.88, "EUR": 0.92}),
+    })
+
+    result = scrape_base_rates(manager, "USD", ["EUR", "JPY", "GBP", "CHF", "XAU"])
+
+    assert result["rates"] == {"EUR": 0.9, "JPY": 150.0, "GBP": 0.8, "CHF": 0.88}
+    assert result["sources"] == {"EUR": "a", "JPY": "a", "GBP": "b", "CHF": "s"}
+    assert result["missing"] == ["XAU"]
+    assert manager.calls == [
+        ("a", None), ("down", None), ("b", None), ("s", ["CHF"]), ("s", ["XAU"]),
+    ]
+
+
+def test_multi_pair_sources_stop_once_every_target_is_covered():
+    manager = FakeManager({
+        "a": (MULTI, {"EUR": 0.9, "JPY": 150.0}),
+        "b": (MULTI, {"GBP": 0.8}),
+    })
+
+    result = scrape_base_rates(manager, "USD", ["EUR", "JPY"])
+
+    assert result["missing"] == []
+    assert manager.calls == [("a", None)]
+
+
+def test_pairs_are_requested_while_earlier_pages_are_parsed(monkeypatch):
+    monkeypatch.setattr(config, "SCRAPER_PARSE_PROCESSES", 2)
+    manager = FakeManager({
+        "a": (MULTI, {"EUR": 0.9}),
+        "down": (SINGLE, RuntimeError("503")),
+        "s": (SINGLE, {"JPY": 150.0, "GBP": 0.8}),
+    })
+
+    result = scrape_base_rates(manager, "USD", ["EUR", "JPY", "GBP", "CHF"])
+
+    assert result["rates"] == {"EUR": 0.9, "JPY": 150.0, "GBP": 0.8}
+    assert result["sources"] == {"EUR": "a", "JPY": "s", "GBP": "s"}
+    assert result["missing"] == ["CHF"]
+    # Every pair is requested before the first page is parsed
+    assert manager.calls[:4] == [("a", None), ("down", ["JPY"]), ("down", ["GBP"]), ("down", ["CHF"])]
+    assert sorted(call for call in manager.calls[4:] if call[0] != "parsed") == [
+        ("s", ["CHF"]), ("s", ["GBP"]), ("s", ["JPY"]),
+    ]
@@ -0,0 +1,67 @@
+import pytest
+
+from app.core.config import config
+from app.scraping.source_health import SourceHealth
+
+
+def test_stats_summarize_recorded_requests(redis):
+    SourceHealth.record("fast", 0.1, rates=150)
+    SourceHealth.record("fast", 0.3, rates=0, error="timeout")
+
+    stats = SourceHealth.get_stats(["fast"])["fast"]
+
+    assert stats["requests"] == 2
+    assert stats["success_ratio"] == pytest.approx(0.5)
+    assert stats["mean_latency_ms"] == pytest.approx(200)
+    assert stats["rates_per_success"] == 150
+    assert stats["consecutive_failures"] == 1
+    assert stats["recent_failures"][0]["error"] == "timeout"
+
+
+def test_rank_prefers_cheaper_sources_per_rate(redis):
+    for _ in range(4):
+        SourceHealth.record("slow", 0.4, rates=10)
+        SourceHealth.record("fast", 0.2, rates=10)
+    for rates in (10, 0, 0, 0):
+        SourceHealth.record("flaky", 0.2, rates=rates)
+
+    assert SourceHealth.rank(["slow", "flaky", "fast"]) == ["fast", "slow", "flaky"]
+
+
+def test_sources_without_samples_keep_their_order(redis):
+    assert SourceHealth.rank(["b", "a", "c"]) == ["b", "a", "c"]
+
+
+def test_circuit_opens_after_consecutive_failures(redis, monkeypatch):
+    monkeypatch.setattr(config, "SOURCE_CIRCUIT_FAILURE_THRESHOLD", 3)
+    for _ in range(3):
+        SourceHealth.record("down", 1.0, rates=0, error="503")
+
+    stats = SourceHealth.get_stats(["down"])["down"]
+
+    assert stats["circuit_open"]
+    assert 0 < stats["circuit_retry_in"] <= config.SOURCE_CIRCUIT_COOLDOWN
+    assert SourceHealth.rank(["down", "up"]) == ["up"]
+
+
+def test_success_resets_consecutive_failures(redis, monkeypatch):
+    monkeypatch.setattr(config, "SOURCE_CIRCUIT_FAILURE_THRESHOLD", 3)
+    SourceHealth.record("s", 1.0, rates=0)
+    SourceHealth.record("s", 1.0, rates=0)
+    SourceHealth.record("s", 1.0, rates=5)
+    SourceHealth.record("s", 1.0, rates=0)
+
+    stats = SourceHealth.get_stats(["s"])["s"]
+
+    assert stats["consecutive_failures"] == 1
+    assert not stats["circuit_open"]
+
+
+def test_health_is_advisory_without_redis(redis, monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(redis, "pipeline", unavailable)
+
+    SourceHealth.record("s", 1.0, rates=5)
+    assert SourceHealth.rank(["a", "b"]) == ["a", "b"]
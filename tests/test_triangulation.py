@@ -0,0 +1,48 @@
+import pytest
+
+from app.scraping.triangulation import check_drift, cross_rates, triangulate
+
+USD = {"EUR": 0.9, "JPY": 150.0, "GBP": 0.8}
+EUR = {"USD": 1 / 0.9, "JPY": 150.0 / 0.9, "CHF": 0.95}
+
+
+def test_cross_rates_divide_by_the_anchor_rate_of_the_base():
+    row = cross_rates("USD", USD, "EUR")
+
+    assert row["USD"] == pytest.approx(1 / 0.9)
+    assert row["JPY"] == pytest.approx(150.0 / 0.9)
+    assert row["GBP"] == pytest.approx(0.8 / 0.9)
+    assert "EUR" not in row
+
+
+def test_cross_rates_need_the_base_quoted():
+    assert cross_rates("USD", USD, "CHF") is None
+    assert cross_rates("USD", {"CHF": 0.0}, "CHF") is None
+
+
+def test_triangulate_keeps_anchors_and_uses_the_first_quoting_anchor():
+    anchors = [("USD", USD, "xrates"), ("EUR", EUR, "wise")]
+
+    rows, sources = triangulate(anchors, ["USD", "GBP", "CHF", "XAU"])
+
+    assert rows["USD"] == USD
+    assert sources["USD"] == "xrates"
+    assert sources["GBP"] == "triangulated:USD:xrates"
+    assert sources["CHF"] == "triangulated:EUR:wise"
+    assert rows["CHF"]["EUR"] == pytest.approx(1 / 0.95)
+    assert "XAU" not in rows and "XAU" not in sources
+
+
+def test_check_drift_reports_inconsistent_anchors_worst_first():
+    stale = dict(EUR, JPY=EUR["JPY"] * 1.05, CHF=0.95)
+    anchors = [("USD", dict(USD, CHF=0.95 * 0.9 * 1.01), "xrates"), ("EUR", stale, "wise")]
+
+    drift = check_drift(anchors, tolerance=0.005)
+
+    assert [entry["pair"] for entry in drift] == ["USD-JPY", "USD-CHF"]
+    assert drift[0]["deviation"] == pytest.approx(0.05)
+    assert drift[0]["derived_via"] == "EUR:wise"
+
+
+def test_consistent_anchors_have_no_drift():
+    assert check_drift([("USD", USD, "a"), ("EUR", EUR, "b")], tolerance=1e-9) == []